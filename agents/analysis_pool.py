@@ -0,0 +1,200 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from agents.indicators import IndicatorEngine
+from agents.screener import UniverseScreener
+from agents.telemetry import span
+
+FIELDS = ("close", "high", "low", "volume")
+
+# (symbol, first bar, bar count) inside a BarPanel
+Slot = Tuple[str, int, int]
+
+
+class BarPanel:
+    """
+    The bars of many symbols packed back to back in one shared-memory block,
+    as a float64 (field x bar) matrix. Pool workers attach to it by name and
+    slice their symbols out as zero-copy views, so no DataFrame is ever
+    pickled to a worker.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: List[Slot], total: int):
+        self.shm = shm
+        self.slots = slots
+        self.total = total
+
+    @classmethod
+    def create(cls, frames: Dict[str, pd.DataFrame]) -> "BarPanel":
+        slots, start = [], 0
+        for symbol, df in frames.items():
+            slots.append((symbol, start, len(df)))
+            start += len(df)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, start * 8 * len(FIELDS)))
+
+        values = _view(shm, start)
+        for (symbol, first, n), df in zip(slots, frames.values()):
+            for i, field in enumerate(FIELDS):
+                values[i, first:first + n] = np.asarray(df[field], dtype=float)
+        return cls(shm, slots, start)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def chunks(self, count: int) -> List[List[Slot]]:
+        """Splits the symbols into at most `count` equally sized chunks (universe order kept)."""
+        size = max(1, -(-len(self.slots) // max(1, count)))
+        return [self.slots[i:i + size] for i in range(0, len(self.slots), size)]
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _view(shm: shared_memory.SharedMemory, total: int) -> np.ndarray:
+    return np.ndarray((len(FIELDS), total), dtype=np.float64, buffer=shm.buf)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Opens a block the parent owns. Pool workers share the parent's resource tracker, so the parent's unlink() settles it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _in_worker(work, name: str, total: int, *args):
+    # Views into the block must be gone before close(), so `work` holds them in its own frame
+    shm = _attach(name)
+    try:
+        return work(_view(shm, total), *args)
+    finally:
+        shm.close()
+
+
+def _compute(values: np.ndarray, slots: List[Slot]) -> Dict[str, Dict[str, float]]:
+    engine = IndicatorEngine()
+    return {symbol: engine.compute_arrays(*(values[i, first:first + n] for i in range(len(FIELDS))))
+            for symbol, first, n in slots}
+
+
+def _score(values: np.ndarray, slots: List[Slot], min_bars: int) -> pd.DataFrame:
+    # Scores only look at each symbol's own latest bars (the screener right-aligns its
+    # panel), so stacking every symbol's bars at the bottom gives the same columns
+    # without building the date-union panel. 50 rows of padding cover the longest window.
+    depth = max([n for _, _, n in slots] + [50])
+    close, volume = np.full((depth, len(slots)), np.nan), np.full((depth, len(slots)), np.nan)
+    for j, (_, first, n) in enumerate(slots):
+        close[depth - n:, j] = values[0, first:first + n]
+        volume[depth - n:, j] = values[3, first:first + n]
+
+    screener = UniverseScreener()
+    screener.min_bars = min_bars
+    return screener.score_aligned([symbol for symbol, _, _ in slots],
+                                  screener.right_align(close), screener.right_align(volume))
+
+
+def _compute_chunk(name: str, total: int, slots: List[Slot]) -> Dict[str, Dict[str, float]]:
+    """Worker: indicator values for each symbol of a chunk."""
+    return _in_worker(_compute, name, total, slots)
+
+
+def _score_chunk(name: str, total: int, slots: List[Slot], min_bars: int) -> pd.DataFrame:
+    """Worker: the screener's score table for a chunk of the universe."""
+    return _in_worker(_score, name, total, slots, min_bars)
+
+
+class AnalysisExecutor:
+    """
+    Runs the CPU-bound part of a cycle (universe scan scoring and per-symbol
+    indicators) on a process pool once a batch is big enough to pay for it.
+    Bars travel through a shared-memory BarPanel; only the small result dicts
+    and score tables are pickled back. The event loop just awaits the pool,
+    so it stays responsive while a large scan runs.
+    Smaller batches, and analysts with a streaming state store, stay in-process.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_symbols: Optional[int] = None):
+        self.workers = workers if workers is not None else int(os.getenv("ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
+        self.min_symbols = min_symbols if min_symbols is not None else int(os.getenv("ANALYSIS_POOL_MIN_SYMBOLS", "64"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def use_pool(self, count: int) -> bool:
+        return self.workers > 1 and count >= self.min_symbols
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: the parent runs threads (fetch pool, HTTP clients) that fork would copy mid-flight
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def _map(self, fn, frames: Dict[str, pd.DataFrame], *args) -> list:
+        loop = asyncio.get_running_loop()
+        # Packing is a copy per frame and field; keep it off the loop too
+        panel = await loop.run_in_executor(None, BarPanel.create, frames)
+        try:
+            pool = self._get_pool()
+            return await asyncio.gather(*(
+                loop.run_in_executor(pool, fn, panel.name, panel.total, chunk, *args)
+                for chunk in panel.chunks(self.workers)
+            ))
+        finally:
+            panel.release()
+
+    async def rank(self, screener: UniverseScreener, frames: Dict[str, pd.DataFrame],
+                   limit: Optional[int] = None) -> List[dict]:
+        """Same result as screener.rank(frames, limit)."""
+        if not self.use_pool(len(frames)):
+            return screener.rank(frames, limit=limit)
+
+        with span("scan", symbols=len(frames), workers=self.workers):
+            tables = await self._map(_score_chunk, frames, screener.min_bars)
+        return screener.rank_table(pd.concat(tables), limit=limit)
+
+    async def compute_many(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, float]]:
+        """IndicatorEngine.compute_arrays for every frame, in the pool when the batch is large enough."""
+        if not self.use_pool(len(frames)):
+            engine = IndicatorEngine()
+            return {symbol: engine.compute(df) for symbol, df in frames.items()}
+
+        results: Dict[str, Dict[str, float]] = {}
+        for chunk in await self._map(_compute_chunk, frames):
+            results.update(chunk)
+        return {symbol: results[symbol] for symbol in frames}
+
+    async def analyze(self, analyst, frames: Dict[str, pd.DataFrame]) -> List[dict]:
+        """
+        analyst.analyze_ticker() for every frame, in order. Large batches compute
+        their indicators in the pool and only run the analyst's labelling here.
+        """
+        if analyst.engine.state_store is not None or not self.use_pool(len(frames)):
+            return [analyst.analyze_ticker(symbol, df) for symbol, df in frames.items()]
+
+        with span("analysis_pool", symbols=len(frames), workers=self.workers):
+            indicators = await self.compute_many({s: df for s, df in frames.items() if not df.empty})
+            return [analyst.summarize(symbol, indicators[symbol]) if symbol in indicators
+                    else analyst.analyze_ticker(symbol, df) for symbol, df in frames.items()]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+_default_executor: Optional[AnalysisExecutor] = None
+
+
+def get_analysis_executor() -> AnalysisExecutor:
+    """Process-wide executor, so all squads share one worker pool."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = AnalysisExecutor()
+    return _default_executor
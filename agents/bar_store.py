@@ -0,0 +1,185 @@
+import os
+import re
+import time
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from agents.telemetry import current_span
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Relative close difference on a re-downloaded bar that means the provider re-adjusted the history
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def period_to_timedelta(period: str) -> Optional[pd.Timedelta]:
+    """Translates yfinance periods ('5d', '6mo', '1y') into a lookback; None for 'max'/'ytd'."""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period or "")
+    if not match:
+        return None
+    n, unit = int(match.group(1)), match.group(2)
+    days = {"d": 1, "wk": 7, "mo": 30, "y": 365}[unit]
+    return pd.Timedelta(days=n * days)
+
+
+class BarStore:
+    """
+    On-disk bar history, one .npz file per (symbol, interval).
+    Timestamps are kept as UTC nanoseconds plus the exchange timezone so frames
+    round-trip exactly as yfinance returned them.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("BAR_STORE_DIR", ".cache/bars")
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, symbol: str, interval: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9.-]", "_", symbol)
+        return os.path.join(self.root, f"{safe}__{interval}.npz")
+
+    def load(self, symbol: str, interval: str = "1d") -> Tuple[Optional[pd.DataFrame], float, float]:
+        """
+        Returns (frame, fetched_at, seeded_at), seeded_at being the time of the last
+        full download. (None, 0.0, 0.0) when nothing usable is stored.
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None, 0.0, 0.0
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                tz = str(data["tz"])
+                ts = pd.to_datetime(data["timestamp"], unit="ns", utc=True)
+                df = pd.DataFrame({"timestamp": ts.tz_convert(tz) if tz else ts.tz_localize(None)})
+                for col in OHLCV_COLUMNS:
+                    df[col] = data[col]
+                # Files written before seeded_at was tracked get one full refresh
+                seeded_at = float(data["seeded_at"]) if "seeded_at" in data.files else 0.0
+                return df, float(data["fetched_at"]), seeded_at
+        except Exception as e:
+            print(f"⚠️ [BarStore] Ignoring unreadable cache for {symbol}: {e}")
+            return None, 0.0, 0.0
+
+    def save(self, symbol: str, interval: str, df: pd.DataFrame, fetched_at: float, seeded_at: Optional[float] = None):
+        ts = pd.DatetimeIndex(df["timestamp"])
+        tz = str(ts.tz) if ts.tz is not None else ""
+        utc = ts.tz_convert("UTC") if ts.tz is not None else ts
+        arrays = {col: df[col].to_numpy() for col in OHLCV_COLUMNS}
+
+        path = self.path(symbol, interval)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, timestamp=utc.as_unit("ns").asi8, tz=np.str_(tz), fetched_at=np.float64(fetched_at),
+                     seeded_at=np.float64(fetched_at if seeded_at is None else seeded_at), **arrays)
+        os.replace(tmp, path)  # Atomic swap: readers never see a half-written file
+
+
+class CachedSource:
+    """
+    Wraps a market data source with the BarStore.
+    Fresh copies (younger than the staleness window) are served from disk; older
+    ones only download the bars since the last stored timestamp and append them.
+    yfinance history is split/dividend adjusted, so the whole history is downloaded
+    again when a re-requested bar no longer matches the stored one, and at least
+    every BAR_STORE_MAX_AGE_DAYS.
+    """
+
+    def __init__(self, source, store: Optional[BarStore] = None, staleness: Optional[float] = None,
+                 max_age: Optional[float] = None):
+        self.source = source
+        self.store = store or BarStore()
+        minutes = float(os.getenv("BAR_STORE_STALENESS_MINUTES", "60"))
+        self.staleness = staleness if staleness is not None else minutes * 60
+        days = float(os.getenv("BAR_STORE_MAX_AGE_DAYS", "7"))
+        self.max_age = max_age if max_age is not None else days * 86400
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, key) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def fetch(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        with self._lock((symbol, interval)):
+            stored, fetched_at, seeded_at = self.store.load(symbol, interval)
+            lookback = period_to_timedelta(period)
+            now, merged = time.time(), None
+
+            if stored is not None and not stored.empty and self._covers(stored, lookback):
+                if now - fetched_at < self.staleness:
+                    current_span().set(store="hit")
+                    return self._window(stored, period)
+
+                if now - seeded_at < self.max_age:
+                    # Re-request the last two stored bars: the last may have been a partial (in-session)
+                    # bar, the one before is final and must come back unchanged
+                    since = stored["timestamp"].iloc[-min(2, len(stored))]
+                    try:
+                        fresh = self.source.fetch(symbol, period, interval, start=since.strftime("%Y-%m-%d"))
+                    except Exception as e:
+                        print(f"⚠️ [BarStore] Incremental update failed for {symbol}, serving cached bars: {e}")
+                        current_span().set(store="stale")
+                        return self._window(stored, period)
+                    if self._adjusted(stored, fresh):
+                        print(f"🔄 [BarStore] {symbol} history was re-adjusted (split or dividend), downloading it again")
+                    else:
+                        current_span().set(store="incremental")
+                        merged = self._merge(stored, fresh)
+
+            if merged is None:
+                current_span().set(store="miss" if stored is None or stored.empty else "refresh")
+                merged, seeded_at = self._merge(None, self.source.fetch(symbol, period, interval)), now
+
+            if merged.empty:
+                return merged
+            self.store.save(symbol, interval, merged, now, seeded_at)
+            return self._window(merged, period)
+
+    @staticmethod
+    def _covers(stored: pd.DataFrame, lookback: Optional[pd.Timedelta]) -> bool:
+        # A history seeded with a shorter period (or 'max') needs a full download first
+        if lookback is None:
+            return False
+        span = stored["timestamp"].iloc[-1] - stored["timestamp"].iloc[0]
+        return span >= lookback - pd.Timedelta(days=7)
+
+    @staticmethod
+    def _adjusted(stored: pd.DataFrame, fresh: Optional[pd.DataFrame]) -> bool:
+        """True when a final stored bar came back with a different close, i.e. the provider rescaled the history."""
+        if fresh is None or fresh.empty:
+            return False
+        # The last stored bar may have been partial, so only earlier bars are compared
+        _, old, new = np.intersect1d(pd.DatetimeIndex(stored["timestamp"]).as_unit("ns").asi8[:-1],
+                                     pd.DatetimeIndex(fresh["timestamp"]).as_unit("ns").asi8, return_indices=True)
+        if not len(old):
+            return False
+        before = stored["close"].to_numpy(dtype=float)[old]
+        after = fresh["close"].to_numpy(dtype=float)[new]
+        return not np.allclose(before, after, rtol=ADJUSTMENT_TOLERANCE, atol=0)
+
+    @staticmethod
+    def _merge(stored: Optional[pd.DataFrame], fresh: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if fresh is None or fresh.empty:
+            return stored if stored is not None else pd.DataFrame()
+        fresh = fresh[["timestamp"] + OHLCV_COLUMNS]
+        if stored is None or stored.empty:
+            return fresh.reset_index(drop=True)
+
+        tz = stored["timestamp"].dt.tz
+        if tz is not None:
+            fresh = fresh.assign(timestamp=fresh["timestamp"].dt.tz_convert(tz))
+        head = stored[stored["timestamp"] < fresh["timestamp"].iloc[0]]
+        return pd.concat([head, fresh], ignore_index=True)
+
+    @staticmethod
+    def _window(df: pd.DataFrame, period: str) -> pd.DataFrame:
+        """Trims the stored history back to what yfinance would have returned for `period`."""
+        lookback = period_to_timedelta(period)
+        if lookback is None:
+            return df
+        if period.endswith("d"):
+            # yfinance counts day periods in trading sessions, not calendar days
+            return df.tail(lookback.days).reset_index(drop=True)
+        cutoff = df["timestamp"].iloc[-1] - lookback
+        return df[df["timestamp"] >= cutoff].reset_index(drop=True)
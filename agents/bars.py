@@ -0,0 +1,84 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("high", "low", "close")
+COLUMNS = PRICE_COLUMNS + ("volume",)
+
+
+class Bars:
+    """
+    Compact OHLCV history of one symbol, as held in memory during a cycle.
+    Only the columns the agents read are kept, as contiguous arrays: float32
+    prices, int64 volume (float64 when the provider sends gaps or fractions,
+    float32 would round volumes above 2**24), int64 UTC-nanosecond timestamps
+    and the exchange timezone. About 28 bytes per bar instead of a float64
+    yfinance frame with Open, Dividends, Stock Splits and a tz-aware timestamp column.
+
+    Supports the part of the DataFrame interface the agents use (len, empty,
+    bars["close"], bars["timestamp"], bars.iloc[a:b]), so analysts, the
+    screener and the indicator state accept either.
+    """
+    __slots__ = ("symbol", "tz", "ts", "high", "low", "close", "volume")
+
+    def __init__(self, symbol: str, ts: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: np.ndarray, tz: Optional[str] = "UTC"):
+        self.symbol = symbol
+        self.tz = tz
+        self.ts = ts
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_frame(cls, symbol: str, df: Optional[pd.DataFrame]) -> "Bars":
+        """Copies what the agents need out of a normalized yfinance frame (which can then be freed)."""
+        if df is None or df.empty:
+            empty = np.empty(0, dtype=np.float32)
+            return cls(symbol, np.empty(0, dtype=np.int64), empty, empty, empty, np.empty(0, dtype=np.int64))
+
+        stamps = pd.DatetimeIndex(df["timestamp"])
+        tz = str(stamps.tz) if stamps.tz is not None else None
+        ts = (stamps.tz_convert("UTC") if tz else stamps).as_unit("ns").asi8.copy()
+        prices = (np.ascontiguousarray(df[col].to_numpy(dtype=np.float32)) for col in PRICE_COLUMNS)
+        volume = df["volume"]
+        volume = volume.to_numpy(dtype=np.int64 if pd.api.types.is_integer_dtype(volume) else np.float64)
+        return cls(symbol, ts, *prices, np.ascontiguousarray(volume), tz=tz)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.ts) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.ts.nbytes + sum(getattr(self, col).nbytes for col in COLUMNS)
+
+    @property
+    def iloc(self) -> "Bars":
+        # Positional row slicing, as df.iloc[a:b]
+        return self
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return Bars(self.symbol, self.ts[key], *(getattr(self, col)[key] for col in COLUMNS), tz=self.tz)
+        if key == "timestamp":
+            if self.tz is None:
+                return pd.DatetimeIndex(self.ts.view("M8[ns]"))
+            return pd.to_datetime(self.ts, unit="ns", utc=True).tz_convert(self.tz)
+        if key in COLUMNS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({"timestamp": self["timestamp"]})
+        for col in COLUMNS:
+            frame[col] = getattr(self, col)
+        return frame
+
+    def __repr__(self) -> str:
+        return f"Bars({self.symbol!r}, {len(self)} bars, {self.nbytes} bytes)"
@@ -1,96 +1,84 @@
 import pandas as pd
 import numpy as np
+from agents.indicators import IndicatorEngine, as_price
+from agents.streaming import get_state_store
+from agents.telemetry import span
 
 class CommodityTechnicalAnalyst:
     """
     Technical Analysis specifically tuned for Commoidities (Futures).
     Ticker examples: GC=F (Gold), SI=F (Silver), CL=F (Crude Oil).
+    Indicators come from the shared IndicatorEngine; the thresholds and
+    labels below are commodity specific.
     """
-    
+
+    def __init__(self):
+        self.engine = IndicatorEngine(state_store=get_state_store())
+
     def analyze_ticker(self, ticker: str, df: pd.DataFrame) -> dict:
         if df.empty: return {}
-        
+
+        with span("analyze", symbol=ticker, rows=len(df)):
+            return self.summarize(ticker, self.engine.compute(df, symbol=ticker))
+
+    def summarize(self, ticker: str, ind: dict) -> dict:
+        current_price = ind['price']
+        ma20, ma50, ma200 = ind['ma20'], ind['ma50'], ind['ma200']
+
         # 1. Trend Analysis (MA Cross)
-        close = df['close']
-        ma20 = close.rolling(20).mean()
-        ma50 = close.rolling(50).mean()
-        ma200 = close.rolling(200).mean()
-        
-        current_price = close.iloc[-1]
-        
-        # Determine Trend Status
-        if current_price > ma50.iloc[-1] and ma50.iloc[-1] > ma200.iloc[-1]:
+        if current_price > ma50 and ma50 > ma200:
             trend_status = "Bullish (Strong)"
-        elif current_price < ma50.iloc[-1] and ma50.iloc[-1] < ma200.iloc[-1]:
+        elif current_price < ma50 and ma50 < ma200:
             trend_status = "Bearish (Strong)"
-        elif current_price > ma200.iloc[-1]:
+        elif current_price > ma200:
              trend_status = "Bullish (Correction)"
         else:
             trend_status = "Sideways / Choppy"
-            
+
         # MA Cross Signal
         ma_cross = "Neutral"
-        if ma20.iloc[-1] > ma50.iloc[-1] and ma20.iloc[-2] <= ma50.iloc[-2]:
+        if ma20 > ma50 and ind['ma20_prev'] <= ind['ma50_prev']:
             ma_cross = "GOLDEN CROSS (Bullish)"
-        elif ma20.iloc[-1] < ma50.iloc[-1] and ma20.iloc[-2] >= ma50.iloc[-2]:
+        elif ma20 < ma50 and ind['ma20_prev'] >= ind['ma50_prev']:
             ma_cross = "DEATH CROSS (Bearish)"
-            
+
         # 2. RSI (Momentum)
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-        
+        rsi = ind['rsi']
         rsi_signal = "Neutral"
         if rsi > 70: rsi_signal = "Overbought (Hati-hati)"
         elif rsi < 30: rsi_signal = "Oversold (Potensi Rebound)"
-        
+
         # 3. MACD
-        exp12 = close.ewm(span=12, adjust=False).mean()
-        exp26 = close.ewm(span=26, adjust=False).mean()
-        macd = exp12 - exp26
-        signal_line = macd.ewm(span=9, adjust=False).mean()
-        
-        macd_hist = macd.iloc[-1] - signal_line.iloc[-1]
-        macd_signal = "Bullish" if macd_hist > 0 else "Bearish"
-        
-        # 4. Support & Resistance (Simple Pivot)
-        recent_high = df['high'].iloc[-20:].max()
-        recent_low = df['low'].iloc[-20:].min()
-        
-        # 5. Volatility (Annualized) - Commodities can be volatile
-        log_ret = np.log(close / close.shift(1))
-        volatility = log_ret.std() * np.sqrt(252) * 100
-        
-        # 6. Volume Spike
-        avg_vol = df['volume'].iloc[-21:-1].mean()
-        curr_vol = df['volume'].iloc[-1]
+        macd_signal = "Bullish" if ind['macd_hist'] > 0 else "Bearish"
+
+        # 4. Volatility (Annualized) - Commodities can be volatile
+        volatility = ind['log_ret_std'] * np.sqrt(252) * 100
+
+        # 5. Volume Spike (today vs the previous 20 sessions)
+        avg_vol = ind['vol_avg20_prev']
         vol_spike = "Normal"
         if avg_vol > 0:
-            ratio = curr_vol / avg_vol
+            ratio = ind['volume'] / avg_vol
             if ratio > 2.0: vol_spike = "EXTREME (Bandar Masuk?)"
             elif ratio > 1.5: vol_spike = "High"
-            
-        # 7. 52-Week High/Low
-        high_52w = df['high'].iloc[-252:].max()
-        low_52w = df['low'].iloc[-252:].min()
 
         return {
             "symbol": ticker,
-            "price": current_price,
+            "price": as_price(current_price),
             "trend_status": trend_status,
             "ma_cross": ma_cross,
-            "ma20": round(ma20.iloc[-1], 2),
-            "ma50": round(ma50.iloc[-1], 2),
-            "ma200": round(ma200.iloc[-1], 2),
+            "ma20": round(ma20, 2),
+            "ma50": round(ma50, 2),
+            "ma200": round(ma200, 2),
             "rsi": round(rsi, 2),
             "rsi_signal": rsi_signal,
             "macd_signal": macd_signal,
-            "support": recent_low,
-            "resistance": recent_high,
+            # Support & Resistance (Simple 20-session Pivot)
+            "support": as_price(ind['low_min_20']),
+            "resistance": as_price(ind['high_max_20']),
             "volatility_annual": f"{volatility:.1f}%",
             "volume_spike": vol_spike,
-            "high_52w": high_52w,
-            "low_52w": low_52w
+            # 52-Week High/Low
+            "high_52w": as_price(ind['high_max_252']),
+            "low_52w": as_price(ind['low_min_252'])
         }
@@ -1,15 +1,26 @@
-import yfinance as yf
 import pandas as pd
 import asyncio
+from typing import Optional
 from .analyst import CommodityTechnicalAnalyst
 from .strategist import CommodityStrategist
 from agents.notifier_agent import NotifierAgent
+from agents.telegram import numbered
+from agents.subscribers import get_subscribers
+from agents.progress import SquadProgress
+from agents.analysis_pool import get_analysis_executor
+from agents.market_data import FrameRegistry, get_fetch_engine
 
 class CommodityManager:
-    def __init__(self):
+    squad = "commodities"  # Key in agents.swarm.SQUADS and in subscriber filters
+
+    def __init__(self, engine=None, outbox=None):
+        self.engine = engine or get_fetch_engine()
+        self.outbox = outbox
+        self.analysis = get_analysis_executor()
         self.analyst = CommodityTechnicalAnalyst()
         self.strategist = CommodityStrategist()
         self.notifier = NotifierAgent()
+        self.subscribers = get_subscribers()
         
         # Core Commodities Universe
         self.universe = [
@@ -19,39 +30,15 @@ class CommodityManager:
         ]
 
     def fetch_ohlcv(self, symbol: str) -> pd.DataFrame:
-        try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period="1y")
-            if df.empty: return pd.DataFrame()
-            
-            df = df.reset_index()
-            df = df.rename(columns={
-                "Date": "timestamp", "Open": "open", "High": "high", 
-                "Low": "low", "Close": "close", "Volume": "volume"
-            })
-            return df
-        except:
-            return pd.DataFrame()
+        return self.engine.fetch_sync(symbol)  # 1 year for MA200 calculation
 
-    async def run_daily_cycle(self):
-        print("🛢️ [Commodity Squad] Starting Macro Cycle...")
+    async def build_report(self, summaries: list) -> dict:
+        """Runs the strategist over the technical summaries (in parallel) and pairs the results per symbol."""
+        strategies = await self.strategist.generate_strategies(summaries)
         
         combined_report = {}
-        
-        # Analyze ALL 3 Assets (No filtering needed)
-        for symbol in self.universe:
-            df = self.fetch_ohlcv(symbol)
-            if df.empty: 
-                print(f"⚠️ Failed to fetch data for {symbol}")
-                continue
-            
-            print(f"\n👉 Analyzing Commodity: {symbol}")
-            
-            # 1. Technical Analysis
-            tech_summary = self.analyst.analyze_ticker(symbol, df)
-            
-            # 2. Strategy (LLM + Online Search)
-            strategy = await self.strategist.generate_strategy(tech_summary)
+        for tech_summary, strategy in zip(summaries, strategies):
+            symbol = tech_summary['symbol']
             
             # Extract news
             news = strategy.get('news', [])
@@ -61,9 +48,57 @@ class CommodityManager:
                 "strategy": strategy,
                 "news": news
             }
+        return combined_report
+
+    async def send_report(self, combined_report: dict):
+        if not combined_report:
+            return
+        if self.outbox is not None:
+            # Formatted once, persisted per subscriber chat, then delivered (rate limited, retried) by the outbox
+            parts = numbered(self.notifier.format_alert_commodity(combined_report), "Commodity Alert")
+            subscribers = self.subscribers.for_squad(self.squad)
+            if not subscribers:
+                print("⚠️ No subscriber chats for this squad. Skipping notification.")
+            for subscriber in subscribers:
+                for label, part in parts:
+                    self.outbox.put(subscriber.chat_id, part, label)
+        else:
+            await self.notifier.send_telegram_alert_commodity(combined_report)
+
+    async def run_daily_cycle(self, notify: bool = True, progress: Optional[SquadProgress] = None):
+        print("🛢️ [Commodity Squad] Starting Macro Cycle...")
+        # Fresh per cycle unless the caller tracks it (GET /runs/{id}): the manager itself is reused across runs
+        progress = progress or SquadProgress(self.squad)
+        
+        # Analyze ALL 3 Assets (No filtering needed)
+        progress.start("fetch")
+        registry = FrameRegistry()
+        fetched = await self.engine.fetch_many(self.universe, registry=registry)
+        
+        progress.start("analyze")
+        frames = {}
+        for symbol in self.universe:
+            df = fetched.frames.get(symbol)
+            if df is None: 
+                print(f"⚠️ Failed to fetch data for {symbol}: {fetched.failures.get(symbol, 'no data')}")
+                continue
+            
+            print(f"\n👉 Analyzing Commodity: {symbol}")
+            
+            frames[symbol] = df
+            
+        # 1. Technical Analysis (worker pool for large batches)
+        summaries = await self.analysis.analyze(self.analyst, frames)
+            
+        # 2. Strategy (LLM + Online Search), all assets in parallel
+        progress.start("strategize")
+        combined_report = await self.build_report(summaries)
             
         # 3. Send Notification
-        if combined_report:
-            self.notifier.send_telegram_alert_commodity(combined_report)
+        if notify:
+            progress.start("notify")
+            await self.send_report(combined_report)
+        else:
+            progress.skip("notify")
             
         return combined_report
@@ -1,15 +1,28 @@
-import yfinance as yf
 import pandas as pd
 import asyncio
+from typing import Optional
 from .analyst import CryptoTechnicalAnalyst
 from .strategist import CryptoStrategist
 from agents.notifier_agent import NotifierAgent
+from agents.telegram import numbered
+from agents.subscribers import get_subscribers
+from agents.progress import SquadProgress
+from agents.screener import UniverseScreener
+from agents.analysis_pool import get_analysis_executor
+from agents.market_data import FrameRegistry, get_fetch_engine
 
 class CryptoManager:
-    def __init__(self):
+    squad = "crypto"  # Key in agents.swarm.SQUADS and in subscriber filters
+
+    def __init__(self, engine=None, outbox=None):
+        self.engine = engine or get_fetch_engine()
+        self.outbox = outbox
+        self.screener = UniverseScreener()
+        self.analysis = get_analysis_executor()  # Moves large scans off the event loop
         self.analyst = CryptoTechnicalAnalyst()
         self.strategist = CryptoStrategist()
         self.notifier = NotifierAgent()
+        self.subscribers = get_subscribers()
         
         # Expanded Universe (Top Volume/Cap Coins)
         self.universe = [
@@ -19,77 +32,71 @@ class CryptoManager:
         ]
 
     def fetch_ohlcv(self, symbol: str) -> pd.DataFrame:
-        try:
-            # print(f"📉 Fetching {symbol}...")
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period="1y") # 1y to effectively calculate MA200
-            if df.empty: return pd.DataFrame()
-            
-            df = df.reset_index()
-            df = df.rename(columns={
-                "Date": "timestamp", "Open": "open", "High": "high", 
-                "Low": "low", "Close": "close", "Volume": "volume"
-            })
-            return df
-        except:
-            return pd.DataFrame()
+        return self.engine.fetch_sync(symbol)  # 1 year for MA200 calculation
 
-    async def get_top_candidates(self, limit=3):
+    async def get_top_candidates(self, limit=3, registry=None):
         """
         Scans the universe and returns top 'limit' assets based on:
         1. Volume Spike (Today vs Avg)
         2. Trend (Price > MA50)
-        3. Volatility (BB Width)
+        3. RSI (Sweet spot: 30-70)
         """
         print(f"🔍 Scanning {len(self.universe)} assets for Top {limit} Opportunities...")
-        candidates = []
+        # Pull the whole universe concurrently, then score it in one vectorized pass
+        fetched = await self.engine.fetch_many(self.universe, registry=registry)
+        fetched.report("Scan")
         
-        for symbol in self.universe:
-            df = self.fetch_ohlcv(symbol)
-            if df.empty or len(df) < 50: continue
-            
-            # Quick Tech Check (Lightweight)
-            # 1. Volume Spike
-            avg_vol = df['volume'].iloc[-21:-1].mean()
-            curr_vol = df['volume'].iloc[-1]
-            vol_spike = (curr_vol / avg_vol) if avg_vol > 0 else 0
-            
-            # 2. Trend
-            close = df['close'].iloc[-1]
-            ma50 = df['close'].rolling(50).mean().iloc[-1]
-            trend_score = 1 if close > ma50 else 0
-            
-            # 3. RSI (Simple calc for filter)
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs)).iloc[-1]
-            
-            # Score Calculation
-            # Prioritize: High Volume Spike + Bullish Trend + RSI not overbought (>70)
-            score = (vol_spike * 2) + (trend_score * 5)
-            if 30 < rsi < 70: score += 2 # Sweet spot
-            
-            candidates.append({
-                "symbol": symbol,
-                "score": score,
-                "data": df
-            })
-            
-        # Sort by score descending
-        sorted_candidates = sorted(candidates, key=lambda x: x['score'], reverse=True)
-        top_picks = sorted_candidates[:limit]
+        ranked = await self.analysis.rank(self.screener, fetched.frames, limit=limit)
+        top_picks = [{**pick, "data": fetched.frames[pick['symbol']]} for pick in ranked]
         
         print(f"✅ Selected Top {limit}: {[c['symbol'] for c in top_picks]}")
         return top_picks
 
-    async def run_daily_cycle(self):
+    async def build_report(self, summaries: list) -> dict:
+        """Runs the strategist over the technical summaries (in parallel) and pairs the results per symbol."""
+        strategies = await self.strategist.generate_strategies(summaries)
+        
+        combined_report = {}
+        for tech_summary, strategy in zip(summaries, strategies):
+            symbol = tech_summary['symbol']
+            
+            # Extract news
+            news = strategy.get('news', [])
+            
+            combined_report[symbol] = {
+                "technical": tech_summary,
+                "strategy": strategy,
+                "news": news # Added raw news for Notifier
+            }
+        return combined_report
+
+    async def send_report(self, combined_report: dict):
+        if not combined_report:
+            return
+        if self.outbox is not None:
+            # Formatted once, persisted per subscriber chat, then delivered (rate limited, retried) by the outbox
+            parts = numbered(self.notifier.format_alert(combined_report), "Telegram Alert")
+            subscribers = self.subscribers.for_squad(self.squad)
+            if not subscribers:
+                print("⚠️ No subscriber chats for this squad. Skipping notification.")
+            for subscriber in subscribers:
+                for label, part in parts:
+                    self.outbox.put(subscriber.chat_id, part, label)
+        else:
+            await self.notifier.send_telegram_alert(combined_report)
+
+    async def run_daily_cycle(self, notify: bool = True, progress: Optional[SquadProgress] = None):
         print("🪙 [Crypto Squad] Starting Smart Alert Cycle...")
+        # Fresh per cycle unless the caller tracks it (GET /runs/{id}): the manager itself is reused across runs
+        progress = progress or SquadProgress(self.squad)
+        
+        # One frame registry per cycle: the scan and deep analysis share downloads
+        progress.start("fetch")
+        registry = FrameRegistry()
         
         # 1. Automatic Filtering (Get ample candidates to ensure we fill 5 slots)
         # Fetch Top 10 first, then filter down
-        top_candidates = await self.get_top_candidates(limit=10)
+        top_candidates = await self.get_top_candidates(limit=10, registry=registry)
         
         # 2. Add Core Assets (The "Prophets")
         # Ensure BTC and ETH are always analyzed
@@ -100,7 +107,7 @@ class CryptoManager:
         
         # Add Core First
         for symbol in core_assets:
-            final_list.append({"symbol": symbol, "data": self.fetch_ohlcv(symbol)})
+            final_list.append({"symbol": symbol, "data": await self.engine.fetch(symbol, registry=registry)})
             seen.add(symbol)
             
         # Add Dynamic Assets (fill until we have 5 total)
@@ -111,10 +118,13 @@ class CryptoManager:
             if cand['symbol'] not in seen:
                 final_list.append(cand)
                 seen.add(cand['symbol'])
-        
-        combined_report = {}
+        # Screened-out bars are freed before the long LLM phase (the candidate list held them too)
+        del top_candidates
+        registry.retain(seen)
         
         # 3. Deep Analysis
+        progress.start("analyze")
+        frames = {}
         for asset in final_list:
             symbol = asset['symbol']
             df = asset['data']
@@ -123,25 +133,22 @@ class CryptoManager:
             
             print(f"\n👉 Analyzing Candidate: {symbol}")
             
-            # Tech Analysis (Deep)
-            tech_summary = self.analyst.analyze_ticker(symbol, df)
+            frames[symbol] = df
             
-            # Strategy (LLM with Online Search)
-            # News is now fetched internally by the Strategist
-            strategy = await self.strategist.generate_strategy(tech_summary)
+        # Tech Analysis (Deep), on the worker pool for large batches
+        summaries = await self.analysis.analyze(self.analyst, frames)
             
-            # Extract news
-            news = strategy.get('news', [])
-            
-            combined_report[symbol] = {
-                "technical": tech_summary,
-                "strategy": strategy,
-                "news": news # Added raw news for Notifier
-            }
+        # Strategy (LLM with Online Search), all candidates in parallel
+        # News is now fetched internally by the Strategist
+        progress.start("strategize")
+        combined_report = await self.build_report(summaries)
             
         # 4. Send Notification
-        if combined_report:
-            self.notifier.send_telegram_alert(combined_report)
+        if notify:
+            progress.start("notify")
+            await self.send_report(combined_report)
+        else:
+            progress.skip("notify")
             
         return combined_report
 
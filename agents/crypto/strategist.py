@@ -1,57 +1,49 @@
-import os
 import json
-from openai import AsyncOpenAI
+from agents.strategist_base import BaseStrategist
 
-class CryptoStrategist:
+class CryptoStrategist(BaseStrategist):
     """
     The 'Brain' of the Crypto Squad. 🧠
     Interprets Hard Metrics (Layer 1) into Strategic Advice (Layer 2).
+    Uses DeepSeek R1 with Online Search to generate sophisticated crypto strategy.
     """
-    def __init__(self):
-        self.api_key = os.getenv("OPENROUTER_API_KEY")
-        self.client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url="https://openrouter.ai/api/v1",
-        )
-        self.model = "deepseek/deepseek-r1:online"
-
-    async def generate_strategy(self, technical_summary: dict) -> dict:
-        """
-        Uses DeepSeek R1 with Online Search to generate sophisticated crypto strategy.
-        """
-        symbol = technical_summary.get('symbol', technical_summary.get('ticker', 'UNKNOWN'))
-        print(f"🧠 [Strategist] Thinking about {symbol} (Searching Web)...")
-        
-        system_prompt = """
-        Anda adalah Chief Crypto Strategist dari AlphaSwarm. Pengalaman 20 tahun di pasar Saham & Crypto.
-        
-        Tugas Anda: 
-        1. Cari berita AKTUAL/TERBARU tentang koin ini menggunakan Web Search (Hype, FUD, Development, Tokenomics).
-        2. Analisa data teknikal yang diberikan.
-        3. Berikan STRATEGI INVESTASI PROFESIONAL menggunakan '57 Market Concepts'.
-        
-        Gunakan BAHASA INDONESIA yang luwes, tajam, dan mudah dipahami.
-        
-        --- OUTPUT FORMAT (JSON) ---
-        {
-            "headline": "Judul bombastis/clickbait max 5 kata (Contoh: BTC SIAP MELEDAK KE 100K!)",
-            "market_phase": "Accumulation | Markup (Bull) | Distribution | Markdown (Bear)",
-            "psychology": "Neutral | Fear | Greed | FOMO | Panic",
-            "analysis_summary": "Paragraf lengkap (5-7 kalimat) dalam BAHASA INDONESIA. Integrasikan berita dan data on-chain/teknikal. Jelaskan KENAPA harus Buy/Wait.",
-            "news": [
-                {"title": "Judul Berita 1", "source": "Sumber", "url": "URL"},
-                {"title": "Judul Berita 2", "source": "Sumber", "url": "URL"}
-            ],
-            "action_plan": {
-                "signal": "BUY | SELL | WAIT | CUT LOSS",
-                "entry_zone": "Range Harga",
-                "stop_loss": "Harga",
-                "take_profit": "Harga"
-            }
+    system_prompt = """
+    Anda adalah Chief Crypto Strategist dari AlphaSwarm. Pengalaman 20 tahun di pasar Saham & Crypto.
+    
+    Tugas Anda: 
+    1. Cari berita AKTUAL/TERBARU tentang koin ini menggunakan Web Search (Hype, FUD, Development, Tokenomics).
+    2. Analisa data teknikal yang diberikan.
+    3. Berikan STRATEGI INVESTASI PROFESIONAL menggunakan '57 Market Concepts'.
+    
+    Gunakan BAHASA INDONESIA yang luwes, tajam, dan mudah dipahami.
+    
+    --- OUTPUT FORMAT (JSON) ---
+    {
+        "headline": "Judul bombastis/clickbait max 5 kata (Contoh: BTC SIAP MELEDAK KE 100K!)",
+        "market_phase": "Accumulation | Markup (Bull) | Distribution | Markdown (Bear)",
+        "psychology": "Neutral | Fear | Greed | FOMO | Panic",
+        "analysis_summary": "Paragraf lengkap (5-7 kalimat) dalam BAHASA INDONESIA. Integrasikan berita dan data on-chain/teknikal. Jelaskan KENAPA harus Buy/Wait.",
+        "news": [
+            {"title": "Judul Berita 1", "source": "Sumber", "url": "URL"},
+            {"title": "Judul Berita 2", "source": "Sumber", "url": "URL"}
+        ],
+        "action_plan": {
+            "signal": "BUY | SELL | WAIT | CUT LOSS",
+            "entry_zone": "Range Harga",
+            "stop_loss": "Harga",
+            "take_profit": "Harga"
         }
-        """
-        
-        user_prompt = f"""
+    }
+    """
+
+    # Fields build_user_prompt() reads, with their cache bucket (see agents/strategy_cache.py)
+    prompt_fields = {
+        "price": "2%", "trend_status": None, "ma20": "2%", "rsi": 5, "bb_width": 1,
+        "volume_spike": 0.5, "support": "2%", "resistance": "2%",
+    }
+
+    def build_user_prompt(self, symbol: str, technical_summary: dict) -> str:
+        return f"""
         Analyze {symbol} based on this data:
         
         TECHNICALS:
@@ -68,28 +60,6 @@ class CryptoStrategist:
         3. Fill the 'news' array in JSON with valid URLs found.
         """
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            return json.loads(content)
-            
-        except Exception as e:
-            print(f"❌ Strategist Error: {e}")
-            return {
-                "headline": f"{symbol} Analysis Error",
-                "analysis_summary": "Gagal mengambil analisa mental.",
-                "news": [],
-                "action_plan": {"signal": "WAIT"}
-            }
-
 if __name__ == "__main__":
     # Test stub
     import asyncio
@@ -100,7 +70,7 @@ if __name__ == "__main__":
             "technical_indicators": {"trend": {"status": "Bullish", "ma_cross_signal": "GOLDEN CROSS"}},
             "price": 95000
         }
-        res = await strat.generate_strategy(mock_data, ["BTC hits ATH"])
+        res = await strat.generate_strategy(mock_data)  # News is searched by the model itself
         print(json.dumps(res, indent=2))
         
     asyncio.run(test())
@@ -0,0 +1,140 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _tail_mean(values: np.ndarray, window: int, offset: int = 0) -> float:
+    """Mean of the `window` bars ending `offset` bars before the last (NaN if history is too short)."""
+    end = len(values) - offset
+    if end < window:
+        return float("nan")
+    return float(values[end - window:end].mean())
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+class IndicatorEngine:
+    """
+    Single-pass indicator computation shared by every squad's analyst.
+    Each series is computed once per frame and intermediates are reused
+    (e.g. the 20-bar window feeds both MA20 and the Bollinger mid/std).
+    Only the values the analysts read (last bar, plus the previous bar for
+    cross detection) are produced, so rolling windows cost O(window) instead
+    of O(history). Thresholds and labels stay with the analysts.
+    With a state store the same keys come from streaming IndicatorState objects
+    (see agents/streaming.py) that only apply the bars added since the last call.
+    """
+
+    def __init__(self, state_store=None):
+        # Optional IndicatorStateStore: when set, symbols are advanced incrementally
+        self.state_store = state_store
+
+    def compute(self, ohlcv_df: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, float]:
+        if self.state_store is not None and symbol:
+            # Streaming path: only bars newer than the saved state are applied
+            state = self.state_store.load(symbol)
+            state.sync(ohlcv_df)
+            self.state_store.save(symbol, state)
+            return state.snapshot()
+
+        return self.compute_arrays(
+            np.asarray(ohlcv_df['close'], dtype=float),
+            np.asarray(ohlcv_df['high'], dtype=float),
+            np.asarray(ohlcv_df['low'], dtype=float),
+            np.asarray(ohlcv_df['volume'], dtype=float),
+        )
+
+    def compute_arrays(self, close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       volume: np.ndarray) -> Dict[str, float]:
+        n = len(close)
+        price = float(close[-1])
+        nan = float("nan")
+
+        # Moving averages (last and previous bar for cross detection)
+        ma20, ma20_prev = _tail_mean(close, 20), _tail_mean(close, 20, offset=1)
+        ma50, ma50_prev = _tail_mean(close, 50), _tail_mean(close, 50, offset=1)
+        ma200, ma200_prev = _tail_mean(close, 200), _tail_mean(close, 200, offset=1)
+
+        # Bollinger (20, 2): reuses the MA20 window as the mid line
+        std20 = float(np.sqrt(((close[-20:] - ma20) ** 2).sum() / 19)) if n >= 20 else nan
+
+        # RSI 14 (simple means of gains / losses over the last 14 changes)
+        if n >= 15:
+            delta = np.diff(close[-15:])
+            gain = delta.clip(min=0).mean()
+            loss = (-delta).clip(min=0).mean()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = float(100 - (100 / (1 + np.float64(gain) / loss)))
+        else:
+            rsi = nan
+
+        # MACD (12, 26, 9)
+        macd_line = _ema(close, 12) - _ema(close, 26)
+        signal_line = _ema(macd_line, 9)
+        hist = macd_line - signal_line
+
+        # Drawdown from running peak
+        running_max = np.fmax.accumulate(close)
+        drawdown = (close - running_max) / running_max * 100
+
+        # Volatility of daily log returns (annualized by the analyst)
+        log_ret = np.log(close[1:] / close[:-1])
+        log_ret_std = float(np.nanstd(log_ret, ddof=1)) if n > 2 else nan
+
+        def roi(bars: int) -> float:
+            if n < bars:
+                return nan
+            prev = close[-bars]
+            return float((price - prev) / prev * 100)
+
+        return {
+            "bars": n,
+            "price": price,
+            "ma20": ma20, "ma20_prev": ma20_prev,
+            "ma50": ma50, "ma50_prev": ma50_prev,
+            "ma200": ma200, "ma200_prev": ma200_prev,
+            "bb_upper": ma20 + 2 * std20,
+            "bb_lower": ma20 - 2 * std20,
+            "bb_bandwidth": (4 * std20) / ma20 * 100 if ma20 else nan,
+            "rsi": rsi,
+            "macd": float(macd_line[-1]),
+            "macd_signal": float(signal_line[-1]),
+            "macd_hist": float(hist[-1]),
+            "macd_hist_prev": float(hist[-2]) if n >= 2 else nan,
+            "max_drawdown": float(np.nanmin(drawdown)),
+            "current_drawdown": float(drawdown[-1]),
+            "log_ret_std": log_ret_std,
+            "roi_7d": roi(7),
+            "roi_30d": roi(30),
+            "volume": float(volume[-1]),
+            "vol_avg20": _tail_mean(volume, 20),                 # Includes today's bar
+            "vol_avg20_prev": float(np.nanmean(volume[-21:-1])) if n > 1 else nan,  # Previous 20 bars
+            "close_max_30": float(np.nanmax(close[-30:])),
+            "close_min_30": float(np.nanmin(close[-30:])),
+            "high_max_20": float(np.nanmax(high[-20:])),
+            "low_min_20": float(np.nanmin(low[-20:])),
+            "close_max_252": float(np.nanmax(close[-252:])),
+            "close_min_252": float(np.nanmin(close[-252:])),
+            "high_max_252": float(np.nanmax(high[-252:])),
+            "low_min_252": float(np.nanmin(low[-252:])),
+        }
+
+
+def as_price(value: float) -> float:
+    """
+    Plain float rounded to the 7 significant digits float32 bars carry, for
+    summaries, prompts and run results (513.11962890625 -> 513.1196).
+    """
+    value = float(value)
+    if not math.isfinite(value) or value == 0:
+        return value
+    return round(value, 6 - math.floor(math.log10(abs(value))))
+
+
+def pct_label(value: float) -> str:
+    """Formats a return in percent the way the reports show it (+1.23%), 'N/A' when unavailable."""
+    return "N/A" if math.isnan(value) else f"{value:+.2f}%"
@@ -0,0 +1,172 @@
+import os
+import heapq
+import socket
+import asyncio
+import itertools
+import threading
+import importlib.util
+from typing import List, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from dotenv import load_dotenv
+
+from agents.rate_limit import TokenBucket
+from agents.telemetry import current_span
+
+CORE_PRIORITY, DEFAULT_PRIORITY = 0, 1
+
+
+class LLMGateway:
+    """
+    The one OpenRouter client all strategists share.
+    - A single AsyncOpenAI per event loop over a keep-alive httpx pool (HTTP/2 when
+      the h2 package is installed), so squads reuse connections instead of each
+      paying its own TLS handshakes.
+    - Global OPENROUTER_RPM / OPENROUTER_TPM token buckets. Tokens are estimated
+      before a call and corrected from the reported usage after it.
+    - When the buckets make callers wait, they are admitted by priority, then in
+      arrival order: core assets (OPENROUTER_PRIORITY_SYMBOLS, BTC-USD and ETH-USD
+      by default) go first.
+    """
+
+    def __init__(self):
+        load_dotenv()
+        self.api_key = os.getenv("OPENROUTER_API_KEY")
+        self.base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        self.max_connections = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "20"))
+        self.keepalive = float(os.getenv("OPENROUTER_KEEPALIVE", "120"))
+        self.http2 = os.getenv("OPENROUTER_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+        # R1 answers (reasoning included) run to a few thousand tokens; corrected once usage is known
+        self.completion_estimate = int(os.getenv("OPENROUTER_COMPLETION_ESTIMATE", "2000"))
+        self.priority_symbols = {s.strip() for s in os.getenv("OPENROUTER_PRIORITY_SYMBOLS", "BTC-USD,ETH-USD").split(",") if s.strip()}
+
+        rpm, tpm = float(os.getenv("OPENROUTER_RPM", "60")), float(os.getenv("OPENROUTER_TPM", "0"))
+        # A minute's allowance as burst, refilled continuously (0 means unlimited)
+        self.rpm = TokenBucket(rpm / 60, capacity=rpm) if rpm > 0 else None
+        self.tpm = TokenBucket(tpm / 60, capacity=tpm) if tpm > 0 else None
+
+        self._client: Optional[AsyncOpenAI] = None
+        self._http: Optional[httpx.AsyncClient] = None  # The client's pool, kept to close it without its loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting: list = []  # heap of (priority, arrival, future)
+        self._arrivals = itertools.count()
+        self._busy = False  # A caller is at the head, waiting on the buckets
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        # Pooled connections and queued futures belong to the loop that made them (asyncio.run() makes a new one each time)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._client is not None:
+                self._retire(self._client, self._http, self._loop)
+            self._client, self._http = None, None
+            self._waiting, self._busy = [], False
+            self._loop = loop
+        return loop
+
+    @staticmethod
+    def _retire(client: AsyncOpenAI, http: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Closes a client left behind by another event loop."""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it over there
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+            return
+        # Its loop is gone (asyncio.run() returned without aclose()), so the pool can't be awaited:
+        # shut the pooled sockets down directly, the file descriptors go with the client
+        pool = getattr(getattr(http, "_transport", None), "_pool", None)
+        for conn in list(getattr(pool, "connections", ())):
+            stream = getattr(getattr(conn, "_connection", None), "_network_stream", None)
+            sock = stream.get_extra_info("socket") if stream is not None else None
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        self._bind()
+        if self._client is None:
+            self._http = DefaultAsyncHttpxClient(
+                http2=self.http2,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections,
+                                    keepalive_expiry=self.keepalive),
+            )
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=self._http)
+        return self._client
+
+    async def aclose(self):
+        """Closes the pool of the running loop's client; call it before that loop ends."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.close()
+            self._client, self._http = None, None
+
+    def priority_of(self, symbol: Optional[str]) -> int:
+        return CORE_PRIORITY if symbol in self.priority_symbols else DEFAULT_PRIORITY
+
+    def estimate_tokens(self, messages: List[dict]) -> int:
+        # ~4 characters per token is close enough for budgeting
+        return sum(len(m.get("content") or "") for m in messages) // 4 + self.completion_estimate
+
+    async def _admit(self, priority: int, tokens: int) -> float:
+        """Waits for this caller's turn and its share of both buckets. Returns the seconds spent waiting."""
+        loop = self._bind()
+        started = loop.time()
+        if self._busy or self._waiting:
+            turn = loop.create_future()
+            heapq.heappush(self._waiting, (priority, next(self._arrivals), turn))
+            try:
+                await turn
+            except asyncio.CancelledError:
+                if turn.done() and not turn.cancelled():
+                    self._hand_over()  # Given the turn but cancelled before using it
+                raise
+        self._busy = True
+        try:
+            if self.rpm is not None:
+                await self.rpm.acquire()
+            if self.tpm is not None:
+                await self.tpm.acquire(min(tokens, self.tpm.capacity))
+        finally:
+            self._hand_over()
+        return loop.time() - started
+
+    def _hand_over(self):
+        while self._waiting:
+            _, _, turn = heapq.heappop(self._waiting)
+            if not turn.done():  # Skips callers cancelled while queued
+                turn.set_result(None)
+                return
+        self._busy = False
+
+    async def chat(self, messages: List[dict], model: str, symbol: Optional[str] = None, **kwargs):
+        """chat.completions.create() through the shared pool and rate limits; `symbol` sets the queue priority."""
+        estimate = self.estimate_tokens(messages)
+        waited = await self._admit(self.priority_of(symbol), estimate)
+        if waited >= 0.001:
+            current_span().set(queued_ms=round(waited * 1000, 1))
+
+        response = await self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        if self.tpm is not None and response.usage is not None:
+            self.tpm.adjust(response.usage.total_tokens - estimate)
+        return response
+
+
+_default_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()  # Strategists are built on worker threads (swarm.preload_agents, load_manager)
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway, so every strategist shares one connection pool and one rate budget."""
+    global _default_gateway
+    with _gateway_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway()
+        return _default_gateway
+
+
+async def close_llm_gateway():
+    """Closes the shared gateway's connections, if it was ever used on this loop."""
+    if _default_gateway is not None:
+        await _default_gateway.aclose()
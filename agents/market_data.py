@@ -0,0 +1,198 @@
+import os
+import asyncio
+import weakref
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from agents.bars import Bars
+from agents.bar_store import CachedSource
+from agents.telemetry import span
+
+
+def normalize_history(df: pd.DataFrame) -> pd.DataFrame:
+    """Flattens a yfinance history frame into the lowercase OHLCV layout the analysts expect."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    df = df.reset_index()
+    return df.rename(columns={
+        "Date": "timestamp", "Datetime": "timestamp", "Open": "open", "High": "high",
+        "Low": "low", "Close": "close", "Volume": "volume"
+    })
+
+
+class YFinanceSource:
+    """
+    Blocking yfinance loader.
+    Any object exposing the same fetch(symbol, period, interval, start=None) can
+    replace it, e.g. a local stub that serves recorded frames.
+    """
+
+    def fetch(self, symbol: str, period: str = "1y", interval: str = "1d", start: Optional[str] = None) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol)
+        if start:
+            # Incremental top-up requested by the bar store
+            return normalize_history(ticker.history(start=start, interval=interval))
+        return normalize_history(ticker.history(period=period, interval=interval))
+
+
+class FetchResult:
+    """Outcome of a universe fetch: bars that arrived plus the reason for every symbol that did not."""
+
+    def __init__(self):
+        self.frames: Dict[str, Bars] = {}
+        self.failures: Dict[str, str] = {}
+
+    def report(self, label: str = "Fetch"):
+        total = len(self.frames) + len(self.failures)
+        if self.failures:
+            details = ", ".join(f"{s} ({reason})" for s, reason in self.failures.items())
+            print(f"⚠️ [{label}] {len(self.failures)}/{total} symbols failed: {details}")
+
+
+class FrameRegistry:
+    """
+    Run-scoped memo of fetched frames keyed by (symbol, period, interval).
+    Every phase of a cycle reads through it, so a symbol needed by both the scan
+    and the deep analysis hits the network once; concurrent requests for the same
+    key share a single in-flight download.
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: tuple, loader):
+        """`loader` is a coroutine factory returning (frame, error)."""
+        future = self._entries.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._entries[key] = future
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        # Shielded so one cancelled caller can't abort a download other phases are waiting on
+        df, error = await asyncio.shield(future)
+        if error and self._entries.get(key) is future:
+            del self._entries[key]  # Failures are not memoized: a later phase may retry
+        return df, error
+
+    def retain(self, symbols: Iterable[str]):
+        """Drops every entry whose symbol is not in `symbols`, so bars of screened-out symbols can be freed."""
+        keep = set(symbols)
+        for key in [k for k in self._entries if k[0] not in keep]:
+            del self._entries[key]
+
+
+class FetchEngine:
+    """
+    Concurrent OHLCV loader shared by all squads.
+    Runs the blocking source calls on a bounded thread pool so a universe scan
+    costs roughly one round trip instead of one per symbol, and never blocks the event loop.
+    """
+
+    def __init__(self, source=None, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.source = source or YFinanceSource()
+        self.max_workers = max_workers or int(os.getenv("FETCH_MAX_WORKERS", "8"))
+        self.timeout = timeout or float(os.getenv("FETCH_TIMEOUT", "20"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ohlcv")
+        # One slot per worker thread, shared by every fetch_many() on the same loop
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def fetch_sync(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Blocking single-symbol fetch for callers outside the event loop."""
+        with span("fetch", symbol=symbol, interval=interval) as s:
+            try:
+                df = self.source.fetch(symbol, period, interval)
+            except Exception as e:
+                s.fail(str(e) or type(e).__name__)
+                return pd.DataFrame()
+            df = df if df is not None else pd.DataFrame()
+            s.set(rows=len(df), bytes=int(df.memory_usage(index=False).sum()))
+            return df
+
+    async def fetch(self, symbol: str, period: str = "1y", interval: str = "1d",
+                    registry: Optional[FrameRegistry] = None) -> Bars:
+        result = await self.fetch_many([symbol], period, interval, registry=registry)
+        bars = result.frames.get(symbol)
+        return bars if bars is not None else Bars.from_frame(symbol, None)
+
+    async def fetch_many(self, symbols: Iterable[str], period: str = "1y", interval: str = "1d",
+                         registry: Optional[FrameRegistry] = None) -> FetchResult:
+        """
+        Fetches every symbol concurrently (bounded by max_workers) into compact Bars.
+        A slow or failing symbol never sinks the batch: it lands in result.failures instead.
+        Pass the cycle's FrameRegistry to reuse frames an earlier phase already pulled.
+        """
+        loop = asyncio.get_running_loop()
+        # Engine-wide slots keep queued symbols (of every squad) from burning their timeout waiting for a worker
+        slots = self._slots.setdefault(loop, asyncio.Semaphore(self.max_workers))
+
+        def release(future: asyncio.Future):
+            # The slot is held until the worker thread is done, even after a timeout gave up on it
+            slots.release()
+            if not future.cancelled():
+                future.exception()  # Retrieved so an abandoned failure isn't logged as unhandled
+
+        async def download(symbol: str):
+            await slots.acquire()
+            with span("fetch", symbol=symbol, interval=interval) as s:
+                # The worker thread runs in a copy of this context, so the source can annotate the span
+                ctx = contextvars.copy_context()
+                try:
+                    job = loop.run_in_executor(self._executor, ctx.run, self.source.fetch, symbol, period, interval)
+                except BaseException:
+                    slots.release()
+                    raise
+                job.add_done_callback(release)
+                try:
+                    df = await asyncio.wait_for(asyncio.shield(job), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    s.fail(f"timeout after {self.timeout:.0f}s", status="timeout")
+                    return None, s.error
+                except Exception as e:
+                    s.fail(str(e) or type(e).__name__)
+                    return None, s.error
+                if df is None or df.empty:
+                    s.fail("no data")
+                    return None, "no data"
+                s.set(rows=len(df), bytes=int(df.memory_usage(index=False).sum()))
+                # Only the compact copy outlives this call; the source frame is freed here
+                return Bars.from_frame(symbol, df), None
+
+        async def load(symbol: str):
+            if registry is None:
+                return (symbol,) + await download(symbol)
+            return (symbol,) + await registry.get_or_load((symbol, period, interval), lambda: download(symbol))
+
+        result = FetchResult()
+        outcomes = await asyncio.gather(*(load(s) for s in dict.fromkeys(symbols)))
+        for symbol, df, error in outcomes:
+            if error:
+                result.failures[symbol] = error
+            else:
+                result.frames[symbol] = df
+        return result
+
+
+_default_engine: Optional[FetchEngine] = None
+
+
+def get_fetch_engine() -> FetchEngine:
+    """
+    Process-wide engine so every squad shares one worker pool.
+    Backed by the on-disk bar store unless BAR_STORE_DIR is set to an empty string.
+    """
+    global _default_engine
+    if _default_engine is None:
+        source = YFinanceSource()
+        if os.getenv("BAR_STORE_DIR", ".cache/bars"):
+            source = CachedSource(source)
+        _default_engine = FetchEngine(source=source)
+    return _default_engine
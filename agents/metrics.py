@@ -0,0 +1,205 @@
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from agents.telemetry import add_sink
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+LLM_BUCKETS = (1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.lines()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in self.values.items()]
+
+
+class Gauge(_Metric):
+    """Set directly, or read at scrape time from `fn` (a number, or {label values tuple: number})."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), fn: Optional[Callable] = None):
+        super().__init__(name, help, labels)
+        self.fn = fn
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self.values[self._key(labels)] = value
+
+    def lines(self) -> List[str]:
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception:
+                return []  # A broken collector must not take /metrics down with it
+            values = value if isinstance(value, dict) else {(): value}
+        else:
+            with self._lock:
+                values = dict(self.values)
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self.series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def lines(self) -> List[str]:
+        out = []
+        with self._lock:
+            for key, (counts, total, count) in self.series.items():
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    le = 'le="%s"' % _number(bound)
+                    out.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                out.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return out
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text format (0.0.4) by GET /metrics.
+    Stage metrics are fed from the telemetry spans (see agents/telemetry.py), so the
+    instrumented code never talks to this module directly.
+    """
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+        self.fetch_seconds = self.histogram("alphaswarm_fetch_seconds", "OHLCV fetch latency per symbol", ["status"])
+        self.bar_store = self.counter("alphaswarm_bar_store_total", "Bar store lookups by result (hit, incremental, refresh, miss, stale)", ["result"])
+        self.analyze_seconds = self.histogram("alphaswarm_analyze_seconds", "Indicator computation per symbol", ["status"])
+        self.llm_seconds = self.histogram("alphaswarm_llm_seconds", "Strategist LLM call latency (cache hits excluded)",
+                                          ["strategist", "status"], buckets=LLM_BUCKETS)
+        self.llm_tokens = self.histogram("alphaswarm_llm_tokens", "Tokens used per strategist LLM call",
+                                         ["strategist", "kind"], buckets=TOKEN_BUCKETS)
+        self.llm_queue_seconds = self.histogram("alphaswarm_llm_queue_seconds", "Time strategist calls waited on the OpenRouter RPM/TPM budget",
+                                                ["strategist"])
+        self.strategy_cache = self.counter("alphaswarm_strategy_cache_total", "Strategy cache lookups by result", ["strategist", "result"])
+        self.telegram_seconds = self.histogram("alphaswarm_telegram_send_seconds", "Telegram sendMessage latency including retries", ["status"])
+        self.telegram_retries = self.counter("alphaswarm_telegram_retries_total", "Telegram request retries")
+        self.telegram_429 = self.counter("alphaswarm_telegram_429_total", "Telegram flood-control (429) responses")
+        self.stage_errors = self.counter("alphaswarm_stage_errors_total", "Failed spans by stage", ["stage"])
+
+        add_sink(self.record_span)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = (), fn: Optional[Callable] = None) -> Gauge:
+        return self._add(Gauge(name, help, labels, fn))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def record_span(self, record: dict):
+        stage, status = record["stage"], record["status"]
+        seconds = record["duration_ms"] / 1000
+        if status != "ok":
+            self.stage_errors.inc(stage=stage)
+
+        if stage == "fetch":
+            self.fetch_seconds.observe(seconds, status=status)
+            if "store" in record:
+                self.bar_store.inc(result=record["store"])
+        elif stage == "analyze":
+            self.analyze_seconds.observe(seconds, status=status)
+        elif stage == "llm":
+            strategist = record.get("strategist", "")
+            if "cache" in record:
+                # A batched call is one lookup per symbol it carries
+                self.strategy_cache.inc(record.get("symbols", 1), strategist=strategist, result=record["cache"])
+            if record.get("cache") != "hit":
+                self.llm_seconds.observe(seconds, strategist=strategist, status=status)
+            if "queued_ms" in record:
+                self.llm_queue_seconds.observe(record["queued_ms"] / 1000, strategist=strategist)
+            for kind in ("prompt", "completion"):
+                if f"{kind}_tokens" in record:
+                    self.llm_tokens.observe(record[f"{kind}_tokens"], strategist=strategist, kind=kind)
+        elif stage == "notify":
+            self.telegram_seconds.observe(seconds, status=status)
+            self.telegram_retries.inc(record.get("retries", 0))
+            self.telegram_429.inc(record.get("flood_waits", 0))
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
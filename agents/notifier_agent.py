@@ -1,286 +1,59 @@
 import os
-import requests
-import json
-from datetime import datetime
-import html
+from typing import List
+from agents.render import render_alert
+from agents.telegram import TelegramError, get_telegram_transport, numbered
 
 class NotifierAgent:
     def __init__(self):
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.transport = get_telegram_transport()
 
-    def send_telegram_alert(self, report_data: dict):
+    def format_alert(self, report_data: dict) -> List[str]:
         """
-        Formats and sends a Telegram alert for the Top Candidates.
+        Formats the Telegram alert (HTML) for the Top Crypto Candidates,
+        split into parts that each fit one sendMessage.
         """
-        if not self.bot_token or not self.chat_id:
-            print("⚠️ Telegram credentials missing. Skipping notification.")
-            return
+        return render_alert("crypto", report_data)
 
-        print("📢 [Notifier] Sending Telegram Alert...")
-        
-        # 1. Header
-        date_str = datetime.now().strftime("%d %b %Y")
-        message = f"🔥 <b>ALPHASWARM: INTEL PASAR CRYPTO</b> ({date_str})\n\n"
-        
-        # 2. Iterate Top Assets
-        for ticker, data in report_data.items():
-            strat = data.get('strategy', {})
-            plan = strat.get('action_plan', {})
-            tech = data.get('technical', {})
-            
-            signal = plan.get('signal', 'WAIT')
-            icon = "🟢" if "BUY" in signal else "🔴" if "SELL" in signal else "🟡"
-            
-            # TradingView Link
-            clean_ticker = ticker.split('-')[0] + "USDT" 
-            tv_link = f"https://www.tradingview.com/chart/?symbol=BINANCE:{clean_ticker}"
-            
-            # Dynamic Headline (Hook)
-            headline = html.escape(strat.get('headline', f"Analisa Harian {ticker}"))
-            
-            # Asset Block
-            message += f"💎 <b>{ticker}</b> {icon} <b>{headline}</b>\n"
-            message += f"💵 Harga: ${tech.get('price', 0):,.2f}\n\n"
-            
-            # 1. Rich Analysis (The "Why")
-            raw_analysis = strat.get('analysis_summary', 'Belum ada analisa.')
-            if len(raw_analysis) > 280: raw_analysis = raw_analysis[:277] + "..."
-            analysis_text = html.escape(raw_analysis)
-            message += f"🧠 <b>Analisa Bandar &amp; Teknikal:</b>\n<i>{analysis_text}</i>\n\n"
-            
-            # 2. Key Metrics (Uniform for ALL assets)
-            message += f"🛡️ <b>Data Kunci:</b>\n"
-            message += f"• Fase: {strat.get('market_phase', 'Unknown')}\n"
-            message += f"• Psikologis: {strat.get('psychology', 'Neutral')}\n"
-            message += f"• Support: {tech.get('support', 'N/A')} | Res: {tech.get('resistance', 'N/A')}\n"
-            message += f"• RSI: {tech.get('rsi', 'N/A')} | Vol: {tech.get('volume_spike', 'N/A')}\n"
-            
-            # 3. Trade Setup (Only if Signal is Actionable)
-            entry = plan.get('entry_zone')
-            if signal in ["BUY", "SELL"] and entry and entry != "N/A":
-                 message += f"\n🎯 <b>Rencana Trade ({signal}):</b>\n" 
-                 message += f"• Masuk: {entry}\n"
-                 message += f"• Target: {plan.get('take_profit')}\n"
-                 message += f"• Stop: {plan.get('stop_loss')}"
+    def format_alert_stock(self, report_data: dict) -> List[str]:
+        """Formats Telegram alert for TOP US STOCKS (one or more sendMessage parts)."""
+        return render_alert("stocks", report_data)
 
-            # 4. News Section (Hybrid Option A+B)
-            news_items = data.get('news', [])
-            if news_items:
-                message += f"\n📰 <b>Berita Terkini:</b>\n"
-                # Limit to 1 news item if analyzing 5 assets
-                limit_news = 1 if len(report_data) >= 5 else 2
-                for item in news_items[:limit_news]:
-                    title = html.escape(item.get('title', 'No Title'))
-                    source = html.escape(item.get('source', 'Web'))
-                    url = item.get('url', '')
-                    if len(title) > 60: title = title[:57] + "..."
-                    message += f"• <a href='{url}'>{title}</a> ({source})\n"
-            
-            message += f"\n🔗 <a href='{tv_link}'>Lihat Chart</a>\n\n"
-            
-        message += "<i>🤖 Disusun oleh AlphaSwarm AI</i>"
-
-        # 3. Send Request
-        payload = {
-            "chat_id": self.chat_id,
-            "text": message,
-            "parse_mode": "HTML",
-            "disable_web_page_preview": True
-        }
-        
-        try:
-            r = requests.post(f"{self.base_url}/sendMessage", json=payload)
-            if r.status_code == 200:
-                print("✅ Telegram Sent Successfully!")
-            else:
-                print(f"❌ Telegram Error: {r.text}")
-        except Exception as e:
-            print(f"❌ Network Error: {e}")
+    def format_alert_commodity(self, report_data: dict) -> List[str]:
+        """Formats Telegram alert for COMMODITIES (Gold, Silver, Oil), one or more parts."""
+        return render_alert("commodities", report_data)
 
-    def send_telegram_alert_stock(self, report_data: dict):
-        """
-        Formats and sends Telegram alert for TOP US STOCKS.
-        Separate from Crypto to avoid character limit issues.
-        """
+    async def send_message(self, message: str, label: str = "Telegram Alert") -> bool:
+        """Delivers one formatted HTML message through the shared async transport."""
         if not self.bot_token or not self.chat_id:
             print("⚠️ Telegram credentials missing. Skipping notification.")
-            return
-
-        print("📢 [Notifier] Sending Wall Street Alert...")
-        
-        # 1. Header
-        date_str = datetime.now().strftime("%d %b %Y")
-        message = f"🦅 <b>ALPHASWARM: INTEL WALL STREET</b> ({date_str})\n\n"
-        
-        # 2. Iterate Top Stocks
-        for ticker, data in report_data.items():
-            strat = data.get('strategy', {})
-            plan = strat.get('action_plan', {})
-            tech = data.get('technical', {})
-            
-            signal = plan.get('signal', 'WAIT')
-            icon = "🟢" if "BUY" in signal else "🔴" if "SELL" in signal else "🟡"
-            
-            # TradingView Link (Stock format)
-            tv_link = f"https://www.tradingview.com/chart/?symbol=NASDAQ:{ticker}"
-            
-            # Dynamic Headline (Hook)
-            headline = html.escape(strat.get('headline', f"Analisa Harian {ticker}"))
-            
-            # Asset Block
-            message += f"📊 <b>{ticker}</b> {icon} <b>{headline}</b>\n"
-            message += f"💵 Harga: ${tech.get('price', 0):,.2f}\n\n"
-            
-            # 1. Rich Analysis
-            raw_analysis = strat.get('analysis_summary', 'Belum ada analisa.')
-            if len(raw_analysis) > 280: raw_analysis = raw_analysis[:277] + "..."
-            analysis_text = html.escape(raw_analysis)
-            message += f"🧠 <b>Analisa Institusi &amp; Teknikal:</b>\n<i>{analysis_text}</i>\n\n"
-            
-            # 2. Key Metrics (Uniform)
-            message += f"🛡️ <b>Data Kunci:</b>\n"
-            message += f"• Fase: {strat.get('market_phase', 'Unknown')}\n"
-            message += f"• Psikologis: {strat.get('psychology', 'Neutral')}\n"
-            message += f"• Support: ${tech.get('support', 'N/A')} | Res: ${tech.get('resistance', 'N/A')}\n"
-            message += f"• RSI: {tech.get('rsi', 'N/A')} | Vol: {tech.get('volume_spike', 'N/A')}\n"
-            message += f"• 52W High: ${tech.get('high_52w', 'N/A')} | Low: ${tech.get('low_52w', 'N/A')}\n"
-            
-            # 3. Trade Setup (Conditional)
-            entry = plan.get('entry_zone')
-            if signal in ["BUY", "SELL"] and entry and entry != "N/A":
-                 message += f"\n🎯 <b>Rencana Trade ({signal}):</b>\n" 
-                 message += f"• Masuk: {entry}\n"
-                 message += f"• Target: {plan.get('take_profit')}\n"
-                 message += f"• Stop: {plan.get('stop_loss')}"
+            return False
 
-            # 4. News Section
-            news_items = data.get('news', [])
-            if news_items:
-                message += f"\n📰 <b>Berita Terkini:</b>\n"
-                # Limit to 1 news item if analyzing 5 stocks to save space
-                limit_news = 1 if len(report_data) >= 5 else 2
-                for item in news_items[:limit_news]:
-                    title = html.escape(item.get('title', 'No Title'))
-                    source = html.escape(item.get('source', 'Web'))
-                    url = item.get('url', '')
-                    if len(title) > 60: title = title[:57] + "..."
-                    message += f"• <a href='{url}'>{title}</a> ({source})\n"
-            
-            message += f"\n🔗 <a href='{tv_link}'>Lihat Chart</a>\n\n"
-            
-        message += "<i>🤖 Disusun oleh AlphaSwarm AI</i>"
-
-        # 3. Send Request
-        payload = {
-            "chat_id": self.chat_id,
-            "text": message,
-            "parse_mode": "HTML",
-            "disable_web_page_preview": True
-        }
-        
+        print(f"📢 [Notifier] Sending {label}...")
         try:
-            r = requests.post(f"{self.base_url}/sendMessage", json=payload)
-            if r.status_code == 200:
-                print("✅ Wall Street Alert Sent Successfully!")
-            else:
-                print(f"❌ Telegram Error: {r.text}")
-        except Exception as e:
-            print(f"❌ Network Error: {e}")
+            await self.transport.send_message(self.bot_token, self.chat_id, message)
+            print(f"✅ {label} Sent Successfully!")
+            return True
+        except TelegramError as e:
+            print(f"❌ Telegram Error: {e}")
+            return False
 
-    def send_telegram_alert_commodity(self, report_data: dict):
-        """
-        Formats and sends Telegram alert for COMMODITIES (Gold, Silver, Oil).
-        """
-        if not self.bot_token or not self.chat_id:
-            print("⚠️ Telegram credentials missing. Skipping notification.")
-            return
+    async def send_parts(self, parts: List[str], label: str = "Telegram Alert") -> bool:
+        """Sends a split alert part by part, in order."""
+        ok = True
+        for part_label, part in numbered(parts, label):
+            ok = await self.send_message(part, part_label) and ok
+        return ok
 
-        print("📢 [Notifier] Sending Commodity Alert...")
-        
-        # 1. Header
-        date_str = datetime.now().strftime("%d %b %Y")
-        message = f"🛢️ <b>ALPHASWARM: INTEL KOMODITAS & MACRO</b> ({date_str})\n\n"
-        
-        # 2. Iterate Assets
-        for ticker, data in report_data.items():
-            strat = data.get('strategy', {})
-            plan = strat.get('action_plan', {})
-            tech = data.get('technical', {})
-            
-            signal = plan.get('signal', 'WAIT')
-            icon = "🟢" if "BUY" in signal else "🔴" if "SELL" in signal else "🟡"
-            
-            # Custom Names
-            clean_name = ticker
-            if "GC=F" in ticker: clean_name = "GOLD (XAU/USD)"
-            elif "SI=F" in ticker: clean_name = "SILVER (XAG/USD)"
-            elif "CL=F" in ticker: clean_name = "WTI CRUDE OIL"
-            
-            # TradingView Link (Futures)
-            tv_link = "https://www.tradingview.com/symbols/XAUUSD/" if "GC" in ticker else "https://www.tradingview.com/chart"
-            
-            # Dynamic Headline
-            headline = html.escape(strat.get('headline', f"Analisa {clean_name}"))
-            
-            # Asset Block
-            message += f"🌍 <b>{clean_name}</b> {icon} <b>{headline}</b>\n"
-            message += f"💵 Harga: ${tech.get('price', 0):,.2f}\n\n"
-            
-            # 1. Rich Analysis
-            raw_analysis = strat.get('analysis_summary', 'Belum ada analisa.')
-            if len(raw_analysis) > 280: raw_analysis = raw_analysis[:277] + "..."
-            analysis_text = html.escape(raw_analysis)
-            message += f"🧠 <b>Analisa Macro &amp; Supply:</b>\n<i>{analysis_text}</i>\n\n"
-            
-            # 2. Key Metrics
-            message += f"🛡️ <b>Data Kunci:</b>\n"
-            message += f"• Fase: {strat.get('market_phase', 'Unknown')}\n"
-            message += f"• Psikologis: {strat.get('psychology', 'Neutral')}\n"
-            message += f"• RSI: {tech.get('rsi', 'N/A')} | MA Trend: {tech.get('trend_status', 'N/A')}\n"
-            message += f"• Support: ${tech.get('support', 'N/A')} | Res: ${tech.get('resistance', 'N/A')}\n"
-            
-            # 3. Trade Setup
-            entry = plan.get('entry_zone')
-            if signal in ["BUY", "SELL"] and entry and entry != "N/A":
-                 message += f"\n🎯 <b>Rencana Trade ({signal}):</b>\n" 
-                 message += f"• Masuk: {entry}\n"
-                 message += f"• Target: {plan.get('take_profit')}\n"
-                 message += f"• Stop: {plan.get('stop_loss')}"
+    async def send_telegram_alert(self, report_data: dict) -> bool:
+        return await self.send_parts(self.format_alert(report_data), "Telegram Alert")
 
-            # 4. News Section
-            news_items = data.get('news', [])
-            if news_items:
-                message += f"\n📰 <b>Berita &amp; Geopolitik:</b>\n"
-                # Always show 1 relevant news item
-                for item in news_items[:1]:
-                    title = html.escape(item.get('title', 'No Title'))
-                    source = html.escape(item.get('source', 'Web'))
-                    url = item.get('url', '')
-                    if len(title) > 60: title = title[:57] + "..."
-                    message += f"• <a href='{url}'>{title}</a> ({source})\n"
-            
-            message += f"\n🔗 <a href='{tv_link}'>Lihat Chart</a>\n\n"
-            
-        message += "<i>🤖 Disusun oleh AlphaSwarm AI (Commodity Squad)</i>"
+    async def send_telegram_alert_stock(self, report_data: dict) -> bool:
+        return await self.send_parts(self.format_alert_stock(report_data), "Wall Street Alert")
 
-        # 3. Send Request
-        payload = {
-            "chat_id": self.chat_id,
-            "text": message,
-            "parse_mode": "HTML",
-            "disable_web_page_preview": True
-        }
-        
-        try:
-            r = requests.post(f"{self.base_url}/sendMessage", json=payload)
-            if r.status_code == 200:
-                print("✅ Commodity Alert Sent Successfully!")
-            else:
-                print(f"❌ Telegram Error: {r.text}")
-        except Exception as e:
-            print(f"❌ Network Error: {e}")
+    async def send_telegram_alert_commodity(self, report_data: dict) -> bool:
+        return await self.send_parts(self.format_alert_commodity(report_data), "Commodity Alert")
 
 if __name__ == "__main__":
     # Test
@@ -346,4 +119,5 @@ if __name__ == "__main__":
             "technical": {"price": 6.5, "support": 6.0, "resistance": 7.2, "rsi": 35, "volume_spike": 0.5}
         }
     }
-    agent.send_telegram_alert(mock_data)
+    import asyncio
+    asyncio.run(agent.send_telegram_alert(mock_data))
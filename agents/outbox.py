@@ -0,0 +1,280 @@
+import os
+import time
+import sqlite3
+import asyncio
+import hashlib
+import contextvars
+from typing import Dict, Optional
+
+from agents.rate_limit import TokenBucket, bucket_for_interval
+from agents.telegram import TelegramError, get_telegram_transport
+from agents.telemetry import current_run, join_run
+
+
+SCHEMA = ("id INTEGER PRIMARY KEY AUTOINCREMENT, hash TEXT, chat_id TEXT, text TEXT, label TEXT, "
+          "status TEXT DEFAULT 'pending', attempts INTEGER DEFAULT 0, next_attempt_at REAL, "
+          "created_at REAL, sent_at REAL, last_error TEXT, run_id TEXT")
+
+
+class Outbox:
+    """
+    Durable, rate-limited queue for the final Telegram sends.
+    Every formatted message is written to SQLite before anything is sent; a
+    background worker then delivers them, retrying failures with backoff.
+    Chats are served side by side (one lane per chat, keeping that chat's
+    messages in order), each lane at most one message per `interval` seconds
+    and all lanes together under TELEGRAM_GLOBAL_RATE messages per second.
+    An identical message (same chat and text) is not queued again while one is
+    still pending or by the run that already queued it, and rows still pending
+    after a crash or restart are picked up again by start(), so no LLM cycle has
+    to be re-run. Sent and failed rows are pruned after OUTBOX_RETENTION_DAYS.
+    Delivery is at-least-once: a crash between Telegram accepting a message and
+    the row being marked sent re-sends it.
+    Each row remembers the telemetry run that queued it, so its send is timed as
+    part of that run while the run is still collecting.
+    """
+
+    def __init__(self, path: Optional[str] = None, interval: Optional[float] = None,
+                 max_attempts: Optional[int] = None, backoff: Optional[float] = None):
+        self.path = path if path is not None else os.getenv("OUTBOX_PATH", ".cache/outbox.sqlite")
+        self.interval = interval if interval is not None else float(os.getenv("TELEGRAM_SEND_INTERVAL", "3"))
+        self.max_attempts = max_attempts or int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("OUTBOX_RETRY_BACKOFF", "30"))
+        self.retention = float(os.getenv("OUTBOX_RETENTION_DAYS", "7")) * 86400
+        self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
+        self.transport = get_telegram_transport()
+
+        # Telegram allows ~30 messages/s per bot overall and far less per chat
+        # No burst allowance: sends are spread evenly so no 1s window exceeds the rate
+        self.global_bucket = TokenBucket(float(os.getenv("TELEGRAM_GLOBAL_RATE", "25")), capacity=1.0)
+        self._chat_buckets: Dict[str, Optional[TokenBucket]] = {}
+
+        # An empty OUTBOX_PATH keeps the queue in memory (paced and retried, but not durable)
+        if self.path and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path or ":memory:", check_same_thread=False)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS messages ({SCHEMA})")
+        self._migrate()
+        self._db.execute("CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS messages_hash ON messages (hash)")
+        self._db.commit()
+        self._pruned_at = 0.0
+
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lanes: Dict[str, asyncio.Task] = {}
+
+    def _migrate(self):
+        """Brings outbox files written by earlier versions up to SCHEMA."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(messages)")}
+        if "run_id" not in columns:
+            self._db.execute("ALTER TABLE messages ADD COLUMN run_id TEXT")
+        # Hashes used to be UNIQUE forever; SQLite can't drop a constraint, so the table is rebuilt
+        if any(index[3] == "u" for index in self._db.execute("PRAGMA index_list(messages)")):
+            names = ", ".join(row[1] for row in self._db.execute("PRAGMA table_info(messages)"))
+            with self._db:
+                self._db.execute(f"CREATE TABLE messages_new ({SCHEMA})")
+                self._db.execute(f"INSERT INTO messages_new ({names}) SELECT {names} FROM messages")
+                self._db.execute("DROP TABLE messages")
+                self._db.execute("ALTER TABLE messages_new RENAME TO messages")
+
+    @staticmethod
+    def message_hash(chat_id: str, text: str) -> str:
+        return hashlib.sha256(f"{chat_id}\n{text}".encode()).hexdigest()
+
+    def put(self, chat_id: str, text: str, label: str = "Telegram Alert") -> bool:
+        """
+        Persists one formatted message and makes sure the worker is running.
+        Returns False when it was not queued: missing credentials, or a duplicate,
+        i.e. the same message is still pending or this run already queued it.
+        A new run (e.g. a deliberate re-trigger) may send the same text again.
+        """
+        if not self.bot_token or not chat_id:
+            print("⚠️ Telegram credentials missing. Skipping notification.")
+            return False
+
+        now = time.time()
+        run = current_run()
+        run_id = run.id if run else None
+        digest = self.message_hash(chat_id, text)
+        with self._db:
+            duplicate = self._db.execute(
+                "SELECT 1 FROM messages WHERE hash = ? AND (status = 'pending' OR run_id = ?) LIMIT 1",
+                (digest, run_id)
+            ).fetchone()
+            if duplicate is None:
+                self._db.execute(
+                    "INSERT INTO messages (hash, chat_id, text, label, next_attempt_at, created_at, run_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, str(chat_id), text, label, now, now, run_id)
+                )
+        if duplicate is not None:
+            print(f"♻️ [Outbox] {label} already queued, skipping duplicate.")
+            return False
+
+        self.prune()
+        self.start()
+        return True
+
+    def prune(self, force: bool = False):
+        """Deletes sent and failed rows older than the retention period (at most once an hour unless forced)."""
+        now = time.time()
+        if not force and now - self._pruned_at < 3600:
+            return
+        self._pruned_at = now
+        with self._db:
+            cur = self._db.execute("DELETE FROM messages WHERE status != 'pending' AND created_at < ?",
+                                   (now - self.retention,))
+        if cur.rowcount:
+            print(f"🧹 [Outbox] Pruned {cur.rowcount} delivered or failed alert(s)")
+
+    def pending(self, run_id: Optional[str] = None) -> int:
+        """Messages not yet sent or given up; only those queued by `run_id` when given."""
+        if run_id is None:
+            return self._db.execute("SELECT COUNT(*) FROM messages WHERE status = 'pending'").fetchone()[0]
+        return self._db.execute("SELECT COUNT(*) FROM messages WHERE status = 'pending' AND run_id = ?",
+                                (run_id,)).fetchone()[0]
+
+    def start(self):
+        """Starts the delivery worker (if not running). Call on startup to resume a previous run's backlog."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._lanes = {}
+            # Fresh context: the worker outlives the run that started it; each send joins its own row's run (_lane)
+            self._worker = contextvars.Context().run(loop.create_task, self._run())
+        self._wakeup.set()
+
+    def _heads(self):
+        """Oldest pending message of every chat (a chat never skips ahead of its own backlog)."""
+        return self._db.execute(
+            "SELECT chat_id, next_attempt_at FROM messages WHERE id IN "
+            "(SELECT MIN(id) FROM messages WHERE status = 'pending' GROUP BY chat_id)"
+        ).fetchall()
+
+    def _head(self, chat_id: str):
+        return self._db.execute(
+            "SELECT id, text, label, attempts, next_attempt_at, created_at, run_id FROM messages "
+            "WHERE status = 'pending' AND chat_id = ? ORDER BY id LIMIT 1",
+            (chat_id,)
+        ).fetchone()
+
+    def _chat_bucket(self, chat_id: str) -> Optional[TokenBucket]:
+        if chat_id not in self._chat_buckets:
+            self._chat_buckets[chat_id] = bucket_for_interval(self.interval)
+        return self._chat_buckets[chat_id]
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            next_retry = None
+            for chat_id, due_at in self._heads():
+                if due_at > now:
+                    next_retry = due_at if next_retry is None else min(next_retry, due_at)
+                elif chat_id not in self._lanes or self._lanes[chat_id].done():
+                    self._lanes[chat_id] = asyncio.create_task(self._lane(chat_id))
+
+            # Sleep until a message arrives, a lane finishes or the earliest retry is due
+            self._wakeup.clear()
+            try:
+                timeout = None if next_retry is None else max(0.0, next_retry - time.time())
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _lane(self, chat_id: str):
+        """Delivers one chat's due messages in order; exits when its backlog is empty or waiting on a retry."""
+        try:
+            while True:
+                row = self._head(chat_id)
+                if row is None or row[4] > time.time():
+                    return
+                msg_id, text, label, attempts, _, created_at, run_id = row
+
+                bucket = self._chat_bucket(chat_id)
+                if bucket is not None:
+                    await bucket.acquire()
+                await self.global_bucket.acquire()
+                if bucket is not None:
+                    bucket.restart()  # Per-chat spacing counts from the actual send, after any global wait
+
+                print(f"📢 [Notifier] Sending {label} to {chat_id}...")
+                try:
+                    with join_run(run_id):
+                        await self.transport.send_message(self.bot_token, chat_id, text)
+                    sent_at = time.time()
+                    self._db.execute("UPDATE messages SET status = 'sent', sent_at = ? WHERE id = ?", (sent_at, msg_id))
+                    print(f"✅ {label} Sent Successfully! ({chat_id}, {sent_at - created_at:.1f}s after queueing)")
+                except Exception as e:
+                    attempts += 1
+                    # A 4xx other than 429 (bad HTML, chat not found) won't succeed on a retry
+                    permanent = isinstance(e, TelegramError) and e.status is not None and 400 <= e.status < 500 and e.status != 429
+                    if permanent or attempts >= self.max_attempts:
+                        self._db.execute(
+                            "UPDATE messages SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                            (attempts, str(e), msg_id)
+                        )
+                        print(f"❌ [Outbox] {label} to {chat_id} dropped after {attempts} attempt(s): {e}")
+                    else:
+                        delay = self.backoff * (2 ** (attempts - 1))
+                        self._db.execute(
+                            "UPDATE messages SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                            (attempts, time.time() + delay, str(e), msg_id)
+                        )
+                        print(f"❌ [Outbox] {label} to {chat_id} failed ({e}), retrying in {delay:.0f}s")
+                finally:
+                    self._db.commit()
+        finally:
+            self._wakeup.set()
+
+    def report(self, since: float = 0.0) -> Dict[str, dict]:
+        """
+        Per-chat delivery summary for messages queued after `since` (epoch seconds):
+        sent / failed / pending counts and queue-to-delivery latency.
+        """
+        rows = self._db.execute(
+            "SELECT chat_id, status, COUNT(*), AVG(sent_at - created_at), MAX(sent_at - created_at) "
+            "FROM messages WHERE created_at >= ? GROUP BY chat_id, status",
+            (since,)
+        ).fetchall()
+
+        stats: Dict[str, dict] = {}
+        for chat_id, status, count, avg_latency, max_latency in rows:
+            chat = stats.setdefault(chat_id, {"sent": 0, "failed": 0, "pending": 0})
+            chat[status] = count
+            if status == "sent":
+                chat["avg_latency"], chat["max_latency"] = avg_latency, max_latency
+
+        for chat_id, chat in stats.items():
+            latency = f", latency avg {chat['avg_latency']:.1f}s / max {chat['max_latency']:.1f}s" if chat["sent"] else ""
+            icon = "✅" if not chat["failed"] and not chat["pending"] else "⚠️"
+            print(f"{icon} [Outbox] {chat_id}: {chat['sent']} sent, {chat['failed']} failed, {chat['pending']} pending{latency}")
+        return stats
+
+    async def drain(self, timeout: Optional[float] = None):
+        """
+        Waits until the messages queued by the current run (every pending one
+        outside a run) are sent or given up. The worker keeps running, since other
+        squads or runs may still be queueing.
+        """
+        run = current_run()
+        run_id = run.id if run else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending(run_id):
+            if deadline is not None and time.monotonic() > deadline:
+                print(f"⏱️ [Outbox] {self.pending(run_id)} message(s) still pending, delivery continues in the background.")
+                break
+            if self._worker is None or self._worker.done():
+                self.start()  # E.g. rows left by a previous process, queued before start() ran
+            await asyncio.sleep(0.1)
+
+
+_default_outbox: Optional[Outbox] = None
+
+
+def get_outbox() -> Outbox:
+    """Process-wide outbox: one SQLite queue and one paced sender for every squad."""
+    global _default_outbox
+    if _default_outbox is None:
+        _default_outbox = Outbox()
+    return _default_outbox
@@ -0,0 +1,64 @@
+import time
+from typing import Dict, Optional
+
+# Pipeline phases every squad cycle goes through, in order
+PHASES = ("fetch", "analyze", "strategize", "notify")
+
+
+class SquadProgress:
+    """
+    Phase-by-phase progress of one squad cycle, reported by the managers
+    (start("fetch"), start("analyze"), ...) and read back by GET /runs/{id}.
+    Starting a phase closes the previous one; finish() closes the last.
+    """
+
+    def __init__(self, squad: str):
+        self.squad = squad
+        self.status = "pending"
+        self.phases: Dict[str, dict] = {name: {"status": "pending"} for name in PHASES}
+        self.current: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def _close(self, status: str):
+        if self.current is None:
+            return
+        phase = self.phases[self.current]
+        phase["status"] = status
+        phase["finished_at"] = time.time()
+        phase["duration"] = round(phase["finished_at"] - phase["started_at"], 3)
+        self.current = None
+
+    def start(self, phase: str):
+        now = time.time()
+        self._close("done")
+        if self.started_at is None:
+            self.started_at = now
+            self.status = "running"
+        self.phases[phase] = {"status": "running", "started_at": now}
+        self.current = phase
+
+    def skip(self, phase: str):
+        """Marks a phase this cycle doesn't run (e.g. notify on a dry run)."""
+        self._close("done")
+        self.phases[phase] = {"status": "skipped"}
+
+    def finish(self, error: Optional[str] = None):
+        if self.finished_at is not None:
+            return
+        self._close("failed" if error else "done")
+        self.finished_at = time.time()
+        self.status = "failed" if error else "done"
+        self.error = error
+
+    def to_dict(self) -> dict:
+        done = sum(1 for p in self.phases.values() if p["status"] in ("done", "skipped"))
+        return {
+            "status": self.status,
+            "phase": self.current,
+            "progress": f"{done}/{len(self.phases)}",
+            "duration": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "error": self.error,
+            "phases": self.phases,
+        }
@@ -0,0 +1,55 @@
+import time
+import asyncio
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursts up to `capacity`.
+    acquire() waits until a token is available, so callers sharing a bucket
+    are spread out instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Takes `tokens`, waiting if needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return waited
+            delay = (tokens - self.tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+    def adjust(self, tokens: float):
+        """
+        Corrects an earlier acquire() once the real cost is known: positive takes more
+        (the balance may go negative, delaying later callers), negative refunds.
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - tokens)
+
+    def restart(self):
+        """
+        Restarts refilling from now. Call right before the action a token was taken
+        for, when that action got delayed (e.g. by waiting on a second bucket), so
+        the spacing is measured from when it really happened.
+        """
+        self.updated = time.monotonic()
+
+
+def bucket_for_interval(interval: float, capacity: float = 1.0) -> Optional[TokenBucket]:
+    """Bucket allowing one token every `interval` seconds (None means unlimited)."""
+    return TokenBucket(1.0 / interval, capacity) if interval > 0 else None
@@ -0,0 +1,150 @@
+import html
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from agents.telegram import split_message
+
+
+class _Defaults(dict):
+    """Format context that renders missing technical fields as 'N/A'."""
+
+    def __missing__(self, key):
+        return "N/A"
+
+
+class AlertTemplate:
+    """
+    Telegram alert layout for one asset class.
+    The per-asset block is compiled once into a few str.format templates, so
+    rendering is a handful of format_map() calls joined together instead of
+    dozens of string concatenations. Only the header, names, chart links and
+    metric lines differ between asset classes; everything else is shared.
+    """
+
+    def __init__(self, title: str, footer: str, asset_icon: str, analysis_title: str,
+                 metric_lines: Sequence[str], news_title: str, chart_link: Callable[[str], str],
+                 display_name: Optional[Callable[[str], str]] = None, default_headline: str = "Analisa Harian {name}"):
+        self.title = title
+        self.footer = footer
+        self.chart_link = chart_link
+        self.display_name = display_name or (lambda ticker: ticker)
+        self.default_headline = default_headline
+
+        # Compiled pieces (literal braces in the copy are escaped once, here)
+        self.head = (
+            f"{asset_icon} <b>{{name}}</b> {{icon}} <b>{{headline}}</b>\n"
+            "💵 Harga: ${price:,.2f}\n\n"
+            f"🧠 <b>{analysis_title}:</b>\n<i>{{analysis}}</i>\n\n"
+            "🛡️ <b>Data Kunci:</b>\n"
+            "• Fase: {market_phase}\n"
+            "• Psikologis: {psychology}\n"
+            + "".join(line + "\n" for line in metric_lines)
+        )
+        self.trade = "\n🎯 <b>Rencana Trade ({signal}):</b>\n• Masuk: {entry}\n• Target: {take_profit}\n• Stop: {stop_loss}"
+        self.news_head = f"\n📰 <b>{news_title}:</b>\n"
+        self.news_item = "• <a href='{url}'>{title}</a> ({source})\n"
+        self.tail = "\n🔗 <a href='{link}'>Lihat Chart</a>\n\n"
+
+    def header(self, date_str: str) -> str:
+        return f"{self.title} ({date_str})\n\n"
+
+    def render_block(self, ticker: str, data: dict) -> str:
+        strat = data.get('strategy', {})
+        plan = strat.get('action_plan', {})
+        tech = data.get('technical', {})
+
+        signal = plan.get('signal', 'WAIT')
+        name = self.display_name(ticker)
+
+        analysis = strat.get('analysis_summary', 'Belum ada analisa.')
+        if len(analysis) > 280: analysis = analysis[:277] + "..."
+
+        ctx = _Defaults(tech)
+        ctx.update(
+            name=name,
+            icon="🟢" if "BUY" in signal else "🔴" if "SELL" in signal else "🟡",
+            headline=html.escape(strat.get('headline', self.default_headline.format(name=name))),
+            price=tech.get('price', 0),
+            analysis=html.escape(analysis),
+            market_phase=strat.get('market_phase', 'Unknown'),
+            psychology=strat.get('psychology', 'Neutral'),
+        )
+        parts = [self.head.format_map(ctx)]
+
+        # Trade setup only when the signal is actionable
+        entry = plan.get('entry_zone')
+        if signal in ["BUY", "SELL"] and entry and entry != "N/A":
+            parts.append(self.trade.format(signal=signal, entry=entry,
+                                           take_profit=plan.get('take_profit'), stop_loss=plan.get('stop_loss')))
+
+        news_items = data.get('news', [])
+        if news_items:
+            parts.append(self.news_head)
+            for item in news_items[:2]:
+                title = html.escape(item.get('title', 'No Title'))
+                if len(title) > 60: title = title[:57] + "..."
+                parts.append(self.news_item.format(url=item.get('url', ''), title=title,
+                                                   source=html.escape(item.get('source', 'Web'))))
+
+        parts.append(self.tail.format(link=self.chart_link(ticker)))
+        return "".join(parts)
+
+    def render(self, report_data: dict, date_str: Optional[str] = None) -> List[str]:
+        """Whole alert, split into sendMessage-sized parts on asset boundaries."""
+        date_str = date_str or datetime.now().strftime("%d %b %Y")
+        blocks = [self.render_block(ticker, data) for ticker, data in report_data.items()]
+        return split_message(self.header(date_str), blocks, self.footer)
+
+
+def _commodity_name(ticker: str) -> str:
+    if "GC=F" in ticker: return "GOLD (XAU/USD)"
+    if "SI=F" in ticker: return "SILVER (XAG/USD)"
+    if "CL=F" in ticker: return "WTI CRUDE OIL"
+    return ticker
+
+
+TEMPLATES: Dict[str, AlertTemplate] = {
+    "crypto": AlertTemplate(
+        title="🔥 <b>ALPHASWARM: INTEL PASAR CRYPTO</b>",
+        footer="<i>🤖 Disusun oleh AlphaSwarm AI</i>",
+        asset_icon="💎",
+        analysis_title="Analisa Bandar &amp; Teknikal",
+        metric_lines=[
+            "• Support: {support} | Res: {resistance}",
+            "• RSI: {rsi} | Vol: {volume_spike}",
+        ],
+        news_title="Berita Terkini",
+        chart_link=lambda t: f"https://www.tradingview.com/chart/?symbol=BINANCE:{t.split('-')[0]}USDT",
+    ),
+    "stocks": AlertTemplate(
+        title="🦅 <b>ALPHASWARM: INTEL WALL STREET</b>",
+        footer="<i>🤖 Disusun oleh AlphaSwarm AI</i>",
+        asset_icon="📊",
+        analysis_title="Analisa Institusi &amp; Teknikal",
+        metric_lines=[
+            "• Support: ${support} | Res: ${resistance}",
+            "• RSI: {rsi} | Vol: {volume_spike}",
+            "• 52W High: ${high_52w} | Low: ${low_52w}",
+        ],
+        news_title="Berita Terkini",
+        chart_link=lambda t: f"https://www.tradingview.com/chart/?symbol=NASDAQ:{t}",
+    ),
+    "commodities": AlertTemplate(
+        title="🛢️ <b>ALPHASWARM: INTEL KOMODITAS & MACRO</b>",
+        footer="<i>🤖 Disusun oleh AlphaSwarm AI (Commodity Squad)</i>",
+        asset_icon="🌍",
+        analysis_title="Analisa Macro &amp; Supply",
+        metric_lines=[
+            "• RSI: {rsi} | MA Trend: {trend_status}",
+            "• Support: ${support} | Res: ${resistance}",
+        ],
+        news_title="Berita &amp; Geopolitik",
+        chart_link=lambda t: "https://www.tradingview.com/symbols/XAUUSD/" if "GC" in t else "https://www.tradingview.com/chart",
+        display_name=_commodity_name,
+        default_headline="Analisa {name}",
+    ),
+}
+
+
+def render_alert(squad: str, report_data: dict, date_str: Optional[str] = None) -> List[str]:
+    return TEMPLATES[squad].render(report_data, date_str)
@@ -0,0 +1,185 @@
+import os
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from agents.progress import SquadProgress
+from agents.swarm import SQUADS, analyze_symbol, run_swarm, squad_for
+from agents.telemetry import RunStats, collect
+
+
+class Run:
+    """
+    One triggered cycle: the squads it runs (or "squad:SYMBOL" for a single-asset
+    analysis), their phase progress and a compact result.
+    """
+
+    def __init__(self, squads: List[str], notify: bool = True, joined: Optional[Dict[str, str]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.squads = squads
+        self.notify = notify
+        # Squads requested while already in flight elsewhere -> the run doing them
+        self.joined = joined or {}
+        self.progress = {name: SquadProgress(name) for name in squads}
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stats: Optional[RunStats] = None
+
+    @staticmethod
+    def summarize(report: Optional[dict]) -> Optional[dict]:
+        """Signal, headline and price per symbol (the full report stays in Telegram)."""
+        if report is None:
+            return None
+        return {
+            symbol: {
+                "signal": data.get('strategy', {}).get('action_plan', {}).get('signal', 'WAIT'),
+                "headline": data.get('strategy', {}).get('headline'),
+                "price": data.get('technical', {}).get('price'),
+            }
+            for symbol, data in report.items()
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.id,
+            "status": self.status,
+            "squads": {name: p.to_dict() for name, p in self.progress.items()},
+            "notify": self.notify,
+            "joined": self.joined,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "result": self.result,
+            "error": self.error,
+            "telemetry": self.stats.summary() if self.stats else None,
+        }
+
+
+class RunCoordinator:
+    """
+    Starts swarm cycles for the API, with at most one cycle per squad (and one
+    analysis per symbol) in flight. A trigger for squads that are all already
+    running in one run joins it and gets its ID back; otherwise a new run starts
+    with just the squads nobody is running and follows the others (`joined`),
+    so its progress and result still cover every squad requested.
+    Finished runs are kept (RUN_HISTORY most recent) for GET /runs/{id}.
+    """
+
+    def __init__(self, history: Optional[int] = None):
+        self.history = history if history is not None else int(os.getenv("RUN_HISTORY", "50"))
+        self.runs: "OrderedDict[str, Run]" = OrderedDict()
+        self.active: Dict[str, Run] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, squads: Optional[Iterable[str]] = None, notify: bool = True) -> Tuple[Run, bool]:
+        """Returns (run, started): started is False when the request joined a run in flight."""
+        async def job(run: Run) -> Dict[str, Optional[dict]]:
+            return await run_swarm(run.squads, progress=run.progress, notify=notify)
+
+        return self._start(list(squads or SQUADS), notify, job)
+
+    def submit_symbol(self, symbol: str, squad: Optional[str] = None, notify: bool = False) -> Tuple[Run, bool]:
+        """Same as submit() for one symbol's fetch -> analyze -> strategize (-> notify) pipeline."""
+        squad = squad or squad_for(symbol)
+        key = f"{squad}:{symbol}"
+
+        async def job(run: Run) -> Dict[str, Optional[dict]]:
+            return {key: await analyze_symbol(symbol, squad, notify, progress=run.progress[key])}
+
+        return self._start([key], notify, job)
+
+    def _start(self, names: List[str], notify: bool,
+               job: Callable[[Run], Awaitable[Dict[str, Optional[dict]]]]) -> Tuple[Run, bool]:
+        joined = {name: self.active[name] for name in names if name in self.active}
+        todo = [name for name in names if name not in joined]
+        if not todo and len({run.id for run in joined.values()}) == 1:
+            run = self.active[names[0]]
+            print(f"🔗 [Runs] {', '.join(names)} already in flight, joining run {run.id}")
+            return run, False
+
+        # Squads in flight elsewhere are followed, not restarted: their progress and results show up here too
+        run = Run(todo, notify, joined={name: other.id for name, other in joined.items()})
+        run.progress = {name: joined[name].progress[name] if name in joined else run.progress[name] for name in names}
+        for name in todo:
+            self.active[name] = run
+        self._remember(run)
+        if not todo:
+            print(f"🔗 [Runs] {', '.join(names)} already in flight in runs "
+                  f"{', '.join(sorted(set(run.joined.values())))}, following them as run {run.id}")
+
+        task = run.task = asyncio.create_task(self._execute(run, job, joined))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return run, bool(todo)
+
+    async def _execute(self, run: Run, job: Callable[[Run], Awaitable[Dict[str, Optional[dict]]]],
+                       joined: Dict[str, Run]):
+        run.status = "running"
+        run.started_at = time.time()
+        print(f"🚀 [Runs] Run {run.id} started: {', '.join(run.progress)}")
+        try:
+            with collect(run.id) as run.stats:
+                reports = await job(run) if run.squads else {}
+            self._release(run)
+            run.result = {name: Run.summarize(report) for name, report in reports.items()}
+            # Joined squads finish in their own runs; their results complete this one
+            others = {other.task for other in joined.values() if other.task is not None}
+            if others:
+                await asyncio.wait(others)
+            for name, other in joined.items():
+                run.result[name] = (other.result or {}).get(name)
+            failed = [name for name, p in run.progress.items() if p.status == "failed"]
+            run.status = "failed" if failed else "succeeded"
+            if failed:
+                run.error = f"Squad(s) failed: {', '.join(failed)}"
+        except asyncio.CancelledError:
+            run.status = "cancelled"  # Server shutting down mid-cycle
+            raise
+        except Exception as e:
+            run.status = "failed"
+            run.error = str(e) or type(e).__name__
+            for name in run.squads:
+                run.progress[name].finish(error=run.error)
+        finally:
+            run.finished_at = time.time()
+            self._release(run)
+            print(f"🏁 [Runs] Run {run.id} {run.status} in {run.finished_at - run.started_at:.1f}s")
+
+    def _release(self, run: Run):
+        """Lets new triggers start the run's own squads again."""
+        for name in run.squads:
+            if self.active.get(name) is run:
+                del self.active[name]
+
+    def _remember(self, run: Run):
+        self.runs[run.id] = run
+        # Forget the oldest finished runs; in-flight ones always stay visible
+        for run_id in list(self.runs):
+            if len(self.runs) <= self.history:
+                break
+            if self.runs[run_id].finished_at is not None:
+                del self.runs[run_id]
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self.runs.get(run_id)
+
+    def in_flight(self) -> int:
+        return len({run.id for run in self.active.values()})
+
+
+_default_coordinator: Optional[RunCoordinator] = None
+
+
+def get_run_coordinator() -> RunCoordinator:
+    global _default_coordinator
+    if _default_coordinator is None:
+        _default_coordinator = RunCoordinator()
+    return _default_coordinator
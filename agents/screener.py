@@ -0,0 +1,92 @@
+import warnings
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class UniverseScreener:
+    """
+    Cross-sectional scan scoring for a whole universe in one vectorized pass.
+    Frames are aligned into date x symbol panels; every symbol is scored with
+    the same rules the squads used per symbol:
+    1. Volume Spike (Today vs previous 20-day Avg) x2
+    2. Trend (Price > MA50) +5
+    3. RSI14 in the 30-70 sweet spot +2
+    """
+    min_bars = 50
+
+    @staticmethod
+    def build_panel(frames: Dict[str, pd.DataFrame], columns=("close", "volume")) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+        """
+        Aligns the universe on the union of all bar dates.
+        Returns (dates, {column: 2-D array}) with dates as rows and symbols as columns,
+        NaN where a symbol has no bar for that date.
+        """
+        stamps = [pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8 for df in frames.values()]
+        dates = np.unique(np.concatenate(stamps)) if stamps else np.array([], dtype="int64")
+
+        panel = {col: np.full((len(dates), len(frames)), np.nan) for col in columns}
+        for j, (df, ts) in enumerate(zip(frames.values(), stamps)):
+            rows = np.searchsorted(dates, ts)
+            for col in columns:
+                panel[col][rows, j] = np.asarray(df[col], dtype=float)
+        return pd.to_datetime(dates, unit="ns", utc=True), panel
+
+    @staticmethod
+    def right_align(values: np.ndarray) -> np.ndarray:
+        """
+        Pushes each column's valid bars to the bottom of the array, so row -1 is every
+        symbol's own latest bar and windows like [-20:] span each symbol's last 20 bars,
+        even when sessions differ (holidays, late listings).
+        """
+        order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+        return np.take_along_axis(values, order, axis=0)
+
+    def score(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Returns one row per symbol with vol_spike, trend, rsi and score."""
+        symbols = list(frames)
+        if not symbols:
+            return pd.DataFrame(columns=["vol_spike", "trend", "rsi", "score"])
+
+        _, panel = self.build_panel(frames)
+        return self.score_aligned(symbols, self.right_align(panel["close"]), self.right_align(panel["volume"]))
+
+    def score_aligned(self, symbols: List[str], close: np.ndarray, volume: np.ndarray) -> pd.DataFrame:
+        """score() on right-aligned (bar x symbol) close and volume arrays."""
+        bars = (~np.isnan(close)).sum(axis=0)
+
+        # Symbols with too little history produce NaNs here; they are filtered out below
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            # 1. Volume Spike
+            avg_vol = np.nanmean(volume[-21:-1], axis=0)
+            vol_spike = np.where(avg_vol > 0, volume[-1] / avg_vol, 0.0)
+
+            # 2. Trend
+            ma50 = close[-50:].mean(axis=0)
+            trend = (close[-1] > ma50).astype(float)
+
+            # 3. RSI (simple 14-period means of gains/losses)
+            delta = np.diff(close[-15:], axis=0)
+            gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+            loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        score = (vol_spike * 2) + (trend * 5) + np.where((rsi > 30) & (rsi < 70), 2, 0)
+
+        table = pd.DataFrame({"vol_spike": vol_spike, "trend": trend, "rsi": rsi, "score": score}, index=symbols)
+        return table[bars >= self.min_bars]
+
+    def rank(self, frames: Dict[str, pd.DataFrame], limit: Optional[int] = None) -> List[dict]:
+        """Scores the universe and returns [{"symbol", "score"}, ...] best first (ties keep universe order)."""
+        return self.rank_table(self.score(frames), limit)
+
+    @staticmethod
+    def rank_table(table: pd.DataFrame, limit: Optional[int] = None) -> List[dict]:
+        """Ranks an already scored table (e.g. chunks scored in parallel, concatenated in universe order)."""
+        order = np.argsort(-table["score"].to_numpy(), kind="stable")
+        ranked = table.iloc[order]
+        if limit is not None:
+            ranked = ranked.head(limit)
+        return [{"symbol": symbol, "score": float(row.score)} for symbol, row in ranked.iterrows()]
@@ -1,128 +1,20 @@
+import math
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
+from agents.indicators import IndicatorEngine, as_price, pct_label
+from agents.streaming import get_state_store
+from agents.telemetry import span
 
 class StockTechnicalAnalyst:
     """
     Handles Technical Analysis for US Stocks.
-    Similar to Crypto Analyst but adapted for equity metrics.
+    Indicators come from the shared IndicatorEngine; this class only applies
+    the equity thresholds and labels.
     """
-    
-    def calculate_ma(self, series: pd.Series) -> Dict[str, Any]:
-        """Moving Averages & Cross Detection"""
-        ma20 = series.rolling(window=20).mean()
-        ma50 = series.rolling(window=50).mean()
-        ma200 = series.rolling(window=200).mean()
-        
-        curr_ma20 = ma20.iloc[-1]
-        curr_ma50 = ma50.iloc[-1]
-        curr_ma200 = ma200.iloc[-1]
-        
-        # Cross Detection
-        signal = "Neutral"
-        if curr_ma50 > curr_ma200 and ma50.iloc[-2] <= ma200.iloc[-2]:
-            signal = "GOLDEN CROSS (Bullish)"
-        elif curr_ma50 < curr_ma200 and ma50.iloc[-2] >= ma200.iloc[-2]:
-            signal = "DEATH CROSS (Bearish)"
-            
-        trend = "Bullish" if series.iloc[-1] > curr_ma50 else "Bearish"
-
-        return {
-            "ma20": float(curr_ma20),
-            "ma50": float(curr_ma50),
-            "ma200": float(curr_ma200) if not pd.isna(curr_ma200) else 0,
-            "trend": trend,
-            "signal": signal
-        }
-
-    def calculate_macd(self, series: pd.Series) -> Dict[str, Any]:
-        """MACD (12, 26, 9)"""
-        exp1 = series.ewm(span=12, adjust=False).mean()
-        exp2 = series.ewm(span=26, adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=9, adjust=False).mean()
-        histogram = macd - signal_line
-        
-        curr_hist = histogram.iloc[-1]
-        prev_hist = histogram.iloc[-2]
-        
-        signal = "Neutral"
-        if curr_hist > 0 and prev_hist <= 0:
-            signal = "Bullish Crossover"
-        elif curr_hist < 0 and prev_hist >= 0:
-            signal = "Bearish Crossover"
-            
-        return {
-            "macd": float(macd.iloc[-1]),
-            "signal_line": float(signal_line.iloc[-1]),
-            "histogram": float(curr_hist),
-            "signal": signal
-        }
 
-    def calculate_bollinger(self, series: pd.Series, window=20) -> Dict[str, Any]:
-        """Bollinger Bands & Squeeze"""
-        sma = series.rolling(window=window).mean()
-        std = series.rolling(window=window).std()
-        upper = sma + (std * 2)
-        lower = sma - (std * 2)
-        
-        curr_price = series.iloc[-1]
-        bandwidth = (upper.iloc[-1] - lower.iloc[-1]) / sma.iloc[-1] * 100
-        
-        position = "Neutral"
-        if curr_price >= upper.iloc[-1]: position = "Upper Band (Overbought)"
-        elif curr_price <= lower.iloc[-1]: position = "Lower Band (Oversold)"
-            
-        return {
-            "upper": float(upper.iloc[-1]),
-            "middle": float(sma.iloc[-1]),
-            "lower": float(lower.iloc[-1]),
-            "bandwidth": float(bandwidth),
-            "position": position
-        }
-
-    def find_support_resistance(self, series: pd.Series) -> Dict[str, float]:
-        """Local Min/Max for Support/Resistance"""
-        recent = series.tail(30)
-        resistance = recent.max()
-        support = recent.min()
-        return {"resistance": float(resistance), "support": float(support)}
-
-    def calculate_rsi(self, series: pd.Series, period: int = 14) -> Dict[str, Any]:
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current = rsi.iloc[-1]
-        
-        signal = "Neutral"
-        if current > 70: signal = "Overbought (>70)"
-        elif current < 30: signal = "Oversold (<30)"
-            
-        return {"current": float(current), "signal": signal}
-
-    def calculate_drawdown(self, series: pd.Series) -> Dict[str, float]:
-        """Max Drawdown from Peak"""
-        running_max = series.cummax()
-        drawdown = ((series - running_max) / running_max) * 100
-        return {"max_drawdown": float(drawdown.min()), "current_drawdown": float(drawdown.iloc[-1])}
-
-    def calculate_roi(self, series: pd.Series) -> Dict[str, str]:
-        """Cumulative Returns"""
-        curr = series.iloc[-1]
-        
-        def pct_change(n):
-            if len(series) < n: return "N/A"
-            prev = series.iloc[-n]
-            return f"{((curr - prev) / prev) * 100:+.2f}%"
-
-        return {
-            "7d": pct_change(7),
-            "30d": pct_change(30),
-            "ytd": pct_change(len(series)) 
-        }
+    def __init__(self):
+        self.engine = IndicatorEngine(state_store=get_state_store())
 
     def analyze_ticker(self, ticker: str, ohlcv_df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -132,66 +24,75 @@ class StockTechnicalAnalyst:
         if ohlcv_df.empty:
             return {"error": "No data"}
 
-        close = ohlcv_df['close']
-        volume = ohlcv_df['volume']
-        
-        # Calculate Indicators
-        rsi = self.calculate_rsi(close)
-        ma = self.calculate_ma(close)
-        macd = self.calculate_macd(close)
-        bb = self.calculate_bollinger(close)
-        sr = self.find_support_resistance(close)
-        dd = self.calculate_drawdown(close)
-        roi = self.calculate_roi(close)
-        
+        with span("analyze", symbol=ticker, rows=len(ohlcv_df)):
+            return self.summarize(ticker, self.engine.compute(ohlcv_df, symbol=ticker))
+
+    def summarize(self, ticker: str, ind: Dict[str, float]) -> Dict[str, Any]:
+        """Turns raw indicator values into the flat, labelled summary."""
+        price = ind['price']
+
+        # Cross Detection
+        ma_cross = "Neutral"
+        if ind['ma50'] > ind['ma200'] and ind['ma50_prev'] <= ind['ma200_prev']:
+            ma_cross = "GOLDEN CROSS (Bullish)"
+        elif ind['ma50'] < ind['ma200'] and ind['ma50_prev'] >= ind['ma200_prev']:
+            ma_cross = "DEATH CROSS (Bearish)"
+
+        trend = "Bullish" if price > ind['ma50'] else "Bearish"
+        ma200 = 0 if math.isnan(ind['ma200']) else ind['ma200']
+
+        rsi_signal = "Neutral"
+        if ind['rsi'] > 70: rsi_signal = "Overbought (>70)"
+        elif ind['rsi'] < 30: rsi_signal = "Oversold (<30)"
+
+        macd_signal = "Neutral"
+        if ind['macd_hist'] > 0 and ind['macd_hist_prev'] <= 0:
+            macd_signal = "Bullish Crossover"
+        elif ind['macd_hist'] < 0 and ind['macd_hist_prev'] >= 0:
+            macd_signal = "Bearish Crossover"
+
         # Volume Spike
-        avg_vol = volume.rolling(window=20).mean().iloc[-1]
-        curr_vol = volume.iloc[-1]
-        vol_spike = f"{float(curr_vol/avg_vol):.1f}x" if avg_vol > 0 else "N/A"
-        
-        # Volatility
-        log_ret = np.log(close / close.shift(1))
-        volatility = log_ret.std() * np.sqrt(252) * 100  # Annualized for stocks (252 trading days)
-
-        # Get 52-week high/low
-        high_52w = close.tail(252).max() if len(close) >= 252 else close.max()
-        low_52w = close.tail(252).min() if len(close) >= 252 else close.min()
+        avg_vol = ind['vol_avg20']
+        vol_spike = f"{ind['volume'] / avg_vol:.1f}x" if avg_vol > 0 else "N/A"
+
+        # Volatility (Annualized for stocks, 252 trading days)
+        volatility = ind['log_ret_std'] * np.sqrt(252) * 100
 
         # Flattened Summary
         summary = {
             "symbol": ticker,
             "ticker": ticker,
-            "price": float(close.iloc[-1]),
-            
+            "price": as_price(price),
+
             # Trend
-            "trend_status": ma['trend'],
-            "ma_cross": ma['signal'],
-            "ma20": f"{ma['ma20']:.2f}",
-            "ma50": f"{ma['ma50']:.2f}",
-            "ma200": f"{ma['ma200']:.2f}",
-            
+            "trend_status": trend,
+            "ma_cross": ma_cross,
+            "ma20": f"{ind['ma20']:.2f}",
+            "ma50": f"{ind['ma50']:.2f}",
+            "ma200": f"{ma200:.2f}",
+
             # Momentum
-            "rsi": f"{rsi['current']:.1f}",
-            "rsi_signal": rsi['signal'],
-            "macd_signal": macd['signal'],
-            
+            "rsi": f"{ind['rsi']:.1f}",
+            "rsi_signal": rsi_signal,
+            "macd_signal": macd_signal,
+
             # Volatility
-            "bb_width": f"{bb['bandwidth']:.2f}%" if bb['bandwidth'] < 5 else "Normal",
+            "bb_width": f"{ind['bb_bandwidth']:.2f}%" if ind['bb_bandwidth'] < 5 else "Normal",
             "volume_spike": vol_spike,
-            
-            # Levels
-            "support": sr['support'],
-            "resistance": sr['resistance'],
-            "high_52w": float(high_52w),
-            "low_52w": float(low_52w),
-            
+
+            # Levels (30-day local min/max)
+            "support": as_price(ind['close_min_30']),
+            "resistance": as_price(ind['close_max_30']),
+            "high_52w": as_price(ind['close_max_252']),
+            "low_52w": as_price(ind['close_min_252']),
+
             # Risk
-            "max_drawdown": f"{dd['max_drawdown']:.2f}%",
+            "max_drawdown": f"{ind['max_drawdown']:.2f}%",
             "volatility_annual": f"{volatility:.1f}%",
-            
+
             # Performance
-            "perf_7d": roi['7d'],
-            "perf_30d": roi['30d']
+            "perf_7d": pct_label(ind['roi_7d']),
+            "perf_30d": pct_label(ind['roi_30d'])
         }
-        
+
         return summary
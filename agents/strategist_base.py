@@ -0,0 +1,234 @@
+import os
+import json
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from agents.llm import get_llm_gateway
+from agents.strategy_cache import get_strategy_cache
+from agents.telemetry import Span, span
+
+
+class BaseStrategist:
+    """
+    Shared plumbing for the squad strategists: OpenRouter calls through the shared
+    LLMGateway (agents/llm.py), JSON parsing, error fallback and the concurrent
+    fan-out used by the managers.
+    Subclasses provide `system_prompt`, `build_user_prompt()` and `prompt_fields`
+    (summary field -> bucket step, see agents/strategy_cache.py) for the response cache.
+    """
+    system_prompt = ""
+    prompt_fields: Dict[str, Any] = {}
+
+    def __init__(self):
+        load_dotenv()
+
+        self.llm = get_llm_gateway()  # One pool and one RPM/TPM budget for every strategist
+        self.model = "deepseek/deepseek-r1:online"
+
+        # Fan-out tuning: R1 :online calls take 30-90s each, so a squad runs them side by side
+        self.concurrency = int(os.getenv("STRATEGIST_CONCURRENCY", "3"))
+        self.timeout = float(os.getenv("STRATEGIST_TIMEOUT", "180"))
+        # Batched mode: up to `batch_size` symbols share one request and one copy of the system prompt (1 = off)
+        self.batch_size = int(os.getenv("STRATEGIST_BATCH_SIZE", "1"))
+        self.batch_timeout = float(os.getenv("STRATEGIST_BATCH_TIMEOUT", "300"))
+        self.batch_retries = int(os.getenv("STRATEGIST_BATCH_RETRIES", "1"))
+
+        # Response cache: a repeat run on a barely moved market reuses today's answer
+        self.cache = get_strategy_cache()
+        # Model + prompt version: editing either invalidates earlier entries
+        prompt_hash = hashlib.sha256(self.system_prompt.encode()).hexdigest()[:12]
+        self.cache_namespace = f"{type(self).__name__}:{self.model}:{prompt_hash}"
+
+    def build_user_prompt(self, symbol: str, technical_summary: dict) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def symbol_of(technical_summary: dict) -> str:
+        return technical_summary.get('symbol', technical_summary.get('ticker', 'UNKNOWN'))
+
+    @staticmethod
+    def fallback_strategy(symbol: str) -> dict:
+        return {
+            "headline": f"{symbol} Analysis Error",
+            "analysis_summary": "Gagal mengambil analisa mental.",
+            "news": [],
+            "action_plan": {"signal": "WAIT"}
+        }
+
+    @staticmethod
+    def parse_json(content: str) -> dict:
+        # Clean possible markdown wrapping
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+
+        return json.loads(content.strip())
+
+    @staticmethod
+    def is_valid_strategy(strategy: Any) -> bool:
+        """What the alert needs from an answer: a headline and an action plan with a signal."""
+        return (isinstance(strategy, dict) and isinstance(strategy.get("headline"), str)
+                and isinstance(strategy.get("action_plan"), dict) and "signal" in strategy["action_plan"])
+
+    def build_batch_prompt(self, summaries: Dict[str, dict]) -> str:
+        sections = "\n".join(f"=== {symbol} ===\n{self.build_user_prompt(symbol, summary)}"
+                             for symbol, summary in summaries.items())
+        return (f"Analyze {len(summaries)} assets. Answer with ONE JSON object keyed by ticker, with exactly "
+                f"these keys: {json.dumps(list(summaries))}. Each value follows the OUTPUT FORMAT above.\n\n{sections}")
+
+    async def _lookup(self, symbol: str, technical_summary: dict) -> Tuple[Optional[str], Optional[dict]]:
+        """(cache key, cached strategy or None); (None, None) when caching is off."""
+        if self.cache is None or not self.prompt_fields:
+            return None, None
+        key = self.cache.fingerprint(self.cache_namespace, symbol, technical_summary, self.prompt_fields)
+        # SQLite runs on an executor thread so cache I/O never stalls the other squads on the loop
+        return key, await asyncio.get_running_loop().run_in_executor(None, self.cache.get, key)
+
+    async def _remember(self, key: str, symbol: str, strategy: dict):
+        await asyncio.get_running_loop().run_in_executor(None, self.cache.put, key, symbol, strategy)
+
+    async def _complete(self, user_prompt: str, symbol: str, s: Span) -> Any:
+        """One JSON-mode completion under the squad's system prompt; size and token usage go on `s`."""
+        response = await self.llm.chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            symbol=symbol,
+            response_format={"type": "json_object"}
+        )
+        content = response.choices[0].message.content
+        s.set(bytes=len(content.encode()) if content else 0)
+        if response.usage is not None:
+            s.set(prompt_tokens=response.usage.prompt_tokens, completion_tokens=response.usage.completion_tokens,
+                  total_tokens=response.usage.total_tokens)
+        return self.parse_json(content)
+
+    async def generate_strategy(self, technical_summary: dict) -> dict:
+        symbol = self.symbol_of(technical_summary)
+        with span("llm", symbol=symbol, strategist=type(self).__name__, model=self.model) as s:
+            return await self._generate_strategy(symbol, technical_summary, s)
+
+    async def _generate_strategy(self, symbol: str, technical_summary: dict, s: Span) -> dict:
+        cache_key, cached = await self._lookup(symbol, technical_summary)
+        if cache_key is not None:
+            s.set(cache="hit" if cached is not None else "miss")
+        if cached is not None:
+            print(f"♻️ [Strategist] Reusing cached strategy for {symbol}")
+            return cached
+
+        print(f"🧠 [Strategist] Thinking about {symbol} (Searching Web)...")
+
+        try:
+            strategy = await self._complete(self.build_user_prompt(symbol, technical_summary), symbol, s)
+
+        except Exception as e:
+            print(f"❌ Strategy Error ({symbol}): {e}")
+            s.fail(str(e) or type(e).__name__)
+            return self.fallback_strategy(symbol)
+
+        # Only real answers are cached; error fallbacks and timeouts retry next run
+        if cache_key is not None:
+            await self._remember(cache_key, symbol, strategy)
+        return strategy
+
+    async def generate_batch(self, summaries: Dict[str, dict]) -> Dict[str, dict]:
+        """
+        One request for several symbols (symbol -> technical summary). Returns the
+        valid strategies by symbol; symbols missing or malformed in the answer are left out.
+        """
+        symbols = list(summaries)
+        with span("llm", symbol=",".join(symbols), symbols=len(symbols), strategist=type(self).__name__, model=self.model) as s:
+            if self.cache is not None and self.prompt_fields:
+                s.set(cache="miss")
+            print(f"🧠 [Strategist] Thinking about {', '.join(symbols)} in one request (Searching Web)...")
+            try:
+                # Queued as its most urgent symbol, so a batch holding BTC-USD keeps the core-asset priority
+                answer = await self._complete(self.build_batch_prompt(summaries), min(symbols, key=self.llm.priority_of), s)
+            except Exception as e:
+                print(f"❌ Strategy Error ({', '.join(symbols)}): {e}")
+                s.fail(str(e) or type(e).__name__)
+                return {}
+
+            answer = answer if isinstance(answer, dict) else {}
+            strategies = {symbol: answer[symbol] for symbol in symbols if self.is_valid_strategy(answer.get(symbol))}
+            if len(strategies) < len(symbols):
+                s.set(missing=len(symbols) - len(strategies))
+            return strategies
+
+    async def _generate_batched(self, summaries: List[dict], gate: asyncio.Semaphore) -> List[dict]:
+        """
+        Batched mode: cache hits are answered directly and the rest go out `batch_size`
+        symbols per request. Symbols missing from an answer (or timed out) are retried
+        on their own batches up to `batch_retries` times, then fall back to WAIT.
+        """
+        results: Dict[str, dict] = {}
+        pending: Dict[str, dict] = {}
+        keys: Dict[str, Optional[str]] = {}
+        lookups = await asyncio.gather(*(self._lookup(self.symbol_of(summary), summary) for summary in summaries))
+        for summary, (key, cached) in zip(summaries, lookups):
+            symbol = self.symbol_of(summary)
+            keys[symbol] = key
+            if cached is not None:
+                with span("llm", symbol=symbol, strategist=type(self).__name__, model=self.model, cache="hit"):
+                    print(f"♻️ [Strategist] Reusing cached strategy for {symbol}")
+                results[symbol] = cached
+            else:
+                pending[symbol] = summary
+
+        async def run(batch: Dict[str, dict]) -> Dict[str, dict]:
+            async with gate:
+                try:
+                    return await asyncio.wait_for(self.generate_batch(batch), timeout=self.batch_timeout)
+                except asyncio.TimeoutError:
+                    print(f"⏱️ [Strategist] {', '.join(batch)} timed out after {self.batch_timeout:.0f}s")
+                    return {}
+
+        for attempt in range(1 + self.batch_retries):
+            if not pending:
+                break
+            if attempt:
+                print(f"🔁 [Strategist] Retrying {', '.join(pending)} (missing from the batched answers)")
+            items = list(pending.items())
+            batches = [dict(items[i:i + self.batch_size]) for i in range(0, len(items), self.batch_size)]
+            for answer in await asyncio.gather(*(run(batch) for batch in batches)):
+                for symbol, strategy in answer.items():
+                    results[symbol] = strategy
+                    del pending[symbol]
+                    # Only real answers are cached; fallbacks retry next run
+                    if keys[symbol] is not None:
+                        await self._remember(keys[symbol], symbol, strategy)
+
+        for symbol in pending:
+            print(f"⚠️ [Strategist] No strategy for {symbol} after {1 + self.batch_retries} attempt(s), falling back to WAIT")
+            results[symbol] = self.fallback_strategy(symbol)
+        return [results[self.symbol_of(summary)] for summary in summaries]
+
+    async def generate_strategies(self, summaries: List[dict]) -> List[dict]:
+        """
+        Runs generate_strategy for a whole squad concurrently (at most `concurrency`
+        calls in flight, each capped at `timeout` seconds), or, with STRATEGIST_BATCH_SIZE
+        above 1, several symbols per call (see _generate_batched).
+        Results come back in the same order as `summaries`, i.e. ranking order.
+        """
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def run(summary: dict) -> dict:
+            async with gate:
+                try:
+                    return await asyncio.wait_for(self.generate_strategy(summary), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    symbol = self.symbol_of(summary)
+                    print(f"⏱️ [Strategist] {symbol} timed out after {self.timeout:.0f}s")
+                    return self.fallback_strategy(symbol)
+
+        if self.batch_size > 1 and len(summaries) > 1:
+            strategies = await self._generate_batched(summaries, gate)
+        else:
+            strategies = list(await asyncio.gather(*(run(s) for s in summaries)))
+        if self.cache is not None:
+            print(f"♻️ [StrategyCache] {await asyncio.get_running_loop().run_in_executor(None, self.cache.stats)}")
+        return strategies
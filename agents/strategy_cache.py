@@ -0,0 +1,123 @@
+import os
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def bucket(value: Any, step: Any) -> Any:
+    """
+    Coarsens one prompt field so small moves map to the same fingerprint.
+    step None keeps the value as is, a number buckets absolutely (RSI 5 -> 40, 45, ...)
+    and a "N%" string buckets relatively (prices of any magnitude move in N% steps).
+    Labels that aren't numbers ("Bullish", "N/A") are always kept verbatim.
+    """
+    if step is None or value is None:
+        return value
+    try:
+        x = float(str(value).replace(",", "").strip().lstrip("$").rstrip("x%"))
+    except ValueError:
+        return value
+    if math.isnan(x):
+        return "nan"
+    if isinstance(step, str) and step.endswith("%"):
+        if x <= 0:
+            return value
+        return round(math.log(x) / math.log1p(float(step[:-1]) / 100))
+    return round(x / step)
+
+
+class StrategyCache:
+    """
+    SQLite-backed cache of strategist responses keyed by a fingerprint of the
+    prompt-relevant technical fields (bucketed) plus the date, so re-runs on an
+    unchanged market reuse the answer instead of another R1 :online call.
+    Entries expire after `ttl` seconds; beyond `max_entries` the least recently
+    used ones are evicted. Survives restarts.
+    Blocking (SQLite); async callers run it on an executor. Hits only note their
+    time in memory, written out with the next put(), so a lookup never commits.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path or os.getenv("STRATEGY_CACHE_PATH", ".cache/strategies.sqlite")
+        self.ttl = ttl if ttl is not None else float(os.getenv("STRATEGY_CACHE_TTL_MINUTES", "360")) * 60
+        self.max_entries = max_entries or int(os.getenv("STRATEGY_CACHE_MAX_ENTRIES", "500"))
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}  # key -> last hit not written yet
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS strategies ("
+            "key TEXT PRIMARY KEY, symbol TEXT, value TEXT, created_at REAL, last_used REAL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def fingerprint(namespace: str, symbol: str, summary: dict, fields: Dict[str, Any],
+                    day: Optional[str] = None) -> str:
+        """Key for `symbol`: its bucketed prompt fields, today's date and the caller's namespace (model + prompt)."""
+        payload = {
+            "ns": namespace,
+            "symbol": symbol,
+            "day": day or datetime.now().strftime("%Y-%m-%d"),
+            "fields": {name: bucket(summary.get(name), step) for name, step in sorted(fields.items())},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created_at FROM strategies WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                # Expired rows are deleted by the next put()
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, symbol: str, strategy: dict):
+        now = time.time()
+        with self._lock:
+            if self._touched:
+                self._db.executemany("UPDATE strategies SET last_used = ? WHERE key = ?",
+                                     [(ts, k) for k, ts in self._touched.items()])
+                self._touched.clear()
+            self._db.execute(
+                "INSERT OR REPLACE INTO strategies (key, symbol, value, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, symbol, json.dumps(strategy), now, now)
+            )
+            # Drop expired entries, then trim to the LRU budget
+            self._db.execute("DELETE FROM strategies WHERE created_at < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM strategies WHERE key NOT IN "
+                "(SELECT key FROM strategies ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM strategies").fetchone()[0]
+
+    def stats(self) -> str:
+        return f"{self.hits} hit(s), {self.misses} miss(es), {len(self)} cached"
+
+
+_default_cache: Optional[StrategyCache] = None
+
+
+def get_strategy_cache() -> Optional[StrategyCache]:
+    """Process-wide cache shared by the three strategists. Set STRATEGY_CACHE_PATH to an empty string to disable it."""
+    global _default_cache
+    if _default_cache is None and os.getenv("STRATEGY_CACHE_PATH", ".cache/strategies.sqlite"):
+        _default_cache = StrategyCache()
+    return _default_cache
@@ -0,0 +1,475 @@
+import os
+import re
+import json
+import math
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from agents.bar_store import ADJUSTMENT_TOLERANCE
+
+NAN = float("nan")
+
+
+def _log_return(prev: float, close: float) -> float:
+    # Non-positive prices (e.g. WTI in April 2020) have no log return; count them as flat
+    return math.log(close / prev) if close > 0 and prev > 0 else 0.0
+
+
+class EMA:
+    """Exponential moving average, identical to pandas ewm(span, adjust=False) when seeded from the same start."""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = NAN
+        self._before = NAN  # Value prior to the last update, so the last bar can be revised
+
+    def update(self, x: float) -> float:
+        self._before = self.value
+        self.value = x if math.isnan(self._before) else self._before + self.alpha * (x - self._before)
+        return self.value
+
+    def revise(self, x: float) -> float:
+        """Replaces the last input (e.g. an in-progress daily bar that moved)."""
+        self.value = self._before
+        return self.update(x)
+
+    def to_state(self) -> dict:
+        return {"value": self.value, "before": self._before}
+
+    def load_state(self, state: dict):
+        self.value, self._before = state["value"], state["before"]
+
+
+class RollingStats:
+    """
+    Last `capacity` values plus O(1) running sums over several trailing windows.
+    Serves MA (sum), Bollinger std (sum of squares) and the previous-bar MA used
+    for cross detection from one shared buffer.
+    """
+
+    def __init__(self, windows: Iterable[int], squares: Iterable[int] = (), capacity: Optional[int] = None):
+        self.windows = tuple(windows)
+        self.squares = tuple(squares)
+        self.values = deque(maxlen=capacity or max(self.windows) + 1)
+        self.sums = {w: 0.0 for w in self.windows}
+        self.sq_sums = {w: 0.0 for w in self.squares}
+        self._updates = 0
+
+    def update(self, x: float):
+        v = self.values
+        n = len(v)
+        for w in self.windows:
+            if n >= w:
+                self.sums[w] -= v[-w]  # Value leaving the window
+            self.sums[w] += x
+        for w in self.squares:
+            if n >= w:
+                self.sq_sums[w] -= v[-w] ** 2
+            self.sq_sums[w] += x * x
+        v.append(x)
+
+        # Periodically re-add from scratch so floating point drift can't accumulate
+        self._updates += 1
+        if self._updates % v.maxlen == 0:
+            self._resum()
+
+    def revise(self, x: float):
+        old = self.values[-1]
+        self.values[-1] = x
+        for w in self.windows:
+            self.sums[w] += x - old
+        for w in self.squares:
+            self.sq_sums[w] += x * x - old * old
+
+    def _resum(self):
+        for w in self.windows:
+            self.sums[w] = math.fsum(self.tail(w))
+        for w in self.squares:
+            self.sq_sums[w] = math.fsum(x * x for x in self.tail(w))
+
+    def tail(self, n: int, offset: int = 0):
+        """The last `n` values ending `offset` bars before the newest one."""
+        end = len(self.values) - offset
+        return islice(self.values, max(end - n, 0), max(end, 0))
+
+    def mean(self, w: int, offset: int = 0) -> float:
+        """Mean of the last `w` values (offset=1: the window ending one bar earlier)."""
+        n = len(self.values)
+        if n < w + offset:
+            return NAN
+        if offset == 0:
+            return self.sums[w] / w
+        if offset == 1 and self.values.maxlen > w:
+            return (self.sums[w] - self.values[-1] + self.values[-w - 1]) / w
+        return math.fsum(self.tail(w, offset)) / w
+
+    def std(self, w: int, partial: bool = False) -> float:
+        """Sample standard deviation (ddof=1) over the last `w` values (or all of them, if `partial`)."""
+        k = min(w, len(self.values)) if partial else w
+        if k < 2 or len(self.values) < k:
+            return NAN
+        var = (self.sq_sums[w] - self.sums[w] ** 2 / k) / (k - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def ago(self, bars: int) -> float:
+        """Value `bars` positions from the end (1 = newest), matching series.iloc[-bars]."""
+        return self.values[-bars] if len(self.values) >= bars else NAN
+
+    def extreme(self, w: int, fn=max) -> float:
+        return fn(self.tail(w)) if self.values else NAN
+
+    def to_state(self) -> dict:
+        return {"values": list(self.values), "updates": self._updates}
+
+    def load_state(self, state: dict):
+        self.values.clear()
+        self.values.extend(state["values"])
+        self._updates = state["updates"]
+        self._resum()
+
+
+class SimpleRSI:
+    """RSI from simple rolling means of gains and losses (the variant the analysts report)."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.gains = RollingStats([period])
+        self.losses = RollingStats([period])
+        self.last_close = NAN
+        self._before = NAN
+
+    def update(self, close: float):
+        self._before = self.last_close
+        if not math.isnan(self._before):
+            delta = close - self._before
+            self.gains.update(max(delta, 0.0))
+            self.losses.update(max(-delta, 0.0))
+        self.last_close = close
+
+    def revise(self, close: float):
+        if not math.isnan(self._before):
+            delta = close - self._before
+            self.gains.revise(max(delta, 0.0))
+            self.losses.revise(max(-delta, 0.0))
+        self.last_close = close
+
+    @property
+    def value(self) -> float:
+        gain, loss = self.gains.mean(self.period), self.losses.mean(self.period)
+        if math.isnan(gain) or math.isnan(loss) or gain == loss == 0:
+            return NAN
+        return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+    def to_state(self) -> dict:
+        return {"gains": self.gains.to_state(), "losses": self.losses.to_state(),
+                "last_close": self.last_close, "before": self._before}
+
+    def load_state(self, state: dict):
+        self.gains.load_state(state["gains"])
+        self.losses.load_state(state["losses"])
+        self.last_close, self._before = state["last_close"], state["before"]
+
+
+class WilderRSI:
+    """RSI with Wilder smoothing (seeded with a simple mean of the first `period` changes)."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self.last_close = NAN
+        self._seed = []
+        self._undo = None
+
+    def update(self, close: float):
+        self._undo = (self.avg_gain, self.avg_loss, self.last_close, list(self._seed))
+        if not math.isnan(self.last_close):
+            delta = close - self.last_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if math.isnan(self.avg_gain):
+                self._seed.append((gain, loss))
+                if len(self._seed) == self.period:
+                    self.avg_gain = sum(g for g, _ in self._seed) / self.period
+                    self.avg_loss = sum(l for _, l in self._seed) / self.period
+                    self._seed = []
+            else:
+                self.avg_gain += (gain - self.avg_gain) / self.period
+                self.avg_loss += (loss - self.avg_loss) / self.period
+        self.last_close = close
+
+    def revise(self, close: float):
+        self.avg_gain, self.avg_loss, self.last_close, self._seed = self._undo
+        self.update(close)
+
+    @property
+    def value(self) -> float:
+        if math.isnan(self.avg_gain) or self.avg_gain == self.avg_loss == 0:
+            return NAN
+        return 100.0 if self.avg_loss == 0 else 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+    def to_state(self) -> dict:
+        return {"avg_gain": self.avg_gain, "avg_loss": self.avg_loss, "last_close": self.last_close,
+                "seed": self._seed, "undo": self._undo}
+
+    def load_state(self, state: dict):
+        self.avg_gain, self.avg_loss = state["avg_gain"], state["avg_loss"]
+        self.last_close, self._seed = state["last_close"], [tuple(x) for x in state["seed"]]
+        undo = state["undo"]
+        self._undo = (undo[0], undo[1], undo[2], [tuple(x) for x in undo[3]]) if undo else None
+
+
+class DrawdownTracker:
+    """Running peak and worst drawdown (in %) since the state was seeded."""
+
+    def __init__(self):
+        self.peak = NAN
+        self.max_drawdown = 0.0
+        self.current = NAN
+        self._undo = None
+
+    def update(self, x: float):
+        self._undo = (self.peak, self.max_drawdown)
+        self.peak = x if math.isnan(self.peak) else max(self.peak, x)
+        self.current = (x - self.peak) / self.peak * 100
+        self.max_drawdown = min(self.max_drawdown, self.current)
+
+    def revise(self, x: float):
+        self.peak, self.max_drawdown = self._undo
+        self.update(x)
+
+    def to_state(self) -> dict:
+        return {"peak": self.peak, "max_drawdown": self.max_drawdown, "current": self.current, "undo": self._undo}
+
+    def load_state(self, state: dict):
+        self.peak, self.max_drawdown, self.current = state["peak"], state["max_drawdown"], state["current"]
+        self._undo = tuple(state["undo"]) if state["undo"] else None
+
+
+class IndicatorState:
+    """
+    Per-symbol streaming indicators, seeded once from history and then advanced
+    in O(1) per bar. snapshot() returns the same keys as IndicatorEngine.compute(),
+    so the analysts' summarize() works on either.
+    `history` is the bar count of the squad's frame (252 for a year of stock
+    sessions, 365 for crypto), taken from the frame the state is seeded from:
+    the volatility window covers the same returns compute() sees. Extremes use a
+    252-bar year like compute(); drawdown is tracked since seeding.
+    """
+    VERSION = 2
+
+    def __init__(self, history: int = 252):
+        self.history = max(int(history), 3)
+        self.close = RollingStats(windows=(20, 50, 200), squares=(20,), capacity=253)
+        self.high = RollingStats(windows=(20,), capacity=252)
+        self.low = RollingStats(windows=(20,), capacity=252)
+        self.volume = RollingStats(windows=(20,), capacity=21)
+        self.log_ret = RollingStats(windows=(self.history - 1,), squares=(self.history - 1,))
+        self.rsi = SimpleRSI(14)
+        self.ema12, self.ema26, self.signal = EMA(12), EMA(26), EMA(9)
+        self.hist_prev = NAN
+        self.drawdown = DrawdownTracker()
+        self.last_ts: Optional[int] = None
+        self.bars = 0
+
+    def update(self, ts: int, high: float, low: float, close: float, volume: float):
+        """Appends a new bar, or revises the last one when `ts` repeats (in-progress session)."""
+        if self.last_ts is not None and ts == self.last_ts:
+            self._revise(high, low, close, volume)
+            return
+
+        prev_close = self.close.ago(1)
+        self.close.update(close)
+        self.high.update(high)
+        self.low.update(low)
+        self.volume.update(volume)
+        if not math.isnan(prev_close):
+            self.log_ret.update(_log_return(prev_close, close))
+        self.rsi.update(close)
+
+        self.hist_prev = self._hist()  # Histogram as of the bar before this one
+        macd = self.ema12.update(close) - self.ema26.update(close)
+        self.signal.update(macd)
+
+        self.drawdown.update(close)
+        self.last_ts = ts
+        self.bars += 1
+
+    def _revise(self, high: float, low: float, close: float, volume: float):
+        prev_close = self.close.ago(2)
+        self.close.revise(close)
+        self.high.revise(high)
+        self.low.revise(low)
+        self.volume.revise(volume)
+        if not math.isnan(prev_close):
+            self.log_ret.revise(_log_return(prev_close, close))
+        self.rsi.revise(close)
+
+        macd = self.ema12.revise(close) - self.ema26.revise(close)
+        self.signal.revise(macd)
+        self.drawdown.revise(close)
+
+    def _hist(self) -> float:
+        if math.isnan(self.signal.value):
+            return NAN
+        return (self.ema12.value - self.ema26.value) - self.signal.value
+
+    def seed(self, df: pd.DataFrame, history: Optional[int] = None):
+        """Rebuilds the state from a full OHLCV frame, with windows sized to its length unless `history` is given."""
+        self.__init__(history if history is not None else len(df))
+        self.extend(df)
+
+    def extend(self, df: pd.DataFrame):
+        ts = pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8
+        cols = [np.asarray(df[c], dtype=float) for c in ("high", "low", "close", "volume")]
+        for i in range(len(ts)):
+            self.update(int(ts[i]), cols[0][i], cols[1][i], cols[2][i], cols[3][i])
+
+    def overlap(self, df: pd.DataFrame) -> Optional[int]:
+        """
+        Row of `df` holding the last seen bar when the frame continues this state,
+        None when it has to be reseeded: no overlap, or the final bars before it
+        came back with different closes (the provider re-adjusted the history
+        after a split or dividend, same check as the bar store's).
+        """
+        ts = pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8
+        if self.last_ts is None or len(ts) == 0 or self.last_ts not in set(ts[-64:].tolist()):
+            return None
+        start = int(np.searchsorted(ts, self.last_ts))
+
+        # Rows before `start` line up with the closes already held; the last bar may have been partial
+        k = min(start, len(self.close.values) - 1, 5)
+        if k > 0:
+            held = np.fromiter(self.close.tail(k, offset=1), dtype=float, count=k)
+            fresh = np.asarray(df["close"].iloc[start - k:start], dtype=float)
+            if not np.allclose(held, fresh, rtol=ADJUSTMENT_TOLERANCE, atol=0):
+                return None
+        return start
+
+    def sync(self, df: pd.DataFrame) -> bool:
+        """
+        Brings the state up to date with `df`: only bars from the last seen
+        timestamp onwards are applied. Reseeds when overlap() says the frame
+        doesn't continue the state. Returns True when the update was incremental.
+        """
+        start = self.overlap(df)
+        if start is None:
+            self.seed(df)
+            return False
+        self.extend(df.iloc[start:])
+        return True
+
+    def snapshot(self) -> Dict[str, float]:
+        c = self.close
+        price = c.ago(1)
+        ma20, std20 = c.mean(20), c.std(20)
+
+        def roi(bars: int) -> float:
+            prev = c.ago(bars)
+            return NAN if math.isnan(prev) else (price - prev) / prev * 100
+
+        return {
+            "bars": self.bars,
+            "price": price,
+            "ma20": ma20, "ma20_prev": c.mean(20, offset=1),
+            "ma50": c.mean(50), "ma50_prev": c.mean(50, offset=1),
+            "ma200": c.mean(200), "ma200_prev": c.mean(200, offset=1),
+            "bb_upper": ma20 + 2 * std20,
+            "bb_lower": ma20 - 2 * std20,
+            "bb_bandwidth": (4 * std20) / ma20 * 100 if ma20 else NAN,
+            "rsi": self.rsi.value,
+            "macd": self.ema12.value - self.ema26.value,
+            "macd_signal": self.signal.value,
+            "macd_hist": self._hist(),
+            "macd_hist_prev": self.hist_prev,
+            "max_drawdown": self.drawdown.max_drawdown,
+            "current_drawdown": self.drawdown.current,
+            "log_ret_std": self.log_ret.std(self.history - 1, partial=True),
+            "roi_7d": roi(7),
+            "roi_30d": roi(30),
+            "volume": self.volume.ago(1),
+            "vol_avg20": self.volume.mean(20),
+            "vol_avg20_prev": self.volume.mean(20, offset=1),
+            "close_max_30": c.extreme(30, max),
+            "close_min_30": c.extreme(30, min),
+            "high_max_20": self.high.extreme(20, max),
+            "low_min_20": self.low.extreme(20, min),
+            "close_max_252": c.extreme(252, max),
+            "close_min_252": c.extreme(252, min),
+            "high_max_252": self.high.extreme(252, max),
+            "low_min_252": self.low.extreme(252, min),
+        }
+
+    def to_state(self) -> dict:
+        return {
+            "version": self.VERSION, "history": self.history, "last_ts": self.last_ts, "bars": self.bars,
+            "hist_prev": self.hist_prev,
+            "close": self.close.to_state(), "high": self.high.to_state(), "low": self.low.to_state(),
+            "volume": self.volume.to_state(), "log_ret": self.log_ret.to_state(), "rsi": self.rsi.to_state(),
+            "ema12": self.ema12.to_state(), "ema26": self.ema26.to_state(), "signal": self.signal.to_state(),
+            "drawdown": self.drawdown.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "IndicatorState":
+        if state.get("version") != cls.VERSION:
+            return cls()  # Incompatible layout: start fresh, the next sync reseeds
+        obj = cls(state["history"])
+        obj.last_ts, obj.bars = state["last_ts"], state["bars"]
+        obj.hist_prev = state["hist_prev"]
+        for name in ("close", "high", "low", "volume", "log_ret", "rsi", "ema12", "ema26", "signal", "drawdown"):
+            getattr(obj, name).load_state(state[name])
+        return obj
+
+
+class IndicatorStateStore:
+    """
+    JSON file per symbol holding its IndicatorState between runs.
+    Loaded states stay cached in memory, so a long-lived process only pays the
+    file read once per symbol.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("INDICATOR_STATE_DIR", ".cache/indicators")
+        os.makedirs(self.root, exist_ok=True)
+        self._cache: Dict[str, IndicatorState] = {}
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9.-]", "_", symbol) + ".json")
+
+    def load(self, symbol: str) -> IndicatorState:
+        if symbol in self._cache:
+            return self._cache[symbol]
+        try:
+            with open(self.path(symbol)) as fh:
+                state = IndicatorState.from_state(json.load(fh))
+        except (OSError, ValueError, KeyError, TypeError):
+            state = IndicatorState()
+        self._cache[symbol] = state
+        return state
+
+    def save(self, symbol: str, state: IndicatorState):
+        self._cache[symbol] = state
+        path = self.path(symbol)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state.to_state(), fh)
+        os.replace(tmp, path)
+
+
+_default_store: Optional[IndicatorStateStore] = None
+
+
+def get_state_store() -> Optional[IndicatorStateStore]:
+    """
+    Process-wide state store, enabled by setting INDICATOR_STATE_DIR.
+    Without it the analysts recompute from the frame on every call.
+    """
+    global _default_store
+    if _default_store is None and os.getenv("INDICATOR_STATE_DIR"):
+        _default_store = IndicatorStateStore()
+    return _default_store
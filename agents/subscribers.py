@@ -0,0 +1,54 @@
+import os
+import json
+from typing import Iterable, List, Optional
+
+
+class Subscriber:
+    """One Telegram chat (user, group or channel) and the squads it wants alerts from."""
+
+    def __init__(self, chat_id: str, name: Optional[str] = None, squads: Optional[Iterable[str]] = None):
+        self.chat_id = str(chat_id)
+        self.name = name or self.chat_id
+        # None = every squad
+        self.squads = set(squads) if squads else None
+
+    def wants(self, squad: str) -> bool:
+        return self.squads is None or squad in self.squads
+
+
+class SubscriberRegistry:
+    """
+    The chats each squad report is fanned out to.
+    Loaded from SUBSCRIBERS_PATH, a JSON list such as
+        [{"chat_id": "-100123", "name": "VIP", "squads": ["stocks", "crypto"]},
+         {"chat_id": "@alphaswarm_gold", "squads": ["commodities"]}]
+    Without that file the single TELEGRAM_CHAT_ID receives every squad.
+    """
+
+    def __init__(self, subscribers: Iterable[Subscriber]):
+        self.subscribers = list(subscribers)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SubscriberRegistry":
+        path = path or os.getenv("SUBSCRIBERS_PATH", "subscribers.json")
+        if os.path.exists(path):
+            with open(path) as fh:
+                entries = json.load(fh)
+            print(f"📇 [Subscribers] {len(entries)} chat(s) loaded from {path}")
+            return cls(Subscriber(e["chat_id"], e.get("name"), e.get("squads")) for e in entries)
+
+        chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        return cls([Subscriber(chat_id)] if chat_id else [])
+
+    def for_squad(self, squad: str) -> List[Subscriber]:
+        return [s for s in self.subscribers if s.wants(squad)]
+
+
+_default_registry: Optional[SubscriberRegistry] = None
+
+
+def get_subscribers() -> SubscriberRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SubscriberRegistry.load()
+    return _default_registry
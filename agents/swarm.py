@@ -0,0 +1,163 @@
+import time
+import asyncio
+import weakref
+import importlib
+import threading
+from typing import Dict, Iterable, Optional
+
+from agents.outbox import get_outbox
+from agents.progress import SquadProgress
+from agents.telemetry import collect
+
+# Squad key -> (label, manager class path). The classes are imported on first use:
+# they pull in pandas, yfinance and openai, which the API doesn't need to start
+SQUADS = {
+    "stocks": ("🦅 Wall Street Squad", "agents.stocks.manager.StockManager"),
+    "crypto": ("🪙 Crypto Squad", "agents.crypto.manager.CryptoManager"),
+    "commodities": ("🛢️ Commodity Squad", "agents.commodities.manager.CommodityManager"),
+}
+
+_managers: Dict[str, object] = {}
+_managers_lock = threading.Lock()  # Managers are built on worker threads (preload_agents, load_manager)
+# Coroutines queue here instead of tying up executor threads on _managers_lock (one lock per event loop)
+_load_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def manager_class(name: str) -> type:
+    module, _, cls = SQUADS[name][1].rpartition(".")
+    return getattr(importlib.import_module(module), cls)
+
+
+def get_manager(name: str):
+    """
+    Long-lived manager per squad, built on first use: its analyst, strategist (and
+    their HTTP clients) and notifier are reused by every run. Per-run state lives
+    in the SquadProgress passed to run_daily_cycle().
+    Blocking (imports the analysis stack on first use); coroutines use load_manager().
+    """
+    with _managers_lock:
+        if name not in _managers:
+            _managers[name] = manager_class(name)(outbox=get_outbox())
+        return _managers[name]
+
+
+async def load_manager(name: str):
+    """
+    get_manager() for coroutines. A manager not built yet is built on a worker
+    thread, so the event loop (and /health) keeps answering while the imports run
+    or preload_agents() holds the lock.
+    """
+    manager = _managers.get(name)
+    if manager is not None:
+        return manager
+    loop = asyncio.get_running_loop()
+    async with _load_locks.setdefault(loop, asyncio.Lock()):
+        return await loop.run_in_executor(None, get_manager, name)
+
+
+def preload_agents(squads: Optional[Iterable[str]] = None):
+    """Imports and builds the squads ahead of the first run (blocking; call it off the event loop)."""
+    started = time.perf_counter()
+    try:
+        for name in squads or SQUADS:
+            get_manager(name)
+    except Exception as e:
+        print(f"⚠️ [Swarm] Preloading agents failed, they will be built on first use: {e}")
+        return
+    print(f"🧰 [Swarm] Agents ready in {time.perf_counter() - started:.1f}s")
+
+
+def shutdown_agents():
+    """Stops the worker pools the squads started, if any run ever did."""
+    if _managers:
+        from agents.analysis_pool import get_analysis_executor
+        get_analysis_executor().shutdown()
+
+
+async def run_squad(name: str, progress: Optional[SquadProgress] = None, notify: bool = True) -> Optional[dict]:
+    """Runs one squad's daily cycle. Errors are contained so sibling squads keep going."""
+    label, _ = SQUADS[name]
+    progress = progress or SquadProgress(name)
+    try:
+        print(f"\n{label} Initializing...")
+        manager = await load_manager(name)
+        report = await manager.run_daily_cycle(notify=notify, progress=progress)
+        print(f"✅ {label} Complete.")
+        return report
+    except Exception as e:
+        print(f"❌ {label} Error: {e}")
+        progress.finish(error=str(e) or type(e).__name__)
+        return None
+
+
+async def run_swarm(squads: Optional[Iterable[str]] = None,
+                    progress: Optional[Dict[str, SquadProgress]] = None, notify: bool = True) -> Dict[str, Optional[dict]]:
+    """
+    Runs the squads concurrently: data fetching and LLM analysis overlap, and only
+    the final Telegram sends are persisted and then serialized (and paced) through
+    the shared outbox.
+    End-to-end time is the slowest squad instead of the sum of all three.
+    `progress` (squad -> SquadProgress) receives per-phase timings; a squad's
+    notify phase lasts until the outbox has delivered its alerts. notify=False
+    stops after the strategist (nothing is sent).
+    """
+    names = list(squads or SQUADS)
+    progress = {name: (progress or {}).get(name) or SquadProgress(name) for name in names}
+    outbox = get_outbox()
+    started = time.time()
+
+    with collect("swarm"):  # Per-stage timing summary (fetch / analyze / llm / notify) at the end
+        reports = await asyncio.gather(*(run_squad(name, progress[name], notify) for name in names))
+        await outbox.drain()
+        outbox.report(since=started)  # Per-chat delivery latency and failures for this run
+        for name in names:
+            progress[name].finish()
+
+    return dict(zip(names, reports))
+
+
+def squad_for(symbol: str) -> str:
+    """Squad whose analyst and strategist fit a symbol: BTC-USD -> crypto, GC=F -> commodities, AAPL -> stocks."""
+    if symbol.endswith("-USD"):
+        return "crypto"
+    if symbol.endswith("=F"):
+        return "commodities"
+    return "stocks"
+
+
+async def analyze_symbol(symbol: str, squad: Optional[str] = None, notify: bool = False,
+                         progress: Optional[SquadProgress] = None) -> dict:
+    """
+    Runs the squad pipeline for a single symbol: fetch, analyze, strategize and,
+    if asked, notify. Stored bars and cached strategies are reused, so re-running
+    one asset (e.g. after a failed LLM call) takes seconds instead of a full cycle.
+    Raises ValueError when no market data can be loaded for the symbol.
+    """
+    squad = squad or squad_for(symbol)
+    label, _ = SQUADS[squad]
+    progress = progress or SquadProgress(f"{squad}:{symbol}")
+    outbox = get_outbox()
+    manager = await load_manager(squad)
+    print(f"\n{label} Analyzing {symbol} on demand...")
+
+    with collect(f"analyze:{symbol}"):
+        progress.start("fetch")
+        fetched = await manager.engine.fetch_many([symbol])
+        df = fetched.frames.get(symbol)
+        if df is None:
+            raise ValueError(f"No market data for {symbol}: {fetched.failures.get(symbol, 'no data')}")
+
+        progress.start("analyze")
+        summary = manager.analyst.analyze_ticker(symbol, df)
+
+        progress.start("strategize")
+        report = await manager.build_report([summary])
+
+        if notify:
+            progress.start("notify")
+            await manager.send_report(report)
+            await outbox.drain()
+        else:
+            progress.skip("notify")
+        progress.finish()
+    return report
@@ -0,0 +1,207 @@
+import os
+import re
+import html
+import asyncio
+from typing import List, Optional, Tuple
+
+import httpx
+
+from agents.telemetry import current_span, span
+
+# sendMessage limit, counted on the text left after HTML parsing, in UTF-16 code units
+MESSAGE_LIMIT = 4096
+
+_TAG = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+
+def visible_length(text: str) -> int:
+    """Length Telegram checks against MESSAGE_LIMIT: tags stripped, entities decoded, UTF-16 units (emoji count 2)."""
+    plain = html.unescape(_TAG.sub("", text))
+    return len(plain.encode("utf-16-le")) // 2
+
+
+def _split_block(block: str, budget: int) -> List[str]:
+    """
+    Cuts an oversized block at line ends where no tag is open, so every piece
+    stays valid HTML. A single line that still doesn't fit is sent as plain text.
+    """
+    pieces, current, open_tags = [], "", []
+    for line in block.splitlines(keepends=True):
+        if current and not open_tags and visible_length(current + line) > budget:
+            pieces.append(current)
+            current = ""
+        current += line
+        for closing, tag in _TAG.findall(line):
+            if closing and open_tags and open_tags[-1] == tag.lower():
+                open_tags.pop()
+            elif not closing:
+                open_tags.append(tag.lower())
+    if current:
+        pieces.append(current)
+
+    result = []
+    for piece in pieces:
+        if visible_length(piece) <= budget:
+            result.append(piece)
+            continue
+        # Last resort: drop the markup and cut the text itself
+        plain = html.unescape(_TAG.sub("", piece))
+        while plain:
+            cut = budget
+            while len(plain[:cut].encode("utf-16-le")) // 2 > budget:
+                cut -= 1
+            result.append(html.escape(plain[:cut], quote=False))
+            plain = plain[cut:]
+    return result
+
+
+def split_message(header: str, blocks: List[str], footer: str = "", limit: int = MESSAGE_LIMIT) -> List[str]:
+    """
+    Packs asset blocks into as few messages as fit under `limit`, never cutting
+    inside a block unless that block alone is too long. Every part repeats the
+    header (numbered "1/3", "2/3", ... when there is more than one) and the
+    footer closes the last part.
+    """
+    marker_room = len(" (99/99)")
+    budget = limit - visible_length(header) - marker_room
+
+    units = []
+    for block in blocks + ([footer] if footer else []):
+        size = visible_length(block)
+        if size <= budget:
+            units.append((block, size))
+        else:
+            units.extend((piece, visible_length(piece)) for piece in _split_block(block, budget))
+
+    # Blocks are self-contained HTML, so their visible lengths simply add up
+    bodies, current, used = [], [], 0
+    for unit, size in units:
+        if current and used + size > budget:
+            bodies.append("".join(current))
+            current, used = [], 0
+        current.append(unit)
+        used += size
+    if current or not bodies:
+        bodies.append("".join(current))
+
+    if len(bodies) == 1:
+        return [header + bodies[0]]
+    title, gap = header.rstrip("\n"), header[len(header.rstrip("\n")):]
+    return [f"{title} ({i}/{len(bodies)}){gap}{body}" for i, body in enumerate(bodies, 1)]
+
+
+def numbered(parts: List[str], label: str) -> List[Tuple[str, str]]:
+    """Pairs each part with a log label, e.g. 'Wall Street Alert (2/3)'."""
+    if len(parts) == 1:
+        return [(label, parts[0])]
+    return [(f"{label} ({i}/{len(parts)})", part) for i, part in enumerate(parts, 1)]
+
+
+class TelegramTransport:
+    """
+    Async Bot API client shared by every notifier.
+    One pooled keep-alive httpx.AsyncClient per event loop, a timeout on every
+    request and bounded retries with exponential backoff. A 429 waits exactly
+    the `retry_after` Telegram asks for. TELEGRAM_API_BASE points it at a fake
+    Bot API server for local testing.
+    """
+
+    def __init__(self, api_base: Optional[str] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, backoff: Optional[float] = None):
+        self.api_base = (api_base or os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org")).rstrip("/")
+        self.timeout = timeout if timeout is not None else float(os.getenv("TELEGRAM_TIMEOUT", "10"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("TELEGRAM_RETRY_BACKOFF", "1"))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them (asyncio.run() makes a new one each time)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+            self._loop = loop
+        return self._client
+
+    async def call(self, token: str, method: str, payload: dict) -> dict:
+        """
+        Calls a Bot API method and returns its decoded response.
+        Raises TelegramError once retries are exhausted or on a non-retryable rejection.
+        """
+        url = f"{self.api_base}/bot{token}/{method}"
+        attempt = 0
+        while True:
+            delay = self.backoff * (2 ** attempt)
+            try:
+                r = await self._get_client().post(url, json=payload)
+                body = self._decode(r)
+                if r.status_code == 200:
+                    if body.get("ok"):
+                        return body
+                    # Proxy error page or a cut-off body: not a Bot API answer, so try again
+                    error = TelegramError(200, body.get("description") or f"unexpected response {r.text[:80]!r}")
+                else:
+                    if r.status_code == 429:
+                        # Flood control: Telegram tells us exactly how long to back off
+                        delay = float(body.get("parameters", {}).get("retry_after", delay))
+                    elif r.status_code < 500:
+                        raise TelegramError(r.status_code, body.get("description", r.text))
+                    error = TelegramError(r.status_code, body.get("description", r.text))
+            except httpx.HTTPError as e:
+                error = TelegramError(None, str(e) or type(e).__name__)
+
+            if attempt >= self.max_retries:
+                raise error
+            attempt += 1
+            current_span().incr("retries")
+            if error.status == 429:
+                current_span().incr("flood_waits")
+            print(f"🔁 [Telegram] {method} failed ({error}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _decode(r: httpx.Response) -> dict:
+        try:
+            body = r.json()
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    async def send_message(self, token: str, chat_id: str, text: str) -> dict:
+        with span("notify", chat_id=str(chat_id), bytes=len(text.encode())) as s:
+            try:
+                return await self.call(token, "sendMessage", {
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": "HTML",
+                    "disable_web_page_preview": True
+                })
+            except TelegramError as e:
+                s.set(http_status=e.status)
+                raise
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class TelegramError(Exception):
+    def __init__(self, status: Optional[int], description: str):
+        self.status = status
+        self.description = description
+        super().__init__(f"{status}: {description}" if status else description)
+
+
+_default_transport: Optional[TelegramTransport] = None
+
+
+def get_telegram_transport() -> TelegramTransport:
+    """Process-wide transport, so all squads share one connection pool."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = TelegramTransport()
+    return _default_transport
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Numeric span attributes that are summed in the per-run summary
+TOTALS = ("bytes", "prompt_tokens", "completion_tokens", "total_tokens", "retries")
+
+
+class Span:
+    """
+    One timed stage (fetch, analyze, llm, notify) of one symbol or message.
+    Code running inside it adds attributes with set()/incr(), e.g. token usage
+    or the retries a transport needed; they end up in the JSON log line.
+    """
+
+    def __init__(self, stage: str, attrs: dict):
+        self.stage = stage
+        self.attrs = attrs
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.started = time.perf_counter()
+        self.duration = 0.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def incr(self, key: str, n: int = 1):
+        self.attrs[key] = self.attrs.get(key, 0) + n
+
+    def fail(self, error: str, status: str = "error"):
+        """Marks a handled failure (the code recovered, so no exception reaches the span)."""
+        self.status = status
+        self.error = error
+
+    def record(self) -> dict:
+        record = {"stage": self.stage, "duration_ms": round(self.duration * 1000, 1), "status": self.status}
+        record.update(self.attrs)
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NullSpan(Span):
+    """Returned by current_span() outside any span, so callers never need a None check."""
+
+    def __init__(self):
+        super().__init__("none", {})
+
+    def set(self, **attrs):
+        pass
+
+    def incr(self, key: str, n: int = 1):
+        pass
+
+    def fail(self, error: str, status: str = "error"):
+        pass
+
+
+class RunStats:
+    """Every span finished inside one collect() block, summarized per stage at the end."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.id = uuid.uuid4().hex[:12]  # Unique even when runs share a name; stored on queued alerts
+        self.started = time.perf_counter()
+        self.records: List[dict] = []
+
+    def summary(self) -> dict:
+        stages: Dict[str, dict] = {}
+        for r in self.records:
+            s = stages.setdefault(r["stage"], {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "slowest": None})
+            s["count"] += 1
+            s["errors"] += r["status"] != "ok"
+            s["total_ms"] += r["duration_ms"]
+            if r["duration_ms"] >= s["max_ms"]:
+                s["max_ms"], s["slowest"] = r["duration_ms"], r.get("symbol") or r.get("chat_id")
+            for key in TOTALS:
+                if isinstance(r.get(key), (int, float)):
+                    s[key] = s.get(key, 0) + r[key]
+        for s in stages.values():
+            s["total_ms"] = round(s["total_ms"], 1)
+            s["avg_ms"] = round(s["total_ms"] / s["count"], 1)
+        return {"run": self.name, "wall_ms": round((time.perf_counter() - self.started) * 1000, 1), "stages": stages}
+
+
+_NULL = _NullSpan()
+_current_span: ContextVar[Span] = ContextVar("telemetry_span", default=_NULL)
+_current_run: ContextVar[Optional[RunStats]] = ContextVar("telemetry_run", default=None)
+_sinks: List[Callable[[dict], None]] = []
+_live_runs: Dict[str, RunStats] = {}
+
+
+def log_enabled() -> bool:
+    return os.getenv("TELEMETRY_LOG", "1") not in ("0", "false", "")
+
+
+def emit(event: str, payload: dict):
+    """One structured JSON line on stdout (Cloud Logging picks up `severity` and `message`)."""
+    if not log_enabled():
+        return
+    line = {"severity": "INFO", "event": event, **payload}
+    line.setdefault("message", event)
+    print(json.dumps(line, default=str))
+
+
+def add_sink(sink: Callable[[dict], None]):
+    """Registers a callback that receives every finished span record (e.g. metrics)."""
+    _sinks.append(sink)
+
+
+def current_span() -> Span:
+    return _current_span.get()
+
+
+def current_run() -> Optional[RunStats]:
+    return _current_run.get()
+
+
+@contextmanager
+def join_run(run_id: Optional[str]) -> Iterator[Optional[RunStats]]:
+    """
+    Attributes the spans of the block to the run `run_id` while it is still being
+    collected, e.g. the sends of the outbox worker, which runs outside any run.
+    """
+    token = _current_run.set(_live_runs.get(run_id) if run_id else None)
+    try:
+        yield _current_run.get()
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def span(stage: str, **attrs) -> Iterator[Span]:
+    """
+    Times the block as `stage`. Exceptions mark the span as failed and propagate;
+    cancellation (e.g. a wait_for timeout) is recorded as "cancelled".
+    """
+    current = Span(stage, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except Exception as e:
+        current.fail(str(e) or type(e).__name__)
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.started
+        _current_span.reset(token)
+        record = current.record()
+        run = _current_run.get()
+        if run is not None:
+            record["run"] = run.name
+            run.records.append(record)
+        label = " ".join(str(p) for p in (stage, record.get("symbol") or record.get("chat_id")) if p)
+        emit("span", {"message": f"{label} {record['duration_ms']}ms {current.status}", **record})
+        for sink in _sinks:
+            sink(record)
+
+
+@contextmanager
+def collect(name: str) -> Iterator[RunStats]:
+    """
+    Gathers the spans of one run (a swarm cycle, a single-symbol analysis) and
+    logs the per-stage summary when the block ends. Nested calls join the
+    outer run, so the summary is emitted once.
+    """
+    outer = _current_run.get()
+    if outer is not None:
+        yield outer
+        return
+
+    run = RunStats(name)
+    token = _current_run.set(run)
+    _live_runs[run.id] = run
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        del _live_runs[run.id]
+        summary = run.summary()
+        emit("run_summary", {"message": f"run {name} {summary['wall_ms']}ms", **summary})
+        print_summary(summary)
+
+
+def print_summary(summary: dict):
+    print(f"⏱️ [Telemetry] Run {summary['run']}: {summary['wall_ms'] / 1000:.1f}s wall")
+    for stage, s in summary["stages"].items():
+        extra = ", ".join(f"{key} {s[key]:,}" for key in TOTALS if s.get(key))
+        print(f"   {stage:<10} {s['count']:>3}x avg {s['avg_ms']:.0f}ms max {s['max_ms']:.0f}ms"
+              f" ({s['slowest']}) errors {s['errors']}" + (f", {extra}" if extra else ""))
@@ -0,0 +1,178 @@
+import os
+import time
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from agents.llm import close_llm_gateway
+from agents.outbox import Outbox, get_outbox
+from agents.swarm import SQUADS, manager_class
+from agents.streaming import IndicatorState
+from agents.bar_store import CachedSource
+from agents.market_data import FetchEngine, YFinanceSource
+
+
+# --- Trigger conditions -------------------------------------------------------
+# Each check gets the current indicator snapshot, the snapshot of the previous
+# bar (None when unknown) and the Watcher (for thresholds). It returns a short
+# label when the condition fires, None otherwise.
+
+def rsi_oversold(ind: dict, prev: Optional[dict], watcher: "Watcher") -> Optional[str]:
+    # Only the break itself counts, not every bar spent below the line
+    if prev is not None and ind['rsi'] < watcher.rsi_below <= prev['rsi']:
+        return f"RSI broke below {watcher.rsi_below:g} ({ind['rsi']:.1f})"
+    return None
+
+
+def golden_cross(ind: dict, prev: Optional[dict], watcher: "Watcher") -> Optional[str]:
+    if ind['ma50'] > ind['ma200'] and ind['ma50_prev'] <= ind['ma200_prev']:
+        return "GOLDEN CROSS (MA50 > MA200)"
+    return None
+
+
+def volume_spike(ind: dict, prev: Optional[dict], watcher: "Watcher") -> Optional[str]:
+    avg_vol = ind['vol_avg20_prev']
+    if avg_vol > 0 and ind['volume'] / avg_vol > watcher.volume_spike:
+        return f"Volume spike {ind['volume'] / avg_vol:.1f}x"
+    return None
+
+
+CONDITIONS = {
+    "rsi_oversold": rsi_oversold,
+    "golden_cross": golden_cross,
+    "volume_spike": volume_spike,
+}
+
+
+def _live_engine() -> FetchEngine:
+    """Polling engine: the bar store (when enabled) tops up from the last bar on every poll instead of serving its copy."""
+    source = YFinanceSource()
+    if os.getenv("BAR_STORE_DIR", ".cache/bars"):
+        source = CachedSource(source, staleness=0)
+    return FetchEngine(source=source)
+
+
+class Watcher:
+    """
+    Long-running watch mode.
+    Every `interval` seconds the squads' universes are re-polled and each symbol's
+    IndicatorState is advanced by the new (or revised in-session) bar only. The
+    strategist and notifier run just for symbols that hit a trigger condition,
+    and a condition alerts at most once per symbol and bar.
+    """
+
+    def __init__(self, squads: Optional[Iterable[str]] = None, interval: Optional[float] = None,
+                 conditions: Optional[Iterable[str]] = None, engine: Optional[FetchEngine] = None,
+                 outbox: Optional[Outbox] = None):
+        self.interval = interval if interval is not None else float(os.getenv("WATCH_INTERVAL", "300"))
+        self.rsi_below = float(os.getenv("WATCH_RSI_BELOW", "30"))
+        self.volume_spike = float(os.getenv("WATCH_VOLUME_SPIKE", "2.0"))
+
+        if conditions is None:
+            conditions = [c.strip() for c in os.getenv("WATCH_CONDITIONS", ",".join(CONDITIONS)).split(",") if c.strip()]
+        self.conditions = list(conditions)
+        unknown = [c for c in self.conditions if c not in CONDITIONS]
+        if unknown:
+            raise ValueError(f"Unknown watch condition(s): {', '.join(unknown)} (available: {', '.join(CONDITIONS)})")
+
+        self.engine = engine or _live_engine()
+        self.outbox = outbox or get_outbox()
+        self.managers = {name: manager_class(name)(engine=self.engine, outbox=self.outbox) for name in (squads or SQUADS)}
+
+        self.states: Dict[str, IndicatorState] = {}
+        # symbol -> (last bar ts, its latest snapshot, snapshot of the bar before it)
+        self._seen: Dict[str, Tuple[int, dict, Optional[dict]]] = {}
+        # symbol -> (bar ts, conditions already alerted for that bar)
+        self._fired: Dict[str, Tuple[int, set]] = {}
+
+    def advance(self, symbol: str, df: pd.DataFrame) -> Tuple[int, dict, Optional[dict]]:
+        """Applies the new bars in `df` to the symbol's state; returns (bar ts, snapshot, previous bar snapshot)."""
+        seen = self._seen.get(symbol)
+        state = self.states.get(symbol)
+        if seen is not None and state.overlap(df) is not None:
+            last_ts, last_ind, prev = seen
+            state.sync(df)
+            if state.last_ts != last_ts:
+                prev = last_ind  # The bar we last looked at has closed
+        else:
+            if seen is not None:
+                # Re-adjusted (split / dividend) or gapped history: the old snapshots are on another scale
+                print(f"🔄 [Watch] {symbol} history changed, reseeding its indicators")
+            # Seed up to the previous bar so crossings are detectable right away
+            state = IndicatorState()
+            state.seed(df.iloc[:-1], history=len(df))
+            prev = state.snapshot() if state.bars else None
+            state.extend(df.iloc[-1:])
+            self.states[symbol] = state
+
+        ind = state.snapshot()
+        self._seen[symbol] = (state.last_ts, ind, prev)
+        return state.last_ts, ind, prev
+
+    def evaluate(self, symbol: str, df: pd.DataFrame) -> Tuple[dict, List[str]]:
+        """Advances the symbol and returns its snapshot plus the labels of conditions that newly fired."""
+        bar_ts, ind, prev = self.advance(symbol, df)
+
+        fired_ts, done = self._fired.get(symbol, (None, set()))
+        if fired_ts != bar_ts:
+            done = set()
+
+        labels = []
+        for name in self.conditions:
+            if name in done:
+                continue
+            label = CONDITIONS[name](ind, prev, self)
+            if label:
+                labels.append(label)
+                done.add(name)
+        self._fired[symbol] = (bar_ts, done)
+        return ind, labels
+
+    async def poll_squad(self, name: str) -> dict:
+        """One polling pass over a squad's universe. Errors are contained so sibling squads keep going."""
+        label, _ = SQUADS[name]
+        manager = self.managers[name]
+        try:
+            fetched = await self.engine.fetch_many(manager.universe)
+            fetched.report("Watch")
+
+            summaries = []
+            for symbol, df in fetched.frames.items():
+                ind, triggers = self.evaluate(symbol, df)
+                if triggers:
+                    print(f"🚨 [Watch] {symbol}: {', '.join(triggers)}")
+                    summaries.append(manager.analyst.summarize(symbol, ind))
+
+            if not summaries:
+                return {}
+
+            report = await manager.build_report(summaries)
+            await manager.send_report(report)
+            return report
+        except Exception as e:
+            print(f"❌ [Watch] {label} Error: {e}")
+            return {}
+
+    async def run(self, cycles: Optional[int] = None):
+        """Polls forever (or `cycles` times), keeping one poll per `interval` seconds."""
+        print(f"👀 [Watch] Watching {', '.join(self.managers)} every {self.interval:g}s for: {', '.join(self.conditions)}")
+        done = 0
+        try:
+            while cycles is None or done < cycles:
+                started = time.monotonic()
+                reports = await asyncio.gather(*(self.poll_squad(name) for name in self.managers))
+                done += 1
+
+                alerts = sum(len(r) for r in reports)
+                print(f"👀 [Watch] Poll {done} done in {time.monotonic() - started:.1f}s, {alerts} alert(s)")
+
+                if cycles is None or done < cycles:
+                    await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            await self.outbox.drain()
+            await close_llm_gateway()  # Its pool belongs to this loop
+
+
+async def run_watch(squads: Optional[Iterable[str]] = None, cycles: Optional[int] = None):
+    await Watcher(squads=squads).run(cycles=cycles)
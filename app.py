@@ -1,16 +1,23 @@
 import asyncio
 import os
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from contextlib import asynccontextmanager
-from typing import Dict
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Import Swarm Logic
-from agents.stocks.manager import StockManager
-from agents.crypto.manager import CryptoManager
-from agents.commodities.manager import CommodityManager
+from agents.runs import get_run_coordinator
+from agents.swarm import SQUADS, preload_agents, shutdown_agents
+from agents.outbox import get_outbox
+from agents.metrics import get_metrics
+
+# Stage metrics come from telemetry spans; these gauges are read at scrape time
+metrics = get_metrics()
+metrics.gauge("alphaswarm_runs_in_flight", "Swarm, squad and symbol runs currently executing",
+              fn=lambda: get_run_coordinator().in_flight())
+metrics.gauge("alphaswarm_outbox_pending", "Alerts persisted but not yet delivered", fn=lambda: get_outbox().pending())
 
 # Define Lifecycle (Optional, for startup checks)
 @asynccontextmanager
@@ -20,8 +27,25 @@ async def lifespan(app: FastAPI):
         print("⚠️ COMPONENT CHECK: Some API Keys are missing!")
     else:
         print("✅ COMPONENT CHECK: Systems Green.")
+
+    # Resume alerts a previous container left undelivered
+    outbox = get_outbox()
+    if outbox.pending():
+        print(f"📬 [Outbox] Resuming {outbox.pending()} undelivered alert(s)...")
+        outbox.start()
+
+    # The analysis stack (pandas, yfinance, openai) loads in the background: /health
+    # answers right away and the first trigger finds the agents built
+    preload = None
+    if os.getenv("PRELOAD_AGENTS", "1") != "0":
+        preload = asyncio.get_running_loop().run_in_executor(None, preload_agents)
     yield
-    # Shutdown logic if needed
+    # Shutdown: let a preload still in progress finish, then stop the analysis worker processes
+    if preload is not None:
+        await preload
+    shutdown_agents()
+    from agents.llm import close_llm_gateway  # Already loaded if any squad ran
+    await close_llm_gateway()
 
 app = FastAPI(
     title="AlphaSwarm API",
@@ -30,37 +54,6 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-async def run_swarm_task():
-    """
-    The main logic from run_alpha_swarm.py, adapted for background execution.
-    """
-    print("🚀 [API TRIGGER] INITIALIZING ALPHA SWARM PROTOCOL...")
-    
-    try:
-        # Phase 1: Stocks
-        print("🦅 [PHASE 1] Wall Street Squad...")
-        stock_mgr = StockManager()
-        await stock_mgr.run_daily_cycle()
-        
-        await asyncio.sleep(20) # Anti-Spam
-        
-        # Phase 2: Crypto
-        print("🪙 [PHASE 2] Crypto Squad...")
-        crypto_mgr = CryptoManager()
-        await crypto_mgr.run_daily_cycle()
-        
-        await asyncio.sleep(20) # Anti-Spam
-        
-        # Phase 3: Commodities
-        print("🛢️ [PHASE 3] Commodity Squad...")
-        comm_mgr = CommodityManager()
-        await comm_mgr.run_daily_cycle()
-        
-        print("🏁 [API TRIGGER] MISSION ACCOMPLISHED.")
-        
-    except Exception as e:
-        print(f"❌ [API TRIGGER] CRITICAL ERROR: {str(e)}")
-
 @app.get("/")
 def home():
     return {"status": "AlphaSwarm System Online 🦅", "version": "1.2.0"}
@@ -73,13 +66,71 @@ def health_check():
     return {"health": "ok"}
 
 @app.post("/trigger")
-async def trigger_swarm(background_tasks: BackgroundTasks):
+async def trigger_swarm():
     """
     Manually triggers the full analysis cycle in the background.
-    Returns immediately so the HTTP request doesn't time out.
+    Returns immediately so the HTTP request doesn't time out. A trigger while a
+    cycle is already running (cron retry, double click) joins it instead of
+    starting a second one; poll GET /runs/{run_id} for progress.
+    """
+    run, started = get_run_coordinator().submit()
+    return {
+        "message": "AlphaSwarm Protocol Initiated 🚀" if started else "AlphaSwarm already running, joined 🔗",
+        "status": run.status,
+        "run_id": run.id,
+        "joined": not started,
+    }
+
+@app.post("/trigger/{squad}")
+async def trigger_squad(squad: str, notify: bool = True):
+    """
+    Runs a single squad (stocks, crypto or commodities) in the background.
+    notify=false stops after the strategist, e.g. to refresh the strategy cache.
+    """
+    if squad not in SQUADS:
+        raise HTTPException(status_code=404, detail=f"Unknown squad {squad}, expected one of {', '.join(SQUADS)}")
+    run, started = get_run_coordinator().submit([squad], notify=notify)
+    return {
+        "message": f"{squad} squad initiated 🚀" if started else f"{squad} squad already running, joined 🔗",
+        "status": run.status,
+        "run_id": run.id,
+        "joined": not started,
+        "notify": run.notify,
+    }
+
+@app.post("/analyze/{symbol}")
+async def analyze(symbol: str, squad: Optional[str] = None, notify: bool = False, wait: bool = False):
     """
-    background_tasks.add_task(run_swarm_task)
-    return {"message": "AlphaSwarm Protocol Initiated 🚀", "status": "Running in background"}
+    Fetch -> analyze -> strategize (-> notify) for one symbol, reusing stored bars
+    and cached strategies. The squad is inferred from the symbol unless given.
+    wait=true answers with the finished run instead of a run_id to poll.
+    """
+    if squad is not None and squad not in SQUADS:
+        raise HTTPException(status_code=404, detail=f"Unknown squad {squad}, expected one of {', '.join(SQUADS)}")
+    run, started = get_run_coordinator().submit_symbol(symbol.upper(), squad, notify=notify)
+    if wait:
+        await asyncio.shield(run.task)
+        return run.to_dict()
+    return {
+        "message": f"Analyzing {symbol.upper()} 🔍" if started else f"{symbol.upper()} already being analyzed, joined 🔗",
+        "status": run.status,
+        "run_id": run.id,
+        "joined": not started,
+        "notify": run.notify,
+    }
+
+@app.get("/runs/{run_id}")
+def get_run(run_id: str):
+    """Per-squad phase progress, timings and (once finished) the result of a run."""
+    run = get_run_coordinator().get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run {run_id}")
+    return run.to_dict()
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text exposition: fetch / LLM / Telegram latency histograms, tokens, cache and 429 counters."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,81 @@
+"""
+Analysis benchmark: in-process vs process pool (agents/analysis_pool.py).
+
+Scores and computes indicators for a large synthetic universe both inline and
+on the shared-memory worker pool, and measures how long the event loop is
+blocked meanwhile (a 10 ms ticker running next to the work).
+
+    python benchmarks/bench_analysis.py [--symbols 500,2000] [--workers 4] [--repeat 3]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import synthetic_frame
+from agents.analysis_pool import AnalysisExecutor
+from agents.screener import UniverseScreener
+
+TICK = 0.01
+
+
+async def measure(work) -> tuple:
+    """Runs `work()` next to a 10 ms ticker; returns (seconds, worst tick lag in ms)."""
+    lags, done = [], asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    return elapsed, max(lags, default=0.0) * 1e3
+
+
+async def run(args):
+    screener = UniverseScreener()
+    inline = AnalysisExecutor(workers=1)
+    pool = AnalysisExecutor(workers=args.workers, min_symbols=1)
+    await pool.compute_many({"WARM": synthetic_frame("WARM")})  # Spawn the workers outside the timings
+
+    print(f"{'symbols':>8}  {'job':<9}{'inline s':>10}{'pool s':>9}{'speedup':>9}{'inline lag':>13}{'pool lag':>11}")
+    for count in (int(n) for n in args.symbols.split(",")):
+        frames = {f"SYM{i}": synthetic_frame(f"SYM{i}") for i in range(count)}
+        jobs = {
+            "rank": lambda ex: ex.rank(screener, frames, limit=10),
+            "compute": lambda ex: ex.compute_many(frames),
+        }
+        for job, fn in jobs.items():
+            # Inline work is synchronous inside the coroutine, so it blocks the ticker for its whole duration
+            a = [await measure(lambda: fn(inline)) for _ in range(args.repeat)]
+            b = [await measure(lambda: fn(pool)) for _ in range(args.repeat)]
+            t_a, t_b = statistics.median(x[0] for x in a), statistics.median(x[0] for x in b)
+            print(f"{count:>8}  {job:<9}{t_a:>10.3f}{t_b:>9.3f}{t_a / t_b:>8.1f}x"
+                  f"{max(x[1] for x in a):>10.1f} ms{max(x[1] for x in b):>8.1f} ms")
+    pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", default="500,2000", help="Comma separated universe sizes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    os.environ.setdefault("TELEMETRY_LOG", "0")
+    print(f"⚙️  workers={args.workers} repeat={args.repeat}")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Offline end-to-end benchmark of the swarm cycle.
+
+Replays OHLCV fixtures for the full stock, crypto and commodity universes and
+points the strategists and Telegram at local stub servers, so a whole cycle
+(scan, analysis, LLM fan-out, alert delivery) runs without the network.
+Reports cycle time, per-stage and per-phase timings and peak memory.
+
+    python benchmarks/bench_cycle.py [--runs 3] [--llm-latency 2] [--squads stocks,crypto]
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import statistics
+import tracemalloc
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="Measured cycles (after one warm-up unless --no-warmup)")
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--squads", default="stocks,crypto,commodities")
+    parser.add_argument("--fixtures", default=None, help="Fixture directory (default: recorded, else synthetic)")
+    parser.add_argument("--fetch-latency", type=float, default=0.0, help="Simulated seconds per symbol download")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="Stub LLM seconds per call")
+    parser.add_argument("--llm-jitter", type=float, default=0.25, help="+/- fraction applied to --llm-latency")
+    parser.add_argument("--batch-size", type=int, default=1, help="STRATEGIST_BATCH_SIZE for the run (1: one call per symbol)")
+    parser.add_argument("--llm-drop", type=float, default=0.0, help="Fraction of tickers the stub leaves out of batched answers")
+    parser.add_argument("--llm-rpm", type=float, default=0, help="OPENROUTER_RPM for the run (0: unlimited)")
+    parser.add_argument("--tg-latency", type=float, default=0.1, help="Stub Telegram seconds per sendMessage")
+    parser.add_argument("--send-interval", type=float, default=0.0, help="TELEGRAM_SEND_INTERVAL for the run")
+    parser.add_argument("--chats", type=int, default=1, help="Subscriber chats every report is fanned out to")
+    parser.add_argument("--warm-caches", action="store_true", help="Keep the strategy cache between cycles")
+    parser.add_argument("--tracemalloc", action="store_true", help="Track Python allocation peak (slower)")
+    parser.add_argument("--llm-port", type=int, default=8765)
+    parser.add_argument("--tg-port", type=int, default=8766)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+
+def configure(args, workdir: str):
+    """Environment for a hermetic run; must happen before the agents read it."""
+    subscribers = os.path.join(workdir, "subscribers.json")
+    with open(subscribers, "w") as fh:
+        json.dump([{"chat_id": str(-1000 - i)} for i in range(args.chats)], fh)
+
+    os.environ.update({
+        "OPENROUTER_API_KEY": "bench",
+        "OPENROUTER_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+        "OPENROUTER_RPM": str(args.llm_rpm),
+        "STRATEGIST_BATCH_SIZE": str(args.batch_size),
+        "TELEGRAM_BOT_TOKEN": "0:bench",
+        "TELEGRAM_CHAT_ID": "-1000",
+        "TELEGRAM_API_BASE": f"http://127.0.0.1:{args.tg_port}",
+        "TELEGRAM_SEND_INTERVAL": str(args.send_interval),
+        "SUBSCRIBERS_PATH": subscribers,
+        "OUTBOX_PATH": "",
+        "BAR_STORE_DIR": "",
+        "INDICATOR_STATE_DIR": "",
+        "STRATEGY_CACHE_PATH": os.path.join(workdir, "strategies.sqlite") if args.warm_caches else "",
+        "TELEMETRY_LOG": "0",
+    })
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="alphaswarm-bench-")
+    configure(args, workdir)
+
+    # Imported only now: the agents read their configuration from the environment
+    import asyncio
+    import contextlib
+    import io
+    from fixtures import FixtureSource, fixture_dir
+    from stub_servers import start_llm, start_telegram
+    import agents.market_data as market_data
+    from agents.progress import SquadProgress
+    from agents.swarm import run_swarm
+    from agents.telemetry import collect
+
+    llm = start_llm(args.llm_port, args.llm_latency, args.llm_jitter, drop=args.llm_drop)
+    telegram = start_telegram(args.tg_port, args.tg_latency)
+    root = fixture_dir(args.fixtures)
+    market_data._default_engine = market_data.FetchEngine(source=FixtureSource(root, args.fetch_latency))
+    squads = [s.strip() for s in args.squads.split(",") if s.strip()]
+
+    async def cycle():
+        progress = {name: SquadProgress(name) for name in squads}
+        with collect("bench") as stats:
+            started = time.perf_counter()
+            await run_swarm(squads, progress=progress)
+            elapsed = time.perf_counter() - started
+        return elapsed, stats.summary(), {name: p.to_dict() for name, p in progress.items()}
+
+    def run_quiet():
+        # The agents narrate every step; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            return asyncio.run(cycle())
+
+    print(f"📼 Fixtures: {root}")
+    print(f"⚙️  squads={','.join(squads)} llm={args.llm_latency}s±{args.llm_jitter:.0%} telegram={args.tg_latency}s "
+          f"fetch={args.fetch_latency}s chats={args.chats} batch={args.batch_size}")
+    if not args.no_warmup:
+        run_quiet()
+
+    rss_before = peak_rss_mb()
+    if args.tracemalloc:
+        tracemalloc.start()
+    results = []
+    for i in range(args.runs):
+        gc.collect()
+        llm.state.calls, llm.state.connections, telegram.state.messages = 0, set(), []
+        elapsed, summary, phases = run_quiet()
+        results.append({"cycle_s": elapsed, "stages": summary["stages"], "phases": phases,
+                        "llm_calls": llm.state.calls, "llm_connections": len(llm.state.connections),
+                        "messages": len(telegram.state.messages)})
+        llm_stage = summary["stages"].get("llm", {})
+        print(f"  run {i + 1}: {elapsed:.2f}s  llm calls {llm.state.calls} over {len(llm.state.connections)} connections  "
+              f"tokens {llm_stage.get('prompt_tokens', 0)} in / {llm_stage.get('completion_tokens', 0)} out  "
+              f"messages {len(telegram.state.messages)}")
+    traced_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    cycles = [r["cycle_s"] for r in results]
+    print(f"\n⏱️  cycle: mean {statistics.mean(cycles):.2f}s  median {statistics.median(cycles):.2f}s  "
+          f"min {min(cycles):.2f}s  max {max(cycles):.2f}s")
+
+    print(f"\n{'stage':<10}{'count':>7}{'avg ms':>10}{'max ms':>10}{'total s':>10}")
+    for stage in results[-1]["stages"]:
+        rows = [r["stages"][stage] for r in results if stage in r["stages"]]
+        print(f"{stage:<10}{rows[-1]['count']:>7}{statistics.mean(s['avg_ms'] for s in rows):>10.1f}"
+              f"{max(s['max_ms'] for s in rows):>10.1f}{statistics.mean(s['total_ms'] for s in rows) / 1000:>10.2f}")
+
+    print(f"\n{'squad':<13}" + "".join(f"{p:>12}" for p in ("fetch", "analyze", "strategize", "notify")))
+    for squad in squads:
+        durations = [[r["phases"][squad]["phases"][p].get("duration") or 0 for r in results]
+                     for p in ("fetch", "analyze", "strategize", "notify")]
+        print(f"{squad:<13}" + "".join(f"{statistics.mean(d):>11.2f}s" for d in durations))
+
+    print(f"\n🧠 peak RSS {peak_rss_mb():.0f} MB (after warm-up {rss_before:.0f} MB)"
+          + (f", traced Python peak {traced_peak:.1f} MB" if traced_peak is not None else ""))
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"args": vars(args), "runs": results, "peak_rss_mb": peak_rss_mb(),
+                       "traced_peak_mb": traced_peak}, fh, indent=2, default=str)
+        print(f"📝 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
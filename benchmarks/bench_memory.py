@@ -0,0 +1,95 @@
+"""
+Memory benchmark for the bars held during a universe scan (agents/bars.py).
+
+Compares the memory retained by yfinance-shaped DataFrames with the compact
+Bars container for a few universe sizes, then runs a scan through the
+FetchEngine and screener and reports what stays alive after the top picks are
+kept and the rest released.
+
+    python benchmarks/bench_memory.py [--symbols 500,2000] [--keep 10]
+"""
+import os
+import gc
+import sys
+import asyncio
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from fixtures import synthetic_frame
+from agents.bars import Bars
+from agents.market_data import FetchEngine, FrameRegistry
+from agents.screener import UniverseScreener
+
+
+def yfinance_frame(symbol: str):
+    """synthetic_frame() with the extra columns normalize_history() passes through from Ticker.history."""
+    df = synthetic_frame(symbol)
+    df["Dividends"] = 0.0
+    df["Stock Splits"] = 0.0
+    return df
+
+
+class MemorySource:
+    """Serves pre-built yfinance-shaped frames (copies, as a download would)."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def fetch(self, symbol, period="1y", interval="1d", start=None):
+        return self.frames[symbol].copy()
+
+
+def retained(build) -> tuple:
+    """(result, bytes still allocated by it, peak bytes while building)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def mb(n: int) -> str:
+    return f"{n / 2 ** 20:8.1f} MB"
+
+
+async def scan(source, symbols, keep: int):
+    engine = FetchEngine(source=source, max_workers=8)
+    registry = FrameRegistry()
+    fetched = await engine.fetch_many(symbols, registry=registry)
+    ranked = UniverseScreener().rank(fetched.frames, limit=keep)
+    del fetched
+    registry.retain(pick["symbol"] for pick in ranked)
+    return registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", default="500,2000", help="Comma separated universe sizes")
+    parser.add_argument("--keep", type=int, default=10, help="Top picks kept after screening")
+    args = parser.parse_args()
+    os.environ.setdefault("TELEMETRY_LOG", "0")
+
+    print(f"{'symbols':>8}{'DataFrames':>13}{'Bars':>12}{'ratio':>7}{'scan peak':>13}{'after retain':>15}")
+    for count in (int(n) for n in args.symbols.split(",")):
+        symbols = [f"SYM{i}" for i in range(count)]
+        source = MemorySource({s: yfinance_frame(s) for s in symbols})
+
+        _, frames_bytes, _ = retained(lambda: {s: source.fetch(s) for s in symbols})
+        _, bars_bytes, _ = retained(lambda: {s: Bars.from_frame(s, source.fetch(s)) for s in symbols})
+        _, kept_bytes, scan_peak = retained(lambda: asyncio.run(scan(source, symbols, args.keep)))
+        print(f"{count:>8}{mb(frames_bytes):>13}{mb(bars_bytes):>12}{frames_bytes / bars_bytes:>6.1f}x"
+              f"{mb(scan_peak):>13}{mb(kept_bytes):>15}")
+
+    sample = Bars.from_frame("SYM0", yfinance_frame("SYM0"))
+    print(f"\n📦 one symbol: {sample} vs frame {yfinance_frame('SYM0').memory_usage(deep=True).sum()} bytes; "
+          f"max close error {np.max(np.abs(sample.close - yfinance_frame('SYM0')['close'].to_numpy()) / sample.close):.1e} (relative)")
+
+
+if __name__ == "__main__":
+    main()
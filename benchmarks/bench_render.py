@@ -0,0 +1,73 @@
+"""
+Render benchmark for the Telegram alert templates (agents/render.py).
+
+Times full alert rendering (blocks + 4096-limit split) per asset class for a
+few watchlist sizes, and the cost of rendering one report for many chats.
+
+    python benchmarks/bench_render.py [--repeat 200] [--chats 500]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.render import TEMPLATES
+
+
+def synthetic_report(squad: str, assets: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    tickers = {"crypto": "{}-USD", "stocks": "TCK{}", "commodities": "GC=F{}"}[squad]
+    report = {}
+    for i in range(assets):
+        report[tickers.format(i)] = {
+            "technical": {"price": rng.uniform(1, 5000), "support": "95.10", "resistance": "110.40", "rsi": "48.3",
+                          "volume_spike": "1.7x", "trend_status": "Bullish", "high_52w": "130.00", "low_52w": "80.00"},
+            "strategy": {
+                "headline": "Siap Breakout & Lanjut Naik 🚀",
+                "analysis_summary": "Akumulasi <institusi> terlihat jelas & volume naik. " * 8,
+                "market_phase": "Markup (Bull)", "psychology": "Greed",
+                "action_plan": {"signal": rng.choice(["BUY", "SELL", "WAIT"]), "entry_zone": "100-102",
+                                "take_profit": "120", "stop_loss": "94"},
+            },
+            "news": [{"title": "Headline number %d about the market & rates" % n, "source": "Reuters",
+                      "url": "https://example.com/%d" % n} for n in range(2)],
+        }
+    return report
+
+
+def bench(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--chats", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'squad':<12}{'assets':>7}{'parts':>7}{'per render':>14}{'per asset':>13}")
+    for squad, template in TEMPLATES.items():
+        for assets in (5, 20, 100):
+            report = synthetic_report(squad, assets)
+            parts = template.render(report, "17 Oct 2026")
+            t = bench(lambda: template.render(report, "17 Oct 2026"), args.repeat)
+            print(f"{squad:<12}{assets:>7}{len(parts):>7}{t * 1e3:>11.3f} ms{t / assets * 1e6:>10.1f} us")
+
+    # Per-subscriber variants: one render per chat (e.g. filtered or localized copies)
+    report = synthetic_report("stocks", 5)
+    template = TEMPLATES["stocks"]
+    start = time.perf_counter()
+    for _ in range(args.chats):
+        template.render(report, "17 Oct 2026")
+    elapsed = time.perf_counter() - start
+    print(f"\n{args.chats} chat renders of a 5-stock report: {elapsed * 1e3:.1f} ms ({args.chats / elapsed:,.0f} renders/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold start benchmark for the API (app.py).
+
+Each measurement runs in a fresh interpreter: the time to import app.py, the
+time to import it together with the squad managers (what startup used to pay
+before they became lazy), and the time from launching uvicorn until /health
+answers, with and without PRELOAD_AGENTS.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--port 8790]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = {
+    "import app": "import app",
+    "import app + squads": "import app; from agents.swarm import SQUADS, manager_class; [manager_class(s) for s in SQUADS]",
+}
+
+
+def env() -> dict:
+    # No outbox database or JSON logs: only the startup path is measured
+    return {**os.environ, "OUTBOX_PATH": "", "TELEMETRY_LOG": "0", "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def time_import(code: str) -> float:
+    probe = f"import time; t = time.perf_counter(); {code}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env(), capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def time_health(port: int, preload: bool) -> float:
+    """Seconds from spawning uvicorn until GET /health returns 200."""
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"]
+    started = time.perf_counter()
+    server = subprocess.Popen(cmd, cwd=ROOT, env={**env(), "PRELOAD_AGENTS": "1" if preload else "0"},
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before answering /health")
+            time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    rows = {label: [time_import(code) for _ in range(args.repeat)] for label, code in IMPORTS.items()}
+    rows["/health (preload)"] = [time_health(args.port, True) for _ in range(args.repeat)]
+    rows["/health (no preload)"] = [time_health(args.port, False) for _ in range(args.repeat)]
+
+    print(f"{'measurement':<24}{'median s':>10}{'min s':>9}{'max s':>9}")
+    for label, samples in rows.items():
+        print(f"{label:<24}{statistics.median(samples):>10.3f}{min(samples):>9.3f}{max(samples):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Recorded OHLCV fixtures for offline benchmarks.
+
+Fixtures are BarStore files (.npz, one per symbol), recorded from yfinance by
+record_fixtures.py into benchmarks/fixtures/. When none have been recorded, a
+deterministic synthetic set (random-walk bars) is generated under
+.cache/bench-fixtures so the suite still runs without the network.
+"""
+import os
+import sys
+import time
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from agents.bar_store import BarStore, CachedSource
+
+RECORDED_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+SYNTHETIC_DIR = os.path.join(ROOT, ".cache", "bench-fixtures")
+
+
+def universes() -> Dict[str, List[str]]:
+    """Every symbol the squads can touch, straight from the managers."""
+    from agents.stocks.manager import StockManager
+    from agents.crypto.manager import CryptoManager
+    from agents.commodities.manager import CommodityManager
+    return {
+        "stocks": list(StockManager().universe),
+        "crypto": list(dict.fromkeys(CryptoManager().universe + ["BTC-USD", "ETH-USD"])),
+        "commodities": list(CommodityManager().universe),
+    }
+
+
+def synthetic_frame(symbol: str) -> pd.DataFrame:
+    """Deterministic (per symbol) year of daily bars with volume bursts, shaped like a normalized yfinance frame."""
+    rng = np.random.default_rng(int(hashlib.md5(symbol.encode()).hexdigest()[:8], 16))
+    crypto = symbol.endswith("-USD")
+    tz, bars = ("UTC", 365) if crypto else ("America/New_York", 252)
+    end = pd.Timestamp.now(tz=tz).normalize()
+    index = pd.date_range(end=end, periods=bars, freq="D" if crypto else "B")
+    close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(0.0004, 0.02, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars))
+    volume = rng.lognormal(15, 0.4, bars) * np.where(rng.random(bars) < 0.05, 3, 1)
+    return pd.DataFrame({
+        "timestamp": index,
+        "open": close * (1 + rng.normal(0, 0.005, bars)),
+        "high": close * (1 + spread),
+        "low": close * (1 - spread),
+        "close": close,
+        "volume": volume.astype("int64"),
+    })
+
+
+def synthesize(root: str = SYNTHETIC_DIR) -> str:
+    store = BarStore(root)
+    for symbols in universes().values():
+        for symbol in symbols:
+            store.save(symbol, "1d", synthetic_frame(symbol), time.time())
+    return root
+
+
+def fixture_dir(path: Optional[str] = None) -> str:
+    """Recorded fixtures when present (or the given directory), otherwise the synthetic set."""
+    if path:
+        return path
+    if os.path.isdir(RECORDED_DIR) and any(f.endswith(".npz") for f in os.listdir(RECORDED_DIR)):
+        return RECORDED_DIR
+    if not (os.path.isdir(SYNTHETIC_DIR) and os.listdir(SYNTHETIC_DIR)):
+        print(f"⚠️ [Fixtures] No recorded fixtures in {RECORDED_DIR}, generating synthetic bars")
+        synthesize()
+    return SYNTHETIC_DIR
+
+
+class FixtureSource:
+    """
+    Market data source replaying fixtures (same interface as YFinanceSource).
+    `latency` simulates the download round trip per symbol.
+    """
+
+    def __init__(self, root: str, latency: float = 0.0):
+        self.store = BarStore(root)
+        self.latency = latency
+
+    def fetch(self, symbol: str, period: str = "1y", interval: str = "1d", start: Optional[str] = None) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        df, _, _ = self.store.load(symbol, interval)
+        if df is None:
+            return pd.DataFrame()
+        if start is not None:
+            df = df[df["timestamp"] >= pd.Timestamp(start, tz=df["timestamp"].dt.tz)].reset_index(drop=True)
+        return CachedSource._window(df, period)
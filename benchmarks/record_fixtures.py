@@ -0,0 +1,42 @@
+"""
+Records the OHLCV fixtures the offline benchmarks replay: one year of daily
+bars for every symbol in the stock, crypto and commodity universes, saved as
+BarStore files in benchmarks/fixtures/ (needs network access to Yahoo Finance).
+
+    python benchmarks/record_fixtures.py [--out benchmarks/fixtures]
+"""
+import time
+import argparse
+
+from fixtures import RECORDED_DIR, universes
+
+from agents.bar_store import BarStore
+from agents.market_data import YFinanceSource
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default=RECORDED_DIR)
+    args = parser.parse_args()
+
+    source, store = YFinanceSource(), BarStore(args.out)
+    recorded, failed = 0, []
+    for squad, symbols in universes().items():
+        for symbol in symbols:
+            try:
+                df = source.fetch(symbol, "1y", "1d")
+            except Exception as e:
+                df = None
+                print(f"⚠️ {symbol}: {e}")
+            if df is None or df.empty:
+                failed.append(symbol)
+                continue
+            store.save(symbol, "1d", df, time.time())
+            recorded += 1
+            print(f"📼 {squad:<12}{symbol:<12}{len(df)} bars")
+
+    print(f"\n✅ {recorded} fixture(s) in {args.out}" + (f", failed: {', '.join(failed)}" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
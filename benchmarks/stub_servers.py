@@ -0,0 +1,130 @@
+"""
+Local stand-ins for OpenRouter (OpenAI-compatible chat completions) and the
+Telegram Bot API, with configurable latency. Each runs uvicorn in a daemon
+thread, so a benchmark can point OPENROUTER_BASE_URL / TELEGRAM_API_BASE at them.
+"""
+import os
+import sys
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.telegram import MESSAGE_LIMIT, visible_length
+
+
+def _serve(app: FastAPI, port: int) -> FastAPI:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.02)
+    return app
+
+
+# Where the squad prompts name their asset ("Ticker: AAPL", "Asset: GC=F", "Analyze BTC-USD based on ...")
+_TICKER = re.compile(r"(?:Ticker|Asset):\s*(\S+)|Analyze (\S+) based")
+
+
+def fake_strategy(user_prompt: str, rng: random.Random) -> dict:
+    signal = rng.choice(["BUY", "SELL", "WAIT"])
+    ticker = _TICKER.search(user_prompt)
+    headline = rng.choice(["Akumulasi Senyap Sebelum Breakout", "Distribusi di Resistance", "Konsolidasi Sehat"])
+    return {
+        # The headline names the asset, so callers can check which answer went where
+        "headline": f"{ticker.group(1) or ticker.group(2)}: {headline}" if ticker else headline,
+        "analysis_summary": "Volume naik di atas rata-rata 20 hari sementara harga bertahan di atas MA50. " * 3,
+        "market_phase": rng.choice(["Accumulation", "Markup (Bull)", "Distribution", "Markdown (Bear)"]),
+        "psychology": rng.choice(["Fear", "Neutral", "Greed"]),
+        "action_plan": {"signal": signal, "entry_zone": "100-102", "take_profit": "115", "stop_loss": "95"},
+        "news": [{"title": f"Market headline {i} for the benchmark", "source": "Stub Wire",
+                  "url": f"https://example.com/news/{i}"} for i in range(2)],
+    }
+
+
+def fake_answer(user_prompt: str, rng: random.Random, drop: float = 0.0) -> dict:
+    """A single strategy, or for a batched prompt a strategy per requested ticker (each omitted with probability `drop`)."""
+    keys = re.search(r"with exactly these keys: (\[.*?\])", user_prompt)
+    if keys is None:
+        return fake_strategy(user_prompt, rng)
+    return {symbol: fake_strategy(f"Ticker: {symbol}", rng) for symbol in json.loads(keys.group(1)) if rng.random() >= drop}
+
+
+def start_llm(port: int = 8765, latency: float = 2.0, jitter: float = 0.25, seed: int = 7, drop: float = 0.0) -> FastAPI:
+    """
+    /v1/chat/completions answering a valid strategy JSON after `latency` seconds
+    (+/- `jitter` as a fraction). Token usage is estimated from the prompt size.
+    Batched prompts get one strategy per ticker, each left out with probability `drop`.
+    `state.connections` collects the client (host, port) pairs, i.e. the TCP connections used.
+    `state.delays` maps a prompt substring to a latency that replaces the default.
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.connections = set()
+    app.state.inflight = 0
+    app.state.peak_inflight = 0
+    app.state.delays = {}
+    rng = random.Random(seed)
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        app.state.connections.add((request.client.host, request.client.port))
+        app.state.inflight += 1
+        app.state.peak_inflight = max(app.state.peak_inflight, app.state.inflight)
+        prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+        delay = next((d for key, d in app.state.delays.items() if key in prompt), None)
+        try:
+            await asyncio.sleep(delay if delay is not None else max(0.0, latency * (1 + rng.uniform(-jitter, jitter))))
+        finally:
+            app.state.inflight -= 1
+
+        content = json.dumps(fake_answer(prompt, rng, drop))
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+        return {
+            "id": f"stub-{app.state.calls}", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    return _serve(app, port)
+
+
+def start_telegram(port: int = 8766, latency: float = 0.1) -> FastAPI:
+    """
+    Bot API sendMessage that records messages and, like Telegram, rejects texts whose parsed length exceeds 4096.
+    `state.failures` holds (status, body) responses served, in order, before requests go through again
+    (a str body is served as HTML).
+    """
+    app = FastAPI()
+    app.state.messages = []
+    app.state.attempts = 0
+    app.state.failures = []
+
+    @app.post("/bot{token}/{method}")
+    async def call(token: str, method: str, request: Request):
+        body = await request.json()
+        app.state.attempts += 1
+        await asyncio.sleep(latency)
+        if app.state.failures:
+            status, payload = app.state.failures.pop(0)
+            if isinstance(payload, str):  # e.g. a proxy's HTML error page
+                return HTMLResponse(payload, status_code=status)
+            return JSONResponse(payload, status_code=status)
+        if visible_length(body.get("text", "")) > MESSAGE_LIMIT:
+            return JSONResponse({"ok": False, "error_code": 400, "description": "Bad Request: message is too long"},
+                                status_code=400)
+        app.state.messages.append(body)
+        return {"ok": True, "result": {"message_id": len(app.state.messages), "chat": {"id": body.get("chat_id")}}}
+
+    return _serve(app, port)
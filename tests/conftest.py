@@ -0,0 +1,67 @@
+"""
+Shared fixtures: the local OpenRouter and Telegram stand-ins from
+benchmarks/stub_servers.py, started once per session on free ports.
+"""
+import os
+import sys
+import time
+import socket
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+from stub_servers import start_llm, start_telegram  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(autouse=True)
+def quiet_env(monkeypatch):
+    # No JSON span lines, no strategy cache and no on-disk bars unless a test asks for them
+    monkeypatch.setenv("TELEMETRY_LOG", "0")
+    monkeypatch.setenv("STRATEGY_CACHE_PATH", "")
+    monkeypatch.setenv("BAR_STORE_DIR", "")
+
+
+@pytest.fixture(scope="session")
+def _llm_app():
+    port = free_port()
+    app = start_llm(port, latency=0.1, jitter=0.5)
+    app.state.base_url = f"http://127.0.0.1:{port}/v1"
+    return app
+
+
+@pytest.fixture
+def llm_server(_llm_app, monkeypatch):
+    """Stub chat completions server, reset for the test, with the gateway pointed at it."""
+    # Requests a timed-out caller abandoned keep running on the server; let them finish first
+    deadline = time.monotonic() + 5
+    while _llm_app.state.inflight and time.monotonic() < deadline:
+        time.sleep(0.05)
+    _llm_app.state.calls, _llm_app.state.peak_inflight = 0, 0
+    _llm_app.state.connections, _llm_app.state.delays = set(), {}
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+    monkeypatch.setenv("OPENROUTER_BASE_URL", _llm_app.state.base_url)
+    monkeypatch.setenv("OPENROUTER_RPM", "0")
+    return _llm_app
+
+
+@pytest.fixture(scope="session")
+def _telegram_app():
+    port = free_port()
+    app = start_telegram(port, latency=0.0)
+    app.state.base_url = f"http://127.0.0.1:{port}"
+    return app
+
+
+@pytest.fixture
+def telegram_server(_telegram_app):
+    """Stub Bot API server, reset for the test."""
+    _telegram_app.state.messages, _telegram_app.state.attempts, _telegram_app.state.failures = [], 0, []
+    return _telegram_app
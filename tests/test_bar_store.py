@@ -0,0 +1,82 @@
+"""CachedSource: staleness window, incremental top-up and re-adjustment refresh."""
+import pandas as pd
+import pytest
+
+from fixtures import synthetic_frame
+from agents.bar_store import ADJUSTMENT_TOLERANCE, BarStore, CachedSource
+
+
+class FakeSource:
+    """Serves a fixed history, honouring `start` like yfinance's incremental requests."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.calls = []
+
+    def fetch(self, symbol, period="1y", interval="1d", start=None):
+        self.calls.append(start)
+        if start is None:
+            return self.df.copy()
+        return self.df[self.df["timestamp"] >= pd.Timestamp(start, tz=self.df["timestamp"].dt.tz)].reset_index(drop=True)
+
+
+@pytest.fixture
+def history():
+    return synthetic_frame("AAPL")
+
+
+def cached(tmp_path, source, **kwargs) -> CachedSource:
+    return CachedSource(source, store=BarStore(str(tmp_path)), **kwargs)
+
+
+def test_fresh_copy_is_served_from_the_store(tmp_path, history):
+    source = FakeSource(history)
+    first = cached(tmp_path, source, staleness=3600).fetch("AAPL", "6mo")
+    second = cached(tmp_path, source, staleness=3600).fetch("AAPL", "6mo")
+
+    assert source.calls == [None]
+    pd.testing.assert_frame_equal(first, second, check_dtype=False)
+
+
+def test_stale_copy_tops_up_from_the_second_to_last_bar(tmp_path, history):
+    source = FakeSource(history.iloc[:-1])
+    cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    # One more session arrives; the last stored (possibly partial) bar also moved
+    source.df = history.copy()
+    source.df.loc[len(history) - 2, "close"] *= 1.01
+    merged = cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    assert source.calls == [None, history["timestamp"].iloc[-3].strftime("%Y-%m-%d")]
+    expected = CachedSource._window(source.df, "6mo")
+    pd.testing.assert_frame_equal(merged[["timestamp", "close"]], expected[["timestamp", "close"]], check_dtype=False)
+
+
+def test_readjusted_history_is_downloaded_again(tmp_path, history):
+    source = FakeSource(history.iloc[:-1])
+    cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    # 2:1 split: every earlier close is rescaled by the provider
+    source.df = history.assign(close=history["close"] / 2)
+    merged = cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    assert source.calls[1] is not None and source.calls[2:] == [None]
+    pd.testing.assert_series_equal(merged["close"], CachedSource._window(source.df, "6mo")["close"])
+
+
+def test_drift_within_tolerance_is_not_an_adjustment(tmp_path, history):
+    source = FakeSource(history.iloc[:-1])
+    cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    source.df = history.assign(close=history["close"] * (1 + ADJUSTMENT_TOLERANCE / 10))
+    cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+
+    assert source.calls[2:] == []
+
+
+def test_history_older_than_max_age_is_downloaded_again(tmp_path, history):
+    source = FakeSource(history)
+    cached(tmp_path, source, staleness=0).fetch("AAPL", "6mo")
+    cached(tmp_path, source, staleness=0, max_age=0).fetch("AAPL", "6mo")
+
+    assert source.calls == [None, None]
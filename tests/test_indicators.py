@@ -0,0 +1,43 @@
+"""Compact bars and the summary values built from them."""
+import math
+
+import numpy as np
+
+from fixtures import synthetic_frame
+from agents.bars import Bars
+from agents.indicators import as_price
+from agents.crypto.analyst import CryptoTechnicalAnalyst
+
+
+def test_as_price_drops_float32_noise():
+    assert as_price(np.float32(513.12)) == 513.12
+    assert as_price(float(np.float32(513.1196))) == 513.1196
+    assert as_price(np.float32(0.00001234)) == 0.00001234
+    assert type(as_price(np.float64(2.5))) is float
+    assert math.isnan(as_price(float("nan")))
+
+
+def test_summary_prices_are_plain_rounded_floats():
+    summary = CryptoTechnicalAnalyst().analyze_ticker("BTC-USD", Bars.from_frame("BTC-USD", synthetic_frame("BTC-USD")))
+    for key in ("price", "support", "resistance"):
+        assert type(summary[key]) is float
+        assert summary[key] == float(f"{summary[key]:.7g}"), key
+
+
+def test_bars_keep_large_volumes_exact():
+    df = synthetic_frame("BTC-USD")
+    df["volume"] = np.int64(2 ** 24 + 1) * np.arange(1, len(df) + 1)
+    bars = Bars.from_frame("BTC-USD", df)
+
+    assert bars.volume.dtype == np.int64
+    assert (bars.volume == df["volume"].to_numpy()).all()
+    assert (bars.iloc[-20:]["volume"] == df["volume"].to_numpy()[-20:]).all()
+
+
+def test_bars_with_missing_volume_fall_back_to_float64():
+    df = synthetic_frame("EURUSD=X").astype({"volume": float})
+    df.loc[3, "volume"] = np.nan
+    bars = Bars.from_frame("EURUSD=X", df)
+
+    assert bars.volume.dtype == np.float64
+    assert np.isnan(bars.volume[3])
@@ -0,0 +1,67 @@
+"""LLMGateway connection pool lifetime and the shared singleton."""
+import os
+import time
+import socket
+import asyncio
+import threading
+
+from agents import llm
+from agents.llm import LLMGateway
+
+PROMPT = [{"role": "user", "content": "Ticker: AAPL"}]
+
+
+def pooled_sockets(gateway: LLMGateway):
+    """Duplicates of the sockets in the gateway's pool, readable without its event loop."""
+    dups = []
+    for conn in gateway._http._transport._pool.connections:
+        fd = conn._connection._network_stream.get_extra_info("socket").fileno()
+        dups.append(socket.socket(fileno=os.dup(fd)))
+    return dups
+
+
+def test_new_loop_shuts_down_the_previous_pool(llm_server):
+    gateway = LLMGateway()
+    asyncio.run(gateway.chat(PROMPT, model="m"))
+    old = pooled_sockets(gateway)
+    assert old
+
+    asyncio.run(gateway.chat(PROMPT, model="m"))
+    for sock in old:
+        with sock:
+            # Shut down: reads return EOF instead of blocking on the idle keep-alive connection
+            assert sock.recv(1, socket.MSG_DONTWAIT | socket.MSG_PEEK) == b""
+
+
+def test_aclose_closes_the_pool_on_its_loop(llm_server):
+    gateway = LLMGateway()
+
+    async def run():
+        await gateway.chat(PROMPT, model="m")
+        http = gateway._http
+        await gateway.aclose()
+        return http
+
+    assert asyncio.run(run()).is_closed
+    assert gateway._client is None
+
+
+def test_singleton_is_built_once_across_threads(monkeypatch):
+    built = []
+
+    class SlowGateway:
+        def __init__(self):
+            time.sleep(0.1)
+            built.append(self)
+
+    monkeypatch.setattr(llm, "LLMGateway", SlowGateway)
+    monkeypatch.setattr(llm, "_default_gateway", None)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(llm.get_llm_gateway())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(g is built[0] for g in got)
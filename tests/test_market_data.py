@@ -0,0 +1,95 @@
+"""FetchEngine.fetch_many with a stub market data source."""
+import time
+import asyncio
+
+import pandas as pd
+
+from fixtures import synthetic_frame
+from agents.bars import Bars
+from agents.market_data import FetchEngine, FrameRegistry
+
+
+class StubSource:
+    """Serves synthetic bars; BROKEN raises, EMPTY has no data and SLOW hangs past the engine timeout."""
+
+    def __init__(self, hang: float = 1.0):
+        self.hang = hang
+        self.calls = []
+
+    def fetch(self, symbol, period="1y", interval="1d", start=None):
+        self.calls.append(symbol)
+        if symbol == "BROKEN":
+            raise ConnectionError("connection reset")
+        if symbol == "EMPTY":
+            return pd.DataFrame()
+        if symbol == "SLOW":
+            time.sleep(self.hang)
+        return synthetic_frame(symbol)
+
+
+def test_partial_failure_keeps_the_rest_of_the_batch():
+    engine = FetchEngine(source=StubSource(), max_workers=4, timeout=5)
+    result = asyncio.run(engine.fetch_many(["AAPL", "BROKEN", "MSFT", "EMPTY"]))
+
+    assert sorted(result.frames) == ["AAPL", "MSFT"]
+    assert all(isinstance(bars, Bars) and len(bars) for bars in result.frames.values())
+    assert result.failures == {"BROKEN": "connection reset", "EMPTY": "no data"}
+
+
+def test_slow_symbol_times_out_without_holding_up_the_others():
+    engine = FetchEngine(source=StubSource(hang=1.5), max_workers=4, timeout=0.3)
+    started = time.perf_counter()
+    result = asyncio.run(engine.fetch_many(["SLOW", "AAPL", "MSFT"]))
+
+    assert time.perf_counter() - started < 1.0
+    assert sorted(result.frames) == ["AAPL", "MSFT"]
+    assert result.failures["SLOW"].startswith("timeout")
+
+
+def test_registry_shares_downloads_and_retries_failures():
+    source = StubSource()
+    engine = FetchEngine(source=source, max_workers=4, timeout=5)
+
+    async def run():
+        registry = FrameRegistry()
+        first, second = await asyncio.gather(engine.fetch_many(["AAPL", "BROKEN"], registry=registry),
+                                             engine.fetch_many(["AAPL"], registry=registry))
+        await engine.fetch_many(["AAPL", "BROKEN"], registry=registry)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.frames["AAPL"] is second.frames["AAPL"]
+    # AAPL is downloaded once; the failed BROKEN is not memoized and is tried again
+    assert source.calls.count("AAPL") == 1
+    assert source.calls.count("BROKEN") == 2
+
+
+class SleepySource(StubSource):
+    def fetch(self, symbol, period="1y", interval="1d", start=None):
+        time.sleep(self.hang)
+        return super().fetch(symbol, period, interval, start)
+
+
+def test_concurrent_batches_share_the_worker_slots():
+    # Four symbols over two batches on two workers: queued ones must not start their timeout early
+    engine = FetchEngine(source=SleepySource(hang=0.3), max_workers=2, timeout=0.5)
+
+    async def run():
+        return await asyncio.gather(engine.fetch_many(["AAPL", "MSFT"]), engine.fetch_many(["NVDA", "TSLA"]))
+
+    for result in asyncio.run(run()):
+        assert not result.failures
+        assert len(result.frames) == 2
+
+
+def test_timed_out_fetch_keeps_its_worker_slot():
+    engine = FetchEngine(source=StubSource(hang=0.5), max_workers=1, timeout=0.2)
+
+    async def run():
+        slow = await engine.fetch_many(["SLOW"])
+        # The only worker is still stuck on SLOW: AAPL waits for it instead of timing out in the queue
+        return slow, await engine.fetch_many(["AAPL"])
+
+    slow, fast = asyncio.run(run())
+    assert slow.failures["SLOW"].startswith("timeout")
+    assert list(fast.frames) == ["AAPL"]
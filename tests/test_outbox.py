@@ -0,0 +1,106 @@
+"""Outbox delivery against the stub Bot API server."""
+import asyncio
+
+import pytest
+
+from agents.outbox import Outbox
+from agents.telegram import TelegramTransport
+from agents.telemetry import collect
+
+
+@pytest.fixture
+def outbox(telegram_server, monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "0:test")
+    box = Outbox(path="", interval=0, backoff=0.01)
+    box.transport = TelegramTransport(api_base=telegram_server.state.base_url, backoff=0.01)
+    return box
+
+
+def test_sends_are_timed_in_the_run_that_queued_them(outbox, telegram_server):
+    async def cycle():
+        with collect("cycle") as run:
+            outbox.put("-1001", "<b>first</b>")
+            outbox.put("-1002", "<b>second</b>")
+            await outbox.drain()
+        return run
+
+    run = asyncio.run(cycle())
+    assert len(telegram_server.state.messages) == 2
+    assert run.summary()["stages"]["notify"]["count"] == 2
+
+
+def test_duplicates_are_scoped_to_the_run(outbox, telegram_server):
+    async def cycle():
+        with collect("cycle"):
+            queued = [outbox.put("-1001", "<b>same</b>"), outbox.put("-1001", "<b>same</b>")]
+            await outbox.drain()
+        return queued
+
+    assert asyncio.run(cycle()) == [True, False]
+    # A deliberate re-trigger with unchanged analysis sends the alert again
+    assert asyncio.run(cycle()) == [True, False]
+    assert len(telegram_server.state.messages) == 2
+
+
+def test_permanently_failed_message_can_be_queued_again(outbox, telegram_server):
+    telegram_server.state.failures = [(400, {"ok": False, "error_code": 400, "description": "Bad Request"})]
+
+    async def cycle():
+        with collect("cycle"):
+            outbox.put("-1001", "<b>retry me</b>")
+            await outbox.drain()
+
+    asyncio.run(cycle())
+    assert outbox.report()["-1001"]["failed"] == 1
+    asyncio.run(cycle())
+    assert len(telegram_server.state.messages) == 1
+
+
+def test_prune_keeps_pending_rows(outbox):
+    outbox.retention = 0
+    outbox._db.executemany(
+        "INSERT INTO messages (hash, chat_id, text, status, created_at, next_attempt_at) VALUES (?, ?, ?, ?, 0, 0)",
+        [("a", "-1", "old sent", "sent"), ("b", "-1", "old failed", "failed"), ("c", "-1", "old pending", "pending")]
+    )
+    outbox.prune(force=True)
+    assert [row[0] for row in outbox._db.execute("SELECT text FROM messages")] == ["old pending"]
+
+
+def test_drain_only_waits_for_its_own_run(outbox, telegram_server):
+    telegram_server.state.failures = [(502, {"ok": False, "error_code": 502, "description": "Bad Gateway"})]
+    outbox.transport.max_retries = 0
+    outbox.backoff = 0.3  # The first run's alert is retried after the second run has drained
+
+    async def squad(chat_id: str, text: str):
+        with collect(chat_id):
+            outbox.put(chat_id, text)
+            await outbox.drain()
+
+    async def both():
+        slow = asyncio.create_task(squad("-1001", "<b>slow</b>"))
+        await asyncio.sleep(0.05)
+        await squad("-1002", "<b>fast</b>")
+        # The second drain returned without stopping the worker, so the first run still gets delivered
+        assert not slow.done()
+        await slow
+
+    asyncio.run(both())
+    assert sorted(m["text"] for m in telegram_server.state.messages) == ["<b>fast</b>", "<b>slow</b>"]
+
+
+def test_legacy_unique_hash_table_is_migrated(tmp_path, monkeypatch):
+    import sqlite3
+    path = str(tmp_path / "outbox.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE messages (id INTEGER PRIMARY KEY AUTOINCREMENT, hash TEXT UNIQUE, chat_id TEXT, text TEXT, "
+               "label TEXT, status TEXT DEFAULT 'pending', attempts INTEGER DEFAULT 0, next_attempt_at REAL, "
+               "created_at REAL, sent_at REAL, last_error TEXT)")
+    db.execute("INSERT INTO messages (hash, chat_id, text, status, created_at) VALUES ('h', '-1', 'kept', 'pending', 1)")
+    db.commit()
+    db.close()
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "0:test")
+    box = Outbox(path=path)
+    assert box.pending() == 1
+    box._db.execute("INSERT INTO messages (hash, chat_id, text) VALUES ('h', '-1', 'again')")  # No UNIQUE anymore
+    assert {row[1] for row in box._db.execute("PRAGMA table_info(messages)")} >= {"run_id", "hash"}
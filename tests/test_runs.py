@@ -0,0 +1,68 @@
+"""RunCoordinator joining runs already in flight."""
+import asyncio
+
+import pytest
+
+from agents import runs
+from agents.runs import RunCoordinator
+
+
+@pytest.fixture
+def fake_swarm(monkeypatch):
+    started = []
+
+    async def run_swarm(squads, progress=None, notify=True):
+        started.append(list(squads))
+        await asyncio.sleep(0.05)
+        for name in squads:
+            progress[name].finish()
+        return {name: {"AAPL": {"strategy": {"headline": name, "action_plan": {"signal": "BUY"}},
+                                "technical": {"price": 1.0}}} for name in squads}
+
+    monkeypatch.setattr(runs, "run_swarm", run_swarm)
+    return started
+
+
+def test_trigger_covering_several_runs_reports_every_squad(fake_swarm):
+    async def scenario():
+        coordinator = RunCoordinator()
+        stocks, _ = coordinator.submit(["stocks"])
+        crypto, _ = coordinator.submit(["crypto"])
+        both, started = coordinator.submit(["stocks", "crypto"])
+        await both.task
+        return stocks, crypto, both, started
+
+    stocks, crypto, both, started = asyncio.run(scenario())
+    assert not started
+    assert both.joined == {"stocks": stocks.id, "crypto": crypto.id}
+    assert fake_swarm == [["stocks"], ["crypto"]]  # Nothing was started twice
+    assert both.status == "succeeded"
+    assert {name: r["AAPL"]["headline"] for name, r in both.result.items()} == {"stocks": "stocks", "crypto": "crypto"}
+
+
+def test_trigger_inside_one_run_joins_it(fake_swarm):
+    async def scenario():
+        coordinator = RunCoordinator()
+        first, _ = coordinator.submit(["stocks", "crypto"])
+        again, started = coordinator.submit(["crypto"])
+        await first.task
+        return first, again, started
+
+    first, again, started = asyncio.run(scenario())
+    assert again is first and not started
+
+
+def test_partial_overlap_starts_the_rest_and_follows_the_others(fake_swarm):
+    async def scenario():
+        coordinator = RunCoordinator()
+        stocks, _ = coordinator.submit(["stocks"])
+        full, started = coordinator.submit(["stocks", "crypto", "commodities"])
+        await full.task
+        return stocks, full, started
+
+    stocks, full, started = asyncio.run(scenario())
+    assert started
+    assert fake_swarm == [["stocks"], ["crypto", "commodities"]]
+    assert full.joined == {"stocks": stocks.id}
+    assert sorted(full.result) == ["commodities", "crypto", "stocks"]
+    assert list(full.to_dict()["squads"]) == ["stocks", "crypto", "commodities"]
@@ -0,0 +1,52 @@
+"""BaseStrategist.generate_strategies against the stub OpenAI-compatible server."""
+import asyncio
+
+from agents.llm import LLMGateway
+from agents.stocks.strategist import StockStrategist
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOGL", "AMD"]
+
+
+def make_strategist(concurrency: int = 3, timeout: float = 5.0) -> StockStrategist:
+    strategist = StockStrategist()
+    strategist.llm = LLMGateway()  # Built after the fixture pointed OPENROUTER_BASE_URL at the stub
+    strategist.cache = None
+    strategist.concurrency, strategist.timeout = concurrency, timeout
+    return strategist
+
+
+def summaries(symbols):
+    return [{"symbol": s, "price": 100.0, "rsi": 50.0, "trend": "Bullish"} for s in symbols]
+
+
+def test_results_keep_ranking_order(llm_server):
+    # The first symbol answers last, so completion order differs from ranking order
+    llm_server.state.delays = {"Ticker: AAPL": 0.4}
+    strategies = asyncio.run(make_strategist().generate_strategies(summaries(SYMBOLS)))
+
+    assert [s["headline"].split(":")[0] for s in strategies] == SYMBOLS
+    assert llm_server.state.calls == len(SYMBOLS)
+
+
+def test_timeout_falls_back_to_wait(llm_server):
+    llm_server.state.delays = {"Ticker: TSLA": 1.5}
+    strategies = asyncio.run(make_strategist(timeout=0.5).generate_strategies(summaries(["AAPL", "TSLA", "MSFT"])))
+
+    assert strategies[1] == StockStrategist.fallback_strategy("TSLA")
+    assert strategies[1]["action_plan"]["signal"] == "WAIT"
+    assert [s["headline"].split(":")[0] for s in (strategies[0], strategies[2])] == ["AAPL", "MSFT"]
+
+
+def test_calls_in_flight_stay_within_concurrency(llm_server):
+    asyncio.run(make_strategist(concurrency=2).generate_strategies(summaries(SYMBOLS)))
+
+    assert llm_server.state.calls == len(SYMBOLS)
+    assert llm_server.state.peak_inflight == 2
+
+
+def test_batched_mode_answers_every_symbol_in_order(llm_server, monkeypatch):
+    monkeypatch.setenv("STRATEGIST_BATCH_SIZE", "3")
+    strategies = asyncio.run(make_strategist().generate_strategies(summaries(SYMBOLS)))
+
+    assert [s["headline"].split(":")[0] for s in strategies] == SYMBOLS
+    assert llm_server.state.calls == 3
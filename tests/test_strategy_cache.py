@@ -0,0 +1,43 @@
+"""StrategyCache bookkeeping and how the strategists reach it."""
+import asyncio
+import threading
+
+from agents.strategy_cache import StrategyCache
+from test_strategist import SYMBOLS, make_strategist, summaries
+
+
+def test_hits_do_not_commit_but_still_count_for_eviction(tmp_path):
+    cache = StrategyCache(path=str(tmp_path / "cache.sqlite"), ttl=3600, max_entries=2)
+    cache.put("old", "AAPL", {"n": 1})
+    cache.put("new", "MSFT", {"n": 2})
+
+    writes = cache._db.total_changes
+    assert cache.get("old") == {"n": 1}
+    assert cache._db.total_changes == writes
+
+    # "old" was used last, so the third entry evicts "new"
+    cache.put("third", "NVDA", {"n": 3})
+    assert cache.get("old") == {"n": 1}
+    assert cache.get("new") is None
+
+
+def test_strategists_reach_the_cache_off_the_event_loop(llm_server, tmp_path):
+    strategist = make_strategist()
+    strategist.cache = StrategyCache(path=str(tmp_path / "cache.sqlite"))
+    threads = set()
+    for name in ("get", "put"):
+        method = getattr(strategist.cache, name)
+
+        def record(*args, _method=method):
+            threads.add(threading.current_thread())
+            return _method(*args)
+        setattr(strategist.cache, name, record)
+
+    async def run():
+        first = await strategist.generate_strategies(summaries(SYMBOLS))
+        return first, await strategist.generate_strategies(summaries(SYMBOLS))
+
+    first, second = asyncio.run(run())
+    assert second == first
+    assert llm_server.state.calls == len(SYMBOLS)  # The second pass is answered from the cache
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,73 @@
+"""IndicatorState parity with the batch IndicatorEngine."""
+import math
+
+import pytest
+
+from fixtures import synthetic_frame
+from agents.indicators import IndicatorEngine
+from agents.streaming import IndicatorState
+
+
+def assert_same(streamed: dict, batch: dict, rel: float = 1e-9):
+    assert streamed.keys() == batch.keys()
+    for key, expected in batch.items():
+        if isinstance(expected, float) and math.isnan(expected):
+            assert math.isnan(streamed[key]), key
+        else:
+            assert streamed[key] == pytest.approx(expected, rel=rel, abs=1e-12), key
+
+
+@pytest.mark.parametrize("symbol", ["AAPL", "BTC-USD"])  # 252 stock sessions, 365 crypto days
+def test_seeded_state_matches_compute(symbol):
+    df = synthetic_frame(symbol)
+    state = IndicatorState()
+    state.seed(df)
+
+    assert_same(state.snapshot(), IndicatorEngine().compute(df))
+
+
+def test_streamed_bars_match_compute_on_the_rolling_window():
+    full = synthetic_frame("BTC-USD")
+    state = IndicatorState()
+    state.seed(full.iloc[:300])
+    for end in range(301, len(full) + 1):
+        window = full.iloc[end - 300:end].reset_index(drop=True)
+        assert state.sync(window)
+        snap, batch = state.snapshot(), IndicatorEngine().compute(window)
+        # Drawdown is tracked since seeding, not over the frame; the EMAs also remember
+        # the bars before the window, a difference that decays to ~1e-9
+        for key in ("max_drawdown", "current_drawdown", "bars"):
+            snap.pop(key), batch.pop(key)
+        assert_same(snap, batch, rel=1e-6)
+
+
+def test_state_round_trips_with_its_window():
+    state = IndicatorState()
+    state.seed(synthetic_frame("ETH-USD"))
+    restored = IndicatorState.from_state(state.to_state())
+
+    assert restored.history == 365
+    assert_same(restored.snapshot(), state.snapshot())
+
+
+def test_rescaled_history_reseeds_the_state():
+    full = synthetic_frame("AAPL")
+    state = IndicatorState()
+    state.seed(full.iloc[:-1], history=len(full))
+
+    # 2:1 split: the provider re-adjusts every earlier bar, then the next bar arrives
+    split = full.assign(**{c: full[c] / 2 for c in ("open", "high", "low", "close")}, volume=full["volume"] * 2)
+    assert state.overlap(split) is None
+    assert not state.sync(split)
+
+    batch = IndicatorEngine().compute_arrays(*(split[c].to_numpy(dtype=float) for c in ("close", "high", "low", "volume")))
+    assert_same(state.snapshot(), batch)
+
+
+def test_unchanged_history_stays_incremental():
+    full = synthetic_frame("AAPL")
+    state = IndicatorState()
+    state.seed(full.iloc[:-1], history=len(full))
+
+    assert state.overlap(full) == len(full) - 2
+    assert state.sync(full)
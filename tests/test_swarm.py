@@ -0,0 +1,79 @@
+"""Manager construction on the async paths of agents/swarm.py."""
+import time
+import asyncio
+import threading
+
+import pytest
+
+from agents import swarm
+
+
+class SlowManager:
+    """Stands in for a squad manager whose imports and construction take a while."""
+    built = 0
+
+    def __init__(self, outbox=None):
+        time.sleep(0.5)
+        SlowManager.built += 1
+
+
+@pytest.fixture
+def slow_managers(monkeypatch):
+    monkeypatch.setattr(swarm, "manager_class", lambda name: SlowManager)
+    monkeypatch.setattr(swarm, "_managers", {})
+    monkeypatch.setenv("OUTBOX_PATH", "")
+    SlowManager.built = 0
+
+
+def test_load_manager_does_not_block_the_loop_during_preload(slow_managers):
+    preload = threading.Thread(target=swarm.preload_agents, args=(["stocks"],))
+    preload.start()
+    time.sleep(0.05)  # The preload thread now holds the lock
+
+    async def run():
+        lags = []
+
+        async def ticker():
+            for _ in range(20):
+                started = time.perf_counter()
+                await asyncio.sleep(0.02)
+                lags.append(time.perf_counter() - started - 0.02)
+
+        tick = asyncio.create_task(ticker())
+        managers = await asyncio.gather(*(swarm.load_manager("stocks") for _ in range(3)))
+        await tick
+        return managers, max(lags)
+
+    managers, worst_lag = asyncio.run(run())
+    preload.join()
+    assert worst_lag < 0.2
+    assert all(m is managers[0] for m in managers)
+    assert SlowManager.built == 1
+
+
+def test_each_direct_cycle_gets_fresh_progress(monkeypatch):
+    from agents.commodities.manager import CommodityManager
+    from agents.market_data import FetchEngine
+    from agents.progress import SquadProgress
+
+    fetch_started = []  # (progress, its status when the cycle began)
+    start = SquadProgress.start
+
+    def record(self, phase):
+        if phase == "fetch":
+            fetch_started.append((self, self.status))
+        start(self, phase)
+
+    monkeypatch.setattr(SquadProgress, "start", record)
+
+    class Offline:
+        def fetch(self, symbol, period="1y", interval="1d", start=None):
+            raise ConnectionError("offline")
+
+    manager = CommodityManager(engine=FetchEngine(source=Offline(), max_workers=2, timeout=5))
+    for _ in range(2):
+        asyncio.run(manager.run_daily_cycle(notify=False))
+
+    (first, first_status), (second, second_status) = fetch_started
+    assert first is not second
+    assert first_status == second_status == "pending"
@@ -0,0 +1,82 @@
+"""TelegramTransport retries against the stub Bot API server."""
+import time
+import asyncio
+
+import pytest
+
+from agents.telegram import TelegramError, TelegramTransport
+from agents.telemetry import collect
+
+TOO_MANY = {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+            "parameters": {"retry_after": 1}}
+BAD_GATEWAY = {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+
+
+def send(server, **kwargs):
+    transport = TelegramTransport(api_base=server.state.base_url, backoff=0.01, **kwargs)
+
+    async def run():
+        try:
+            return await transport.send_message("0:test", "-1000", "<b>hello</b>")
+        finally:
+            await transport.aclose()
+
+    return asyncio.run(run())
+
+
+def test_429_waits_the_retry_after_telegram_asks_for(telegram_server):
+    telegram_server.state.failures = [(429, TOO_MANY)]
+    started = time.perf_counter()
+    with collect("test") as run:
+        response = send(telegram_server)
+
+    assert response["ok"]
+    assert time.perf_counter() - started >= 1.0  # retry_after, not the 0.01s backoff
+    assert telegram_server.state.attempts == 2
+    record = run.records[-1]
+    assert (record["retries"], record["flood_waits"]) == (1, 1)
+
+
+def test_5xx_is_retried_with_backoff(telegram_server):
+    telegram_server.state.failures = [(502, BAD_GATEWAY), (502, BAD_GATEWAY)]
+    response = send(telegram_server, max_retries=3)
+
+    assert response["ok"]
+    assert telegram_server.state.attempts == 3
+    assert len(telegram_server.state.messages) == 1
+
+
+def test_5xx_gives_up_after_max_retries(telegram_server):
+    telegram_server.state.failures = [(502, BAD_GATEWAY)] * 3
+    with pytest.raises(TelegramError) as error:
+        send(telegram_server, max_retries=2)
+
+    assert error.value.status == 502
+    assert telegram_server.state.attempts == 3
+    assert telegram_server.state.messages == []
+
+
+def test_4xx_is_not_retried(telegram_server):
+    telegram_server.state.failures = [(400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"})]
+    with pytest.raises(TelegramError) as error:
+        send(telegram_server)
+
+    assert error.value.status == 400
+    assert telegram_server.state.attempts == 1
+
+
+def test_200_without_a_bot_api_body_is_retried(telegram_server):
+    telegram_server.state.failures = [(200, "<html><body>Gateway hiccup</body></html>"), (200, {"ok": False})]
+    response = send(telegram_server, max_retries=3)
+
+    assert response["ok"]
+    assert telegram_server.state.attempts == 3
+
+
+def test_200_html_raises_telegram_error_once_retries_are_exhausted(telegram_server):
+    telegram_server.state.failures = [(200, "<html>proxy error</html>")] * 2
+    with pytest.raises(TelegramError) as error:
+        send(telegram_server, max_retries=1)
+
+    assert error.value.status == 200
+    assert telegram_server.state.messages == []
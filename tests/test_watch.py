@@ -0,0 +1,46 @@
+"""Watch mode state handling across polls."""
+import pytest
+
+from fixtures import synthetic_frame
+from agents import watch
+
+
+class IdleManager:
+    def __init__(self, engine=None, outbox=None):
+        pass
+
+
+@pytest.fixture
+def watcher_factory(monkeypatch):
+    monkeypatch.setattr(watch, "manager_class", lambda name: IdleManager)
+    return lambda: watch.Watcher(squads=["stocks"], engine=object(), outbox=object())
+
+
+def split(df, ratio=2):
+    return df.assign(**{c: df[c] / ratio for c in ("open", "high", "low", "close")}, volume=df["volume"] * ratio)
+
+
+def test_readjusted_history_reseeds_instead_of_mixing_scales(watcher_factory):
+    full = synthetic_frame("AAPL")
+    watcher = watcher_factory()
+    watcher.evaluate("AAPL", full.iloc[:-1])
+
+    # The next poll brings a new bar on a 2:1 split-adjusted history
+    ind, labels = watcher.evaluate("AAPL", split(full))
+    expected, expected_labels = watcher_factory().evaluate("AAPL", split(full))
+
+    assert ind == pytest.approx(expected, nan_ok=True)
+    assert labels == expected_labels
+    _, _, prev = watcher._seen["AAPL"]
+    assert prev["price"] == pytest.approx(full["close"].iloc[-2] / 2)
+
+
+def test_unchanged_history_keeps_the_previous_bar_snapshot(watcher_factory):
+    full = synthetic_frame("AAPL")
+    watcher = watcher_factory()
+    first, _ = watcher.evaluate("AAPL", full.iloc[:-1])
+    state = watcher.states["AAPL"]
+
+    watcher.evaluate("AAPL", full)
+    assert watcher.states["AAPL"] is state
+    assert watcher._seen["AAPL"][2] is first